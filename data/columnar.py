@@ -0,0 +1,207 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from features.registry import context_columns
+
+PROCESSED = Path("data/processed")
+
+SCHEMA_FILE = "schema.json"
+FORMAT_VERSION = 1
+
+# Explicit storage dtypes for processed datasets. Ranges (Ergast):
+# ids < 32k, seasons 1950–, rounds < 128.
+PROCESSED_DTYPES = {
+    "race_id": "int16",
+    "driver_id": "int16",
+    "constructor_id": "int16",
+    "position_order": "int8",
+    "status_id": "int16",
+    "season": "int16",
+    "round": "int8",
+    "race_date": "datetime64[D]",
+    "circuit_id": "int16",
+    "circuit_type": "category",
+}
+
+# Columns not listed above are stored as float32
+DEFAULT_DTYPE = "float32"
+
+
+# -----------------------------
+# WRITE
+# -----------------------------
+def _column_array(values: pd.Series, dtype: str) -> tuple[np.ndarray, dict]:
+    """
+    Storage array + schema entry for one column.
+
+    Categoricals are stored as integer codes (-1 = missing) with the
+    categories kept in the schema.
+    """
+
+    if dtype == "category":
+        cat = values.astype("category")
+        categories = cat.cat.categories
+
+        return (
+            cat.cat.codes.to_numpy(),
+            {"dtype": "category", "categories": [str(c) for c in categories]},
+        )
+
+    if dtype.startswith("datetime64"):
+        return (
+            pd.to_datetime(values).to_numpy().astype(dtype),
+            {"dtype": dtype},
+        )
+
+    if np.issubdtype(np.dtype(dtype), np.floating):
+        return values.to_numpy(dtype=dtype, na_value=np.nan), {"dtype": dtype}
+
+    if values.isna().any():
+        raise ValueError(
+            f"Column '{values.name}' has missing values; cannot store as {dtype}"
+        )
+
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"Column '{values.name}' out of range for {dtype}")
+
+    return values.to_numpy(dtype=dtype), {"dtype": dtype}
+
+
+def write_columnar(
+    df: pd.DataFrame,
+    path: Path,
+    dtypes: dict | None = None,
+):
+    """
+    Write df as a directory of one .npy file per column plus a
+    schema.json (column order, dtypes, categories).
+
+    The directory is written next to `path` and swapped in at the
+    end, so readers never see a half-written dataset.
+    """
+
+    path = Path(path)
+    dtypes = PROCESSED_DTYPES if dtypes is None else dtypes
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    schema = {"version": FORMAT_VERSION, "n_rows": len(df), "columns": {}}
+
+    for col in df.columns:
+        array, entry = _column_array(df[col], dtypes.get(col, DEFAULT_DTYPE))
+        np.save(tmp / f"{col}.npy", array, allow_pickle=False)
+        schema["columns"][col] = entry
+
+    with open(tmp / SCHEMA_FILE, "w") as f:
+        json.dump(schema, f, indent=2)
+
+    old = path.with_name(f".{path.name}.{os.getpid()}.old")
+    if path.exists():
+        path.rename(old)
+    tmp.rename(path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+# -----------------------------
+# READ
+# -----------------------------
+def read_schema(path: Path) -> dict:
+    schema_path = Path(path) / SCHEMA_FILE
+
+    if not schema_path.exists():
+        raise RuntimeError(f"No columnar dataset at {path}")
+
+    with open(schema_path) as f:
+        schema = json.load(f)
+
+    if schema.get("version") != FORMAT_VERSION:
+        raise RuntimeError(
+            f"Unsupported columnar format version {schema.get('version')} at {path}"
+        )
+
+    return schema
+
+
+def read_columnar(
+    path: Path,
+    columns: list[str] | None = None,
+    mmap: bool = True,
+) -> pd.DataFrame:
+    """
+    Load a columnar dataset.
+
+    columns: load only these (projection); unknown names raise.
+    mmap:    memory-map the column files read-only — pages are read
+             on first touch and shared between processes that open
+             the same dataset.
+    """
+
+    path = Path(path)
+    schema = read_schema(path)
+    stored = schema["columns"]
+
+    if columns is None:
+        columns = list(stored)
+
+    missing = [c for c in columns if c not in stored]
+    if missing:
+        raise RuntimeError(f"Columns not in dataset {path}: {missing}")
+
+    data = {}
+    for col in columns:
+        array = np.load(
+            path / f"{col}.npy",
+            mmap_mode="r" if mmap else None,
+            allow_pickle=False,
+        )
+        entry = stored[col]
+
+        if entry["dtype"] == "category":
+            data[col] = pd.Categorical.from_codes(
+                np.asarray(array), categories=entry["categories"]
+            )
+        else:
+            # Plain ndarray view — still backed by the mapped file
+            data[col] = array.view(np.ndarray)
+
+    return pd.DataFrame(data, copy=False)
+
+
+# -----------------------------
+# PROCESSED DATASETS
+# -----------------------------
+def base_path(processed_dir: Path = PROCESSED) -> Path:
+    """
+    The single stored base table: every row, every feature.
+    Contexts are read as projections of it.
+    """
+
+    return Path(processed_dir) / "dataset_base"
+
+
+def load_context_dataset(
+    context: str = "pre_quali",
+    columns: list[str] | None = None,
+    mmap: bool = True,
+    processed_dir: Path = PROCESSED,
+) -> pd.DataFrame:
+    """
+    View of the base table for one context.
+
+    Only columns the feature registry allows in `context` are read;
+    asking for a disallowed feature raises (leakage check at read
+    time, not just at build time).
+    """
+
+    path = base_path(processed_dir)
+    visible = context_columns(list(read_schema(path)["columns"]), context, columns)
+
+    return read_columnar(path, columns=visible, mmap=mmap)
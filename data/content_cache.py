@@ -0,0 +1,162 @@
+import hashlib
+import os
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+
+def dataset_fingerprint(dataset: pd.DataFrame) -> str:
+    """
+    Content hash of a dataset.
+    Any rebuild that changes a value, a column or the row set
+    changes the fingerprint.
+    """
+
+    h = hashlib.sha256()
+    h.update(",".join(map(str, dataset.columns)).encode())
+    h.update(
+        pd.util.hash_pandas_object(dataset, index=False).to_numpy().tobytes()
+    )
+    return h.hexdigest()
+
+
+# id(dataset) → (weakref to dataset, fingerprint)
+_FINGERPRINTS = {}
+
+
+def shared_fingerprint(dataset: pd.DataFrame) -> str:
+    """
+    dataset_fingerprint(), hashed once per dataset object and
+    dropped when the dataset is garbage collected.
+    For long-lived tables that are never modified in place.
+    """
+
+    key = id(dataset)
+    entry = _FINGERPRINTS.get(key)
+
+    if entry is not None and entry[0]() is dataset:
+        return entry[1]
+
+    fp = dataset_fingerprint(dataset)
+    ref = weakref.ref(dataset, lambda _, key=key: _FINGERPRINTS.pop(key, None))
+    _FINGERPRINTS[key] = (ref, fp)
+
+    return fp
+
+
+class ContentCache:
+    """
+    In-memory LRU keyed by content hashes, with an optional on-disk tier.
+
+    Keys are hashes of everything that determines a value (inputs,
+    code, parameters), so a change makes old entries unreachable
+    rather than stale. The disk tier keeps at most `max_disk_entries`
+    files, dropping the least recently used.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        cache_dir: str | Path | None = None,
+        max_disk_entries: int | None = 1024,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if max_disk_entries is not None and max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be >= 1")
+
+        self.maxsize = maxsize
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            # Mark as recently used for disk eviction
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Corrupt / partially written / just evicted — treat as a miss
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        self._remember(key, value)
+
+        if self.cache_dir is not None:
+            # Write-then-rename so readers never see half an entry
+            path = self._path(key)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f)
+            tmp.replace(path)
+
+            self._evict_disk()
+
+    def _evict_disk(self):
+        if self.max_disk_entries is None:
+            return
+
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+
+        excess = len(entries) - self.max_disk_entries
+        if excess <= 0:
+            return
+
+        for _, path in sorted(entries)[:excess]:
+            path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def disk_entries(self) -> int:
+        if self.cache_dir is None:
+            return 0
+        return sum(1 for _ in self.cache_dir.glob("*.pkl"))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,410 @@
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.columnar import PROCESSED, SCHEMA_FILE, read_columnar, write_columnar
+from data.store import load_table
+from features.registry import CONTEXTS, context_features, load_feature_registry
+
+# Entity → id column of its observations
+ENTITY_KEYS = {
+    "driver": "driver_id",
+    "constructor": "constructor_id",
+}
+
+RACE_COLUMNS = ["race_id", "season", "round", "circuit_id"]
+ENTRY_COLUMNS = ["race_id", "driver_id", "constructor_id"]
+
+
+def feature_store_path(processed_dir: Path = PROCESSED) -> Path:
+    return Path(processed_dir) / "feature_store"
+
+
+# -----------------------------
+# WRITE
+# -----------------------------
+def _post_race(
+    observations: pd.DataFrame,
+    key: str,
+    race_order: pd.Series,
+    final: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Each observation's feature values after its race: the entity's
+    next pre-race values, or `final` (its state after its last race).
+    Features only move on races the entity takes part in, so these
+    are also its values as of any race it skips in between.
+    """
+
+    features = [c for c in observations.columns if c not in (key, "race_id")]
+
+    t = observations["race_id"].map(race_order)
+    ordered = observations.assign(_t=t).sort_values([key, "_t"], kind="mergesort")
+
+    post = ordered.groupby(key, sort=False)[features].shift(-1)
+    last = ordered[key].ne(ordered[key].shift(-1))
+
+    after = final.drop_duplicates(key).set_index(key)[features]
+    post.loc[last] = after.reindex(ordered.loc[last, key]).to_numpy()
+
+    return pd.concat([ordered[[key, "race_id"]], post], axis=1).loc[observations.index]
+
+
+def write_feature_store(
+    dataset: pd.DataFrame,
+    final: pd.DataFrame,
+    processed_dir: Path = PROCESSED,
+    registry: pd.DataFrame | None = None,
+):
+    """
+    Persist the point-in-time store next to the base table:
+
+    races        every race in races.csv, in (season, round) order —
+                 including races not raced yet
+    entries      who started each race (grid rows)
+    driver /     one observation per (entity, race): the entity's
+    constructor  feature values going into that race
+    *_post       the same observations' values after that race, read
+                 for later races the entity does not enter
+
+    final: feature values of every driver and constructor after its
+    last race in `dataset` (one row per entity; see build_dataset).
+    """
+
+    if registry is None:
+        registry = load_feature_registry()
+
+    path = feature_store_path(processed_dir)
+    path.mkdir(parents=True, exist_ok=True)
+
+    races = (
+        load_table("races")[RACE_COLUMNS]
+        .sort_values(["season", "round"], kind="mergesort")
+        .reset_index(drop=True)
+    )
+
+    race_order = pd.Series(np.arange(len(races)), index=races["race_id"])
+
+    entries = dataset[ENTRY_COLUMNS].merge(races, on="race_id", how="left")
+    entries = entries.sort_values(
+        ["season", "round", "driver_id"], kind="mergesort"
+    )[ENTRY_COLUMNS]
+
+    for entity, key in ENTITY_KEYS.items():
+        features = [
+            f for f in registry.loc[registry["entity"] == entity, "feature_name"]
+            if f in dataset.columns
+        ]
+        observations = (
+            dataset[[key, "race_id", *features]]
+            .drop_duplicates([key, "race_id"])
+            .reset_index(drop=True)
+        )
+        post = _post_race(observations, key, race_order, final)
+
+        write_columnar(observations, path / entity)
+        write_columnar(post.reset_index(drop=True), path / f"{entity}_post")
+
+    write_columnar(entries.reset_index(drop=True), path / "entries")
+    # Written last: its schema stamps the store version (see load_feature_store)
+    write_columnar(races, path / "races")
+
+
+# -----------------------------
+# AS-OF INDEX
+# -----------------------------
+@dataclass(frozen=True)
+class EntityIndex:
+    """
+    Observations of one entity type, plus a dense as-of index:
+    latest[id, t] is the row of the entity's last observation at or
+    before chronological race t (-1: none yet).
+
+    values are each row's pre-race features, post the same after its
+    race, and race_t its chronological race.
+    """
+
+    features: tuple[str, ...]
+    values: dict
+    post: dict
+    race_t: np.ndarray
+    latest: np.ndarray
+
+
+def _entity_index(
+    observations: pd.DataFrame,
+    post: pd.DataFrame,
+    key: str,
+    race_pos: np.ndarray,
+    n_races: int,
+) -> EntityIndex:
+    ids = observations[key].to_numpy(dtype=np.int64)
+    t = race_pos[observations["race_id"].to_numpy(dtype=np.int64)]
+
+    # Rows ordered by (entity, time): within an entity a later row is
+    # a later race, so a running max of row numbers is "latest so far"
+    order = np.lexsort((t, ids))
+    ids, t = ids[order], t[order]
+
+    latest = np.full((int(ids.max(initial=-1)) + 1, n_races), -1, dtype=np.int32)
+    latest[ids, t] = np.arange(len(ids), dtype=np.int32)
+    np.maximum.accumulate(latest, axis=1, out=latest)
+
+    features = tuple(c for c in observations.columns if c not in (key, "race_id"))
+
+    return EntityIndex(
+        features=features,
+        values={
+            f: observations[f].to_numpy(dtype=float)[order]
+            for f in features
+        },
+        post={
+            f: post[f].to_numpy(dtype=float)[order]
+            for f in features
+        },
+        race_t=t,
+        latest=latest,
+    )
+
+
+class FeatureStore:
+    """
+    Point-in-time feature store keyed by (entity, race_id).
+
+    lookup() returns each entity's feature values as of a race, by
+    index — no scan of the processed table: its pre-race values if it
+    takes part, otherwise its state after its latest earlier race
+    (for skipped and upcoming races). Which features a context may read follows the
+    registry's available_at / valid_for rules (context_features).
+
+    grid() assembles a race's starting grid with its features, for
+    the simulator and the backtester.
+    """
+
+    def __init__(
+        self,
+        races: pd.DataFrame,
+        entries: pd.DataFrame,
+        observations: dict,
+        post: dict,
+        registry: pd.DataFrame | None = None,
+        fingerprint: str | None = None,
+    ):
+        if registry is None:
+            registry = load_feature_registry()
+
+        self.races = races
+        self.fingerprint = fingerprint
+
+        race_ids = races["race_id"].to_numpy(dtype=np.int64)
+        self._race_pos = np.full(int(race_ids.max()) + 1, -1, dtype=np.int64)
+        self._race_pos[race_ids] = np.arange(len(race_ids))
+
+        self._race_of_round = {
+            (int(s), int(r)): int(race_id)
+            for race_id, s, r in zip(race_ids, races["season"], races["round"])
+        }
+
+        self._index = {
+            entity: _entity_index(
+                observations[entity], post[entity], key,
+                self._race_pos, len(race_ids),
+            )
+            for entity, key in ENTITY_KEYS.items()
+        }
+
+        # Entries are stored in race order: each race is one slice
+        self.entries = entries
+        entry_pos = self._race_pos[entries["race_id"].to_numpy(dtype=np.int64)]
+        self._entry_bounds = np.searchsorted(entry_pos, np.arange(len(race_ids) + 1))
+
+        self._allowed = {
+            context: set(context_features(context, registry))
+            for context in CONTEXTS
+        }
+
+    # -----------------------------
+    # KEYS
+    # -----------------------------
+    def race_positions(self, race_ids) -> np.ndarray:
+        """
+        Chronological position of each race id; raises on unknown ids.
+        """
+
+        race_ids = np.atleast_1d(np.asarray(race_ids, dtype=np.int64))
+        known = (race_ids >= 0) & (race_ids < len(self._race_pos))
+        pos = np.where(known, self._race_pos[np.where(known, race_ids, 0)], -1)
+
+        if (pos < 0).any():
+            raise RuntimeError(f"Race {race_ids[pos < 0][0]} not in feature store")
+        return pos
+
+    def race_id(self, season: int, round: int) -> int:
+        key = (int(season), int(round))
+        if key not in self._race_of_round:
+            raise RuntimeError(f"No race for season {season}, round {round}")
+        return self._race_of_round[key]
+
+    def features(self, entity: str, context: str = "pre_quali") -> list[str]:
+        return [
+            f for f in self._entity(entity).features
+            if f in self._allowed[context]
+        ]
+
+    def _entity(self, entity: str) -> EntityIndex:
+        if entity not in self._index:
+            raise RuntimeError(f"Unknown feature entity '{entity}'")
+        return self._index[entity]
+
+    # -----------------------------
+    # AS-OF LOOKUPS
+    # -----------------------------
+    def lookup(
+        self,
+        entity: str,
+        entity_ids,
+        race_ids,
+        features: list[str] | None = None,
+        context: str = "pre_quali",
+    ) -> pd.DataFrame:
+        """
+        Feature values of entity_ids[i] as of race_ids[i], for every i
+        at once (race_ids may be a single id): going into the race if
+        the entity takes part, else after its latest earlier race.
+        NaN where the entity has no observation up to the race.
+        """
+
+        if context not in CONTEXTS:
+            raise RuntimeError(f"Unknown context '{context}'")
+
+        index = self._entity(entity)
+
+        if features is None:
+            features = self.features(entity, context)
+
+        illegal = [f for f in features if f not in self._allowed[context]]
+        unknown = [f for f in features if f not in index.values]
+        if illegal:
+            raise RuntimeError(f"Feature(s) {illegal} not available in {context} context")
+        if unknown:
+            raise RuntimeError(f"No {entity} feature(s) {unknown} in feature store")
+
+        ids = np.atleast_1d(np.asarray(entity_ids, dtype=np.int64))
+        t = np.broadcast_to(self.race_positions(race_ids), ids.shape)
+
+        known = (ids >= 0) & (ids < len(index.latest))
+        safe = np.where(known, ids, 0)
+
+        row = np.where(known, index.latest[safe, t], -1)
+        take = np.maximum(row, 0)
+        entered = index.race_t[take] == t
+
+        return pd.DataFrame({
+            f: np.where(
+                row >= 0,
+                np.where(entered, index.values[f][take], index.post[f][take]),
+                np.nan,
+            )
+            for f in features
+        })
+
+    def get(
+        self,
+        entity: str,
+        entity_id: int,
+        race_id: int,
+        feature: str,
+        context: str = "pre_quali",
+    ) -> float:
+        return float(
+            self.lookup(entity, [entity_id], race_id, [feature], context)[feature].iloc[0]
+        )
+
+    # -----------------------------
+    # GRIDS
+    # -----------------------------
+    def grid(self, race_id: int, context: str = "pre_quali") -> pd.DataFrame:
+        """
+        Starting grid of a race (race keys, driver and constructor ids)
+        with every driver and constructor feature visible in `context`.
+        """
+
+        t = int(self.race_positions([race_id])[0])
+        start, stop = self._entry_bounds[t], self._entry_bounds[t + 1]
+
+        grid = self.entries.iloc[start:stop].reset_index(drop=True)
+        race = self.races.iloc[t]
+
+        columns = {
+            "race_id": grid["race_id"].to_numpy(),
+            "season": np.full(len(grid), race["season"]),
+            "round": np.full(len(grid), race["round"]),
+            "circuit_id": np.full(len(grid), race["circuit_id"]),
+            "driver_id": grid["driver_id"].to_numpy(),
+            "constructor_id": grid["constructor_id"].to_numpy(),
+        }
+
+        for entity, key in ENTITY_KEYS.items():
+            values = self.lookup(entity, columns[key], race_id, context=context)
+            columns.update({f: values[f].to_numpy() for f in values.columns})
+
+        return pd.DataFrame(columns)
+
+    def grid_for(self, season: int, round: int, context: str = "pre_quali") -> pd.DataFrame:
+        return self.grid(self.race_id(season, round), context)
+
+
+# -----------------------------
+# LOAD
+# -----------------------------
+def _store_fingerprint(tables: dict) -> str:
+    h = hashlib.sha256()
+    for name in sorted(tables):
+        df = tables[name]
+        h.update(name.encode())
+        h.update(",".join(df.columns).encode())
+        h.update(
+            pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+        )
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _load(path: str, stamp: int) -> FeatureStore:
+    path = Path(path)
+
+    tables = {
+        name: read_columnar(path / name)
+        for name in (
+            "races", "entries", *ENTITY_KEYS, *(f"{e}_post" for e in ENTITY_KEYS)
+        )
+    }
+
+    return FeatureStore(
+        races=tables["races"],
+        entries=tables["entries"],
+        observations={e: tables[e] for e in ENTITY_KEYS},
+        post={e: tables[f"{e}_post"] for e in ENTITY_KEYS},
+        fingerprint=_store_fingerprint(tables),
+    )
+
+
+def load_feature_store(processed_dir: Path = PROCESSED) -> FeatureStore:
+    """
+    The persisted store, memory-mapped and indexed once per process.
+    A rebuild (new races schema) is picked up on the next call.
+    """
+
+    path = feature_store_path(processed_dir)
+    schema = path / "races" / SCHEMA_FILE
+
+    if not schema.exists():
+        raise RuntimeError(
+            f"No feature store at {path}. Run scripts/build_dataset.py first."
+        )
+
+    return _load(str(path), schema.stat().st_mtime_ns)
@@ -1,17 +1,14 @@
-import pandas as pd
-from pathlib import Path
-
-RAW = Path("data/raw")
+from data.store import load_table
 
 def load_driver_lookup():
-    drivers = pd.read_csv(RAW / "drivers.csv")
+    drivers = load_table("drivers")
     drivers["driver_name"] = drivers["forename"] + " " + drivers["surname"]
     return drivers[["driverId", "driver_name"]].rename(
         columns={"driverId": "driver_id"}
     )
 
 def load_constructor_lookup():
-    constructors = pd.read_csv(RAW / "constructors.csv")
+    constructors = load_table("constructors")
     return constructors[["constructorId", "name"]].rename(
         columns={
             "constructorId": "constructor_id",
@@ -0,0 +1,189 @@
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAW = Path(__file__).resolve().parent / "raw"
+
+# -----------------------------
+# RAW TABLE SCHEMAS
+# -----------------------------
+# Only the declared columns are read, with the declared dtypes.
+# Ergast ids fit in int16; free text stays str.
+TABLE_SCHEMAS = {
+    "drivers": {
+        "driverId": "int16",
+        "driverRef": "str",
+        "code": "str",
+        "forename": "str",
+        "surname": "str",
+        "nationality": "category",
+    },
+    "constructors": {
+        "constructorId": "int16",
+        "constructorRef": "str",
+        "name": "str",
+        "nationality": "category",
+    },
+    "circuits": {
+        "circuitId": "int16",
+        "circuitRef": "str",
+        "name": "str",
+        "location": "str",
+        "country": "category",
+    },
+    "races": {
+        "race_id": "int16",
+        "season": "int16",
+        "round": "int8",
+        "race_date": "str",
+        "circuit_id": "int16",
+    },
+    "results": {
+        "race_id": "int16",
+        "driver_id": "int16",
+        "constructor_id": "int16",
+        "position_order": "int8",
+        "status_id": "int16",
+    },
+    "status": {
+        "statusId": "int16",
+        "status": "str",
+    },
+}
+
+_TABLES = {}
+_LOOKUPS = {}
+_LOCK = threading.Lock()
+
+
+def load_table(name: str) -> pd.DataFrame:
+    """
+    Raw table `name`, parsed once per process with its declared schema.
+
+    Callers get a shallow copy: under copy-on-write, changing it never
+    touches the shared table.
+    """
+
+    if name not in TABLE_SCHEMAS:
+        raise RuntimeError(f"Unknown raw table '{name}'")
+
+    with _LOCK:
+        if name not in _TABLES:
+            schema = TABLE_SCHEMAS[name]
+            _TABLES[name] = pd.read_csv(
+                RAW / f"{name}.csv",
+                usecols=list(schema),
+                dtype=schema,
+            )[list(schema)]
+
+        return _TABLES[name].copy(deep=False)
+
+
+# -----------------------------
+# CANONICAL DRIVER–RACE DATASET
+# -----------------------------
+def build_base_dataset(results: pd.DataFrame, races: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per driver per race, with the race's season, round, date
+    and circuit, in (season, round, position_order) order.
+    """
+
+    # Inject season / round / meta
+    results = results.merge(
+        races[["race_id", "season", "round", "race_date", "circuit_id"]],
+        how="left",
+        on="race_id",
+    )
+
+    # Drop races not present in races.csv
+    missing = results["season"].isna()
+    if missing.any():
+        bad_ids = results.loc[missing, "race_id"].unique()
+        print(
+            f"Dropping {len(bad_ids)} races missing from races.csv "
+            f"(max race_id={bad_ids.max()})"
+        )
+
+    results = results.loc[~missing].copy()
+
+    return results.sort_values(
+        ["season", "round", "position_order"]
+    ).reset_index(drop=True)
+
+
+# -----------------------------
+# ID LOOKUPS
+# -----------------------------
+@dataclass(frozen=True)
+class IdLookup:
+    """
+    Dense id → value array: values[id], `missing` where the id is
+    unknown. Looking up many ids is one take, no merge.
+    """
+
+    values: np.ndarray
+    missing: object = None
+
+    def take(self, ids) -> np.ndarray:
+        # int64 even for an empty list, which would otherwise be float
+        ids = np.asarray(ids, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self.values))
+
+        out = self.values[np.where(known, ids, 0)]
+        out[~known] = self.missing
+        return out
+
+    def get(self, id, default=None):
+        value = self.take([id])[0]
+        return default if value is self.missing else value
+
+
+def _build_lookup(ids: np.ndarray, values: np.ndarray) -> IdLookup:
+    dense = np.full(int(ids.max()) + 1, None, dtype=object)
+    dense[ids] = values
+    return IdLookup(values=dense)
+
+
+def id_lookup(table: str, id_column: str, value_column: str) -> IdLookup:
+    """
+    Cached lookup of one column of a raw table by its id column.
+    """
+
+    key = (table, id_column, value_column)
+
+    if key not in _LOOKUPS:
+        df = load_table(table)
+        lookup = _build_lookup(
+            df[id_column].to_numpy(dtype=np.int64),
+            df[value_column].to_numpy(dtype=object),
+        )
+        with _LOCK:
+            _LOOKUPS.setdefault(key, lookup)
+
+    return _LOOKUPS[key]
+
+
+def driver_names() -> IdLookup:
+    key = ("drivers", "driverId", "driver_name")
+
+    if key not in _LOOKUPS:
+        df = load_table("drivers")
+        lookup = _build_lookup(
+            df["driverId"].to_numpy(dtype=np.int64),
+            (df["forename"] + " " + df["surname"]).to_numpy(dtype=object),
+        )
+        with _LOCK:
+            _LOOKUPS.setdefault(key, lookup)
+
+    return _LOOKUPS[key]
+
+
+def constructor_names() -> IdLookup:
+    return id_lookup("constructors", "constructorId", "name")
+
+
+def circuit_names() -> IdLookup:
+    return id_lookup("circuits", "circuitId", "name")
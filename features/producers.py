@@ -0,0 +1,485 @@
+import hashlib
+import importlib
+import inspect
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from data.content_cache import ContentCache, dataset_fingerprint
+from models.constructor_pace import compute_constructor_pace
+from models.constructor_reliability import compute_constructor_reliability
+from models.driver_elo import INITIAL_ELO, K_FACTOR, run_driver_elo
+from models.driver_reliability import (
+    compute_driver_dnf_rate_mech,
+    compute_driver_incident_rate,
+)
+
+FEATURE_CACHE_DIR = Path("data/cache/features")
+# Producer outputs kept on disk; older ones are evicted least recently used
+FEATURE_CACHE_ENTRIES = 256
+
+# Columns every processed row carries; never produced, never features
+IDENTITY_COLUMNS = {
+    "season",
+    "round",
+    "race_id",
+    "driver_id",
+    "constructor_id",
+    "circuit_id",
+    "race_date",
+    "position_order",
+    "status_id",
+}
+
+
+@dataclass(frozen=True)
+class Producer:
+    """
+    One node of the feature DAG.
+
+    func(frame, taxonomy, state, **params) -> (output, state)
+
+    frame:   `columns` of the base rows, plus the outputs of every
+             producer in `depends_on`
+    output:  one row per `keys`, with the `outputs` columns
+    state:   carried between incremental builds (None if unused)
+    """
+
+    name: str
+    func: Callable
+    keys: tuple[str, ...]
+    outputs: tuple[str, ...]
+    columns: tuple[str, ...]
+    # Overridable parameters; an int default only accepts ints
+    params: dict = field(default_factory=dict)
+    depends_on: tuple[str, ...] = ()
+    # Value for rows without an output; a str names a parameter
+    fill: dict = field(default_factory=dict)
+    # Modules whose source defines the producer's behaviour
+    code: tuple[str, ...] = ()
+    # Incremental input: "history" = prior rows + new rows,
+    # "state" = new rows only, resumed from the saved state
+    resume: str = "history"
+
+
+# -----------------------------
+# PRODUCER FUNCTIONS
+# -----------------------------
+def _driver_elo(frame, taxonomy, state, k_factor, initial_elo):
+    return run_driver_elo(
+        frame,
+        state,
+        k_factor=k_factor,
+        initial_elo=initial_elo,
+    )
+
+
+def _constructor_pace(frame, taxonomy, state, window):
+    return compute_constructor_pace(frame, window=window), None
+
+
+def _constructor_reliability(frame, taxonomy, state, window):
+    return compute_constructor_reliability(frame, taxonomy, window=window), None
+
+
+def _driver_incident_rate(frame, taxonomy, state, window):
+    return compute_driver_incident_rate(frame, taxonomy, window=window), None
+
+
+def _driver_dnf_rate_mech(frame, taxonomy, state, window):
+    return compute_driver_dnf_rate_mech(frame, taxonomy, window=window), None
+
+
+_ROLLING_CODE = ("models.rolling",)
+_STATUS_CODE = ("models.rolling", "models.status_taxonomy")
+
+# Declaration order = column order in the base table
+PRODUCERS = {
+    p.name: p
+    for p in (
+        Producer(
+            name="driver_elo",
+            func=_driver_elo,
+            keys=("race_id", "driver_id"),
+            outputs=("driver_elo",),
+            columns=("race_id", "season", "round", "driver_id", "position_order", "status_id"),
+            params={"k_factor": float(K_FACTOR), "initial_elo": float(INITIAL_ELO)},
+            # Every starter is rated; the fill only guards unrated rows
+            fill={"driver_elo": "initial_elo"},
+            code=("models.driver_elo",),
+            resume="state",
+        ),
+        Producer(
+            name="constructor_pace",
+            func=_constructor_pace,
+            keys=("race_id", "constructor_id"),
+            outputs=("constructor_pace_index",),
+            columns=("race_id", "season", "round", "constructor_id", "position_order"),
+            params={"window": 5},
+            code=("models.constructor_pace", *_ROLLING_CODE),
+        ),
+        Producer(
+            name="constructor_reliability",
+            func=_constructor_reliability,
+            keys=("race_id", "constructor_id"),
+            outputs=("constructor_reliability",),
+            columns=("race_id", "season", "round", "constructor_id", "status_id"),
+            params={"window": 10},
+            fill={"constructor_reliability": 1.0},
+            code=("models.constructor_reliability", *_STATUS_CODE),
+        ),
+        Producer(
+            name="driver_incident_rate",
+            func=_driver_incident_rate,
+            keys=("race_id", "driver_id"),
+            outputs=("driver_incident_rate",),
+            columns=("race_id", "season", "round", "driver_id", "status_id"),
+            params={"window": 10},
+            # No history yet → no failures observed
+            fill={"driver_incident_rate": 0.0},
+            code=("models.driver_reliability", *_STATUS_CODE),
+        ),
+        Producer(
+            name="driver_dnf_rate_mech",
+            func=_driver_dnf_rate_mech,
+            keys=("race_id", "driver_id"),
+            outputs=("driver_dnf_rate_mech",),
+            columns=("race_id", "season", "round", "driver_id", "status_id"),
+            params={"window": 10},
+            fill={"driver_dnf_rate_mech": 0.0},
+            code=("models.driver_reliability", *_STATUS_CODE),
+        ),
+    )
+}
+
+
+# -----------------------------
+# PLACEHOLDERS (INTENTIONAL)
+# -----------------------------
+def placeholder_feature(feature_name: str, index: pd.Index) -> pd.Series:
+    """
+    Value for a registry feature with no producer yet.
+    """
+
+    if feature_name in IDENTITY_COLUMNS:
+        raise RuntimeError(
+            f"Illegal feature '{feature_name}': identity columns are not features"
+        )
+
+    if feature_name.startswith(("driver_", "constructor_", "weather_")):
+        return pd.Series(0.0, index=index)
+
+    return pd.Series(pd.NA, index=index)
+
+
+# -----------------------------
+# DAG
+# -----------------------------
+def feature_producers(registry: pd.DataFrame) -> dict[str, str]:
+    """
+    feature_name → producer name, from the registry's `producer` column.
+    """
+
+    mapping = {}
+
+    for fname, producer in zip(registry["feature_name"], registry["producer"]):
+        if pd.isna(producer) or producer == "":
+            continue
+
+        if producer not in PRODUCERS:
+            raise RuntimeError(f"Unknown producer '{producer}' for feature {fname}")
+
+        if fname not in PRODUCERS[producer].outputs:
+            raise RuntimeError(f"Producer '{producer}' does not output {fname}")
+
+        mapping[fname] = producer
+
+    return mapping
+
+
+def resolve_producers(registry: pd.DataFrame) -> list[Producer]:
+    """
+    Producers needed by the registry's features, dependencies first
+    (declaration order among independent producers).
+    """
+
+    wanted = set(feature_producers(registry).values())
+
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in (p.name for p in ordered):
+            return
+        if name in visiting:
+            raise RuntimeError(f"Feature producer cycle through '{name}'")
+        if name not in PRODUCERS:
+            raise RuntimeError(f"Unknown producer '{name}'")
+
+        visiting.add(name)
+        for upstream in PRODUCERS[name].depends_on:
+            visit(upstream)
+        visiting.discard(name)
+
+        ordered.append(PRODUCERS[name])
+
+    for name in PRODUCERS:
+        if name in wanted:
+            visit(name)
+
+    return ordered
+
+
+def with_params(producer: Producer, overrides: dict | None) -> Producer:
+    if not overrides:
+        return producer
+
+    unknown = set(overrides) - set(producer.params)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) {sorted(unknown)} for {producer.name}")
+
+    for name, value in overrides.items():
+        expected = int if isinstance(producer.params[name], int) else (int, float)
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError(
+                f"Parameter {producer.name}.{name} must be "
+                f"{'an int' if expected is int else 'a number'}, got {value!r}"
+            )
+
+    return replace(producer, params={**producer.params, **overrides})
+
+
+# -----------------------------
+# CONTENT-HASH CACHE
+# -----------------------------
+_CODE_VERSIONS = {}
+
+
+def code_version(producer: Producer) -> str:
+    """
+    Hash of the producer function and every model module behind it,
+    so editing a model invalidates exactly the features it feeds.
+    """
+
+    if producer.name not in _CODE_VERSIONS:
+        h = hashlib.sha256(inspect.getsource(producer.func).encode())
+        for module in producer.code:
+            path = importlib.import_module(module).__file__
+            h.update(Path(path).read_bytes())
+        _CODE_VERSIONS[producer.name] = h.hexdigest()
+
+    return _CODE_VERSIONS[producer.name]
+
+
+def producer_key(
+    producer: Producer,
+    frame: pd.DataFrame,
+    taxonomy,
+    upstream_keys: dict,
+) -> str:
+    """
+    Cache key: producer, code version, parameters, content of the
+    columns it reads, the status taxonomy and its upstream keys.
+    """
+
+    payload = {
+        "producer": producer.name,
+        "code": code_version(producer),
+        "params": producer.params,
+        "input": dataset_fingerprint(frame[list(producer.columns)]),
+        "status": dataset_fingerprint(taxonomy.status),
+        "upstream": upstream_keys,
+    }
+
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def feature_cache(cache_dir: Path = FEATURE_CACHE_DIR) -> ContentCache:
+    return ContentCache(
+        maxsize=64, cache_dir=cache_dir, max_disk_entries=FEATURE_CACHE_ENTRIES
+    )
+
+
+# -----------------------------
+# EXECUTION
+# -----------------------------
+def _producer_input(
+    producer: Producer,
+    dataset: pd.DataFrame,
+    history: pd.DataFrame | None,
+    outputs: dict,
+    params: dict,
+) -> pd.DataFrame:
+    frame = dataset
+    if history is not None and producer.resume == "history":
+        frame = pd.concat([history, dataset], ignore_index=True)
+
+    frame = frame[list(producer.columns)]
+
+    if producer.depends_on:
+        frame = attach_outputs(
+            frame,
+            {u: outputs[u] for u in producer.depends_on},
+            params,
+        )
+
+    return frame
+
+
+def _run_producer(args):
+    # Top-level so it pickles into pool workers
+    producer, frame, taxonomy, state = args
+    return producer.func(frame, taxonomy, state, **producer.params)
+
+
+def run_producers(
+    dataset: pd.DataFrame,
+    taxonomy,
+    registry: pd.DataFrame,
+    params: dict | None = None,
+    cache: ContentCache | None = None,
+    history: pd.DataFrame | None = None,
+    state: dict | None = None,
+    n_workers: int = 1,
+    verbose: bool = False,
+) -> tuple[dict, dict]:
+    """
+    Run every producer the registry needs.
+
+    Producers run in waves: each wave is every producer whose
+    upstreams are done, and its uncached members run concurrently
+    in a process pool when n_workers > 1.
+
+    params:  {producer: {param: value}} overrides
+    cache:   content-hash cache; a producer whose inputs, code and
+             parameters are unchanged is loaded, not recomputed.
+             Incremental runs (history/state given) bypass it.
+    history, state: incremental build context (see Producer.resume)
+
+    Returns ({producer: output frame}, {producer: state}), both in
+    resolution order.
+    """
+
+    params = params or {}
+    state = state or {}
+    incremental = history is not None
+
+    unknown = set(params) - set(PRODUCERS)
+    if unknown:
+        raise ValueError(f"Unknown producer(s) {sorted(unknown)}")
+
+    ordered = [
+        with_params(p, params.get(p.name))
+        for p in resolve_producers(registry)
+    ]
+
+    results, keys = {}, {}
+    outputs = {}
+    pool = None
+
+    try:
+        remaining = list(ordered)
+
+        while remaining:
+            wave = [
+                p for p in remaining
+                if all(u in results for u in p.depends_on)
+            ]
+            if not wave:
+                raise RuntimeError("Unresolvable feature producer dependencies")
+            remaining = [p for p in remaining if p not in wave]
+
+            jobs = []
+            for producer in wave:
+                frame = _producer_input(producer, dataset, history, outputs, params)
+
+                key = None
+                if cache is not None and not incremental:
+                    key = producer_key(
+                        producer,
+                        frame,
+                        taxonomy,
+                        {u: keys[u] for u in producer.depends_on},
+                    )
+                    cached = cache.get(key)
+                    if cached is not None:
+                        results[producer.name] = cached
+
+                keys[producer.name] = key
+
+                if verbose:
+                    hit = producer.name in results
+                    print(f"  {producer.name}: {'cached' if hit else 'computed'}")
+
+                if producer.name not in results:
+                    jobs.append((producer, frame, taxonomy, state.get(producer.name)))
+
+            if n_workers > 1 and len(jobs) > 1:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=n_workers)
+                computed = pool.map(_run_producer, jobs)
+            else:
+                computed = map(_run_producer, jobs)
+
+            for (producer, *_), result in zip(jobs, computed):
+                results[producer.name] = result
+                if keys[producer.name] is not None:
+                    cache.put(keys[producer.name], result)
+
+            for producer in wave:
+                outputs[producer.name] = results[producer.name][0]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return (
+        {p.name: results[p.name][0] for p in ordered},
+        {p.name: results[p.name][1] for p in ordered},
+    )
+
+
+def attach_outputs(
+    dataset: pd.DataFrame,
+    outputs: dict,
+    params: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Left-join producer outputs onto the base rows and apply fills
+    (under the same `params` overrides the producers ran with).
+
+    Each output is aligned by reindexing on the rows' key MultiIndex
+    and every new column is added in one concat — no per-producer
+    full-frame merge.
+    """
+
+    params = params or {}
+    columns = {}
+
+    for name, output in outputs.items():
+        producer = with_params(PRODUCERS[name], params.get(name))
+        keys = list(producer.keys)
+
+        indexed = output.set_index(keys)[list(producer.outputs)]
+        if not indexed.index.is_unique:
+            raise RuntimeError(f"Producer '{name}' output has duplicate {keys} rows")
+
+        aligned = indexed.reindex(pd.MultiIndex.from_frame(dataset[keys]))
+
+        for col in producer.outputs:
+            values = aligned[col]
+            if col in producer.fill:
+                fill = producer.fill[col]
+                if isinstance(fill, str):
+                    fill = producer.params[fill]
+                values = values.fillna(fill)
+            columns[col] = values.to_numpy()
+
+    return pd.concat(
+        [dataset, pd.DataFrame(columns, index=dataset.index)],
+        axis=1,
+    )
@@ -0,0 +1,130 @@
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+FEATURE_REGISTRY_PATH = Path("features/feature_registry.csv")
+
+CONTEXTS = ("pre_quali", "post_quali")
+
+REQUIRED_COLUMNS = {
+    "feature_name",
+    "entity",
+    "description",
+    "source",
+    "available_at",
+    "valid_for",
+    "leakage_risk",
+    "producer",
+}
+
+ALLOWED_TIMINGS = {
+    "season_start",
+    "pre_weekend",
+    "post_qualifying",
+    "race_morning",
+}
+
+# Timings whose values are unknown before qualifying
+POST_QUALI_TIMINGS = {"post_qualifying"}
+
+
+# -----------------------------
+# LOAD + VALIDATE
+# -----------------------------
+def validate_registry(registry: pd.DataFrame):
+    if not REQUIRED_COLUMNS.issubset(registry.columns):
+        raise RuntimeError("Feature registry schema is invalid")
+
+    if not set(registry["available_at"]).issubset(ALLOWED_TIMINGS):
+        raise RuntimeError("Illegal available_at value in feature registry")
+
+    if registry["feature_name"].duplicated().any():
+        raise RuntimeError("Duplicate feature in feature registry")
+
+
+@lru_cache(maxsize=None)
+def _load_registry(path: str) -> pd.DataFrame:
+    registry = pd.read_csv(path)
+    validate_registry(registry)
+    return registry
+
+
+def load_feature_registry(path: Path = FEATURE_REGISTRY_PATH) -> pd.DataFrame:
+    """
+    Validated feature registry, read once per process.
+    """
+
+    return _load_registry(str(path)).copy()
+
+
+# -----------------------------
+# CONTEXT RULES
+# -----------------------------
+def context_features(
+    context: str,
+    registry: pd.DataFrame | None = None,
+) -> list[str]:
+    """
+    Registry features a context may use, in registry order.
+
+    Raises if the registry itself marks a post-qualifying feature
+    as valid before qualifying.
+    """
+
+    if context not in CONTEXTS:
+        raise RuntimeError(f"Unknown context '{context}'")
+
+    if registry is None:
+        registry = load_feature_registry()
+
+    allowed = registry[
+        (registry["valid_for"] == "both") |
+        (registry["valid_for"] == context)
+    ]
+
+    if context == "pre_quali":
+        leaked = allowed[allowed["available_at"].isin(POST_QUALI_TIMINGS)]
+        if not leaked.empty:
+            raise RuntimeError(
+                f"Illegal feature {leaked['feature_name'].iloc[0]} in pre_quali context"
+            )
+
+    return allowed["feature_name"].tolist()
+
+
+def context_columns(
+    stored_columns: list[str],
+    context: str,
+    columns: list[str] | None = None,
+    registry: pd.DataFrame | None = None,
+) -> list[str]:
+    """
+    Columns of the stored base table visible in `context`.
+
+    Non-registry columns (ids, keys) are always visible; registry
+    features only if the context allows them. Explicitly requesting
+    a feature the context may not use raises.
+    """
+
+    if registry is None:
+        registry = load_feature_registry()
+
+    features = set(registry["feature_name"])
+    allowed = set(context_features(context, registry))
+
+    visible = [
+        c for c in stored_columns
+        if c not in features or c in allowed
+    ]
+
+    if columns is None:
+        return visible
+
+    illegal = [c for c in columns if c in features and c not in allowed]
+    if illegal:
+        raise RuntimeError(
+            f"Feature(s) {illegal} not available in {context} context"
+        )
+
+    return list(columns)
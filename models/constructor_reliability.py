@@ -1,16 +1,11 @@
 import pandas as pd
 
-# Mechanical failure keywords from Ergast status descriptions
-MECHANICAL_KEYWORDS = [
-    "engine", "gearbox", "transmission", "clutch",
-    "hydraulics", "electrical", "oil", "water",
-    "fuel", "battery", "power unit", "driveshaft",
-    "brakes", "suspension", "overheating", "tyre",
-]
+from models.rolling import rolling_prior_stat
+from models.status_taxonomy import StatusTaxonomy, attach_status_labels
 
 def compute_constructor_reliability(
     dataset: pd.DataFrame,
-    status_df: pd.DataFrame,
+    taxonomy: StatusTaxonomy,
     window: int = 10,
 ) -> pd.DataFrame:
     """
@@ -32,55 +27,20 @@ def compute_constructor_reliability(
     if not required_cols.issubset(dataset.columns):
         raise RuntimeError("Dataset missing required columns")
 
-    if not {"statusId", "status"}.issubset(status_df.columns):
-        raise RuntimeError("status.csv missing required columns")
-
-    # Join status descriptions
-    df = dataset.merge(
-        status_df,
-        how="left",
-        left_on="status_id",
-        right_on="statusId",
+    df = attach_status_labels(dataset, taxonomy)
+
+    # Any mechanical failure in the race → failure for that race
+    rates = rolling_prior_stat(
+        df,
+        entity="constructor_id",
+        value_col="mechanical_failure",
+        agg="max",
+        window=window,
+        stat="rate",
+        out_col="constructor_reliability",
     )
 
-    df = df.sort_values(["season", "round"]).reset_index(drop=True)
-
-    # Classify mechanical failures
-    def is_mechanical_failure(status_text: str) -> int:
-        if not isinstance(status_text, str):
-            return 0
-        s = status_text.lower()
-        return int(any(k in s for k in MECHANICAL_KEYWORDS))
-
-    df["mechanical_failure"] = df["status"].apply(is_mechanical_failure)
-
-    results = []
-
-    for constructor_id, group in df.groupby("constructor_id"):
-
-        history = []
-
-        for race_id, race_group in group.groupby("race_id", sort=False):
-
-            # Compute reliability using ONLY prior races
-            if len(history) > 0:
-                failure_rate = sum(history) / len(history)
-                reliability = 1.0 - failure_rate
-            else:
-                reliability = None  # no history yet
-
-            results.append({
-                "race_id": race_id,
-                "constructor_id": constructor_id,
-                "constructor_reliability": reliability,
-            })
-
-            # Update history AFTER computing
-            # Any mechanical failure in the team this race → failure
-            race_failed = int(race_group["mechanical_failure"].any())
-            history.append(race_failed)
-
-            if len(history) > window:
-                history = history[-window:]
+    # Reliability = 1 - failure rate (NaN = no history yet)
+    rates["constructor_reliability"] = 1.0 - rates["constructor_reliability"]
 
-    return pd.DataFrame(results)
+    return rates
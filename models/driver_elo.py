@@ -1,5 +1,5 @@
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 
 INITIAL_ELO = 1500
 K_FACTOR = 16
@@ -9,45 +9,127 @@ def expected_score(ra, rb):
     return 1 / (1 + 10 ** ((rb - ra) / 400))
 
 
-def compute_driver_elo(results: pd.DataFrame) -> pd.DataFrame:
+def _update_race(ratings: np.ndarray, idx: np.ndarray, k: float = K_FACTOR):
     """
-    Computes PRE-race ELO for each driver in each race.
-    Optimized: no nested pandas iteration.
+    Apply one race's pairwise updates in place.
+
+    idx: dense driver indices in finishing order.
+
+    Pairs are resolved winner-row by winner-row: row i scores driver i
+    against everyone behind, using i's rating at the start of the row
+    and each rival's current rating — the same sequence as the original
+    nested loop — with each row done as one vector operation.
+    """
+
+    for i in range(len(idx) - 1):
+        behind = idx[i + 1:]
+
+        ei = expected_score(ratings[idx[i]], ratings[behind])
+
+        ratings[idx[i]] += (k * (1 - ei)).sum()
+        ratings[behind] += k * (0 - (1 - ei))
+
+
+def _update_race_scalar(ratings: np.ndarray, idx: np.ndarray, k: float = K_FACTOR):
+    # Same driver twice in one race (shared drives): keep exact
+    # sequential semantics, the vector form assumes unique drivers
+    for i in range(len(idx)):
+        ri = ratings[idx[i]]
+
+        for j in range(i + 1, len(idx)):
+            ei = expected_score(ri, ratings[idx[j]])
+
+            ratings[idx[i]] += k * (1 - ei)
+            ratings[idx[j]] += k * (0 - (1 - ei))
+
+
+def run_driver_elo(
+    results: pd.DataFrame,
+    initial_ratings: dict | None = None,
+    k_factor: float = K_FACTOR,
+    initial_elo: float = INITIAL_ELO,
+) -> tuple[pd.DataFrame, dict]:
     """
+    Computes PRE-race ELO for each driver in each race, and returns
+    the ratings after the last race ({driver_id: rating}).
 
-    elo = defaultdict(lambda: INITIAL_ELO)
-    records = []
+    Every starter gets a pre-race rating; only finishers are rated
+    against each other, so a retirement leaves the rating unchanged
+    (and the pre-race value says nothing about the outcome).
 
-    # Ensure deterministic race order
-    results = results.sort_values(["race_id", "position_order"])
+    `initial_ratings` resumes from a previous run's final ratings;
+    drivers not in it start at `initial_elo`.
 
-    for race_id, race_df in results.groupby("race_id"):
-        # Extract finished drivers only
-        finished = race_df[race_df["status_id"] == 1]
+    Races are rated in (season, round) order — race ids are not
+    chronological — so a pre-race rating only reflects earlier races.
 
-        drivers = finished["driver_id"].tolist()
+    Ratings live in a dense array indexed by driver; each race is
+    one slice of pre-race lookups plus vectorized pairwise updates.
+    """
+
+    initial_ratings = initial_ratings or {}
+
+    # Chronological, deterministic race order
+    results = results.sort_values(
+        ["season", "round", "race_id", "position_order"], kind="mergesort"
+    )
+
+    driver_ids = results["driver_id"].to_numpy()
+    race_ids = results["race_id"].to_numpy()
+    finished = results["status_id"].to_numpy() == 1
+
+    codes, uniques = pd.factorize(driver_ids)
+    ratings = np.array(
+        [initial_ratings.get(d, initial_elo) for d in uniques],
+        dtype=float,
+    )
+    pre_race = np.empty(len(codes), dtype=float)
+
+    # Contiguous [start, end) slice per race
+    bounds = np.flatnonzero(np.diff(race_ids)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(race_ids)]))
+
+    for start, end in zip(starts, ends):
+        if start == end:
+            continue
 
         # Record PRE-race ELO
-        for d in drivers:
-            records.append({
-                "race_id": race_id,
-                "driver_id": d,
-                "driver_elo": elo[d],
-            })
+        pre_race[start:end] = ratings[codes[start:end]]
 
-        # Update ELO AFTER race
-        for i in range(len(drivers)):
-            di = drivers[i]
-            ri = elo[di]
+        # Update ELO AFTER race, finishers in finishing order
+        idx = codes[start:end][finished[start:end]]
 
-            for j in range(i + 1, len(drivers)):
-                dj = drivers[j]
-                rj = elo[dj]
+        if len(np.unique(idx)) == len(idx):
+            _update_race(ratings, idx, k_factor)
+        else:
+            _update_race_scalar(ratings, idx, k_factor)
 
-                ei = expected_score(ri, rj)
+    final = dict(initial_ratings)
+    final.update(zip(uniques.tolist(), ratings.tolist()))
 
-                # di finished ahead of dj
-                elo[di] += K_FACTOR * (1 - ei)
-                elo[dj] += K_FACTOR * (0 - (1 - ei))
+    # Shared drives: one pre-race rating per driver and race
+    records = pd.DataFrame({
+        "race_id": race_ids,
+        "driver_id": driver_ids,
+        "driver_elo": pre_race,
+    }).drop_duplicates(["race_id", "driver_id"]).reset_index(drop=True)
+
+    return records, final
+
+
+def compute_driver_elo(
+    results: pd.DataFrame,
+    k_factor: float = K_FACTOR,
+    initial_elo: float = INITIAL_ELO,
+) -> pd.DataFrame:
+    """
+    Computes PRE-race ELO for each driver in each race.
+    """
 
-    return pd.DataFrame(records)
+    records, _ = run_driver_elo(
+        results,
+        k_factor=k_factor,
+        initial_elo=initial_elo,
+    )
+    return records
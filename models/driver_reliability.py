@@ -1,15 +1,19 @@
 import pandas as pd
 
-MECHANICAL_KEYWORDS = [
-    "engine", "gearbox", "transmission", "clutch",
-    "hydraulics", "electrical", "oil", "water",
-    "fuel", "battery", "power unit", "driveshaft",
-    "brakes", "suspension", "overheating", "tyre",
-]
+from models.rolling import rolling_prior_stat
+from models.status_taxonomy import StatusTaxonomy, attach_status_labels
+
+REQUIRED_COLUMNS = {
+    "race_id",
+    "season",
+    "round",
+    "driver_id",
+    "status_id",
+}
 
 def compute_driver_dnf_rate_mech(
     dataset: pd.DataFrame,
-    status_df: pd.DataFrame,
+    taxonomy: StatusTaxonomy,
     window: int = 10,
 ) -> pd.DataFrame:
     """
@@ -20,61 +24,45 @@ def compute_driver_dnf_rate_mech(
     One value per driver per race.
     """
 
-    required_cols = {
-        "race_id",
-        "season",
-        "round",
-        "driver_id",
-        "status_id",
-    }
-
-    if not required_cols.issubset(dataset.columns):
+    if not REQUIRED_COLUMNS.issubset(dataset.columns):
         raise RuntimeError("Dataset missing required columns")
 
-    if not {"statusId", "status"}.issubset(status_df.columns):
-        raise RuntimeError("status.csv missing required columns")
+    df = attach_status_labels(dataset, taxonomy)
 
-    df = dataset.merge(
-        status_df,
-        how="left",
-        left_on="status_id",
-        right_on="statusId",
+    return rolling_prior_stat(
+        df,
+        entity="driver_id",
+        value_col="mechanical_failure",
+        agg="max",
+        window=window,
+        stat="rate",
+        out_col="driver_dnf_rate_mech",
     )
 
-    df = df.sort_values(["season", "round"]).reset_index(drop=True)
-
-    def is_mechanical_failure(status_text: str) -> int:
-        if not isinstance(status_text, str):
-            return 0
-        s = status_text.lower()
-        return int(any(k in s for k in MECHANICAL_KEYWORDS))
-
-    df["mechanical_failure"] = df["status"].apply(is_mechanical_failure)
-
-    results = []
-
-    for driver_id, group in df.groupby("driver_id"):
-
-        history = []
-
-        for race_id, race_group in group.groupby("race_id", sort=False):
-
-            if len(history) > 0:
-                rate = sum(history) / len(history)
-            else:
-                rate = None
+def compute_driver_incident_rate(
+    dataset: pd.DataFrame,
+    taxonomy: StatusTaxonomy,
+    window: int = 10,
+) -> pd.DataFrame:
+    """
+    Rolling driver accident DNF rate (accidents, collisions, spins).
+    Higher = more incident-prone.
 
-            results.append({
-                "race_id": race_id,
-                "driver_id": driver_id,
-                "driver_dnf_rate_mech": rate,
-            })
+    Uses ONLY prior races.
+    One value per driver per race.
+    """
 
-            # Update AFTER computing
-            race_failed = int(race_group["mechanical_failure"].any())
-            history.append(race_failed)
+    if not REQUIRED_COLUMNS.issubset(dataset.columns):
+        raise RuntimeError("Dataset missing required columns")
 
-            if len(history) > window:
-                history = history[-window:]
+    df = attach_status_labels(dataset, taxonomy)
 
-    return pd.DataFrame(results)
+    return rolling_prior_stat(
+        df,
+        entity="driver_id",
+        value_col="accident",
+        agg="max",
+        window=window,
+        stat="rate",
+        out_col="driver_incident_rate",
+    )
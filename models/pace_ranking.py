@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Adam defaults
+LEARNING_RATE = 0.05
+BETA1, BETA2, ADAM_EPS = 0.9, 0.999, 1e-8
+
+
+@dataclass
+class RankingFit:
+    """
+    Fitted Plackett–Luce utility weights, one per feature column,
+    and the mean negative log-likelihood per ranked driver over
+    each epoch.
+    """
+
+    weights: np.ndarray
+    history: np.ndarray
+
+    @property
+    def nll(self) -> float:
+        return float(self.history[-1])
+
+
+# -----------------------------
+# LIKELIHOOD
+# -----------------------------
+def plackett_luce_nll(u: np.ndarray, mask: np.ndarray) -> tuple[float, np.ndarray]:
+    """
+    Negative log-likelihood of a batch of finishing orders and its
+    gradient with respect to the utilities.
+
+    u, mask: (races × L), each row in finishing order (winner first)
+    and padded at the end; mask marks the real entries.
+
+    P(order) = Π_i exp(u_i) / Σ_{k ≥ i} exp(u_k), so with
+    S_i = Σ_{k ≥ i} exp(u_k):
+
+        −log P    = Σ_i log S_i − u_i
+        ∂/∂u_j    = exp(u_j) · Σ_{i ≤ j} 1 / S_i − 1
+    """
+
+    # Per-race shift keeps exp() finite; likelihoods are shift-invariant
+    shift = np.where(mask, u, -np.inf).max(axis=1, keepdims=True)
+    e = np.where(mask, np.exp(np.where(mask, u - shift, 0.0)), 0.0)
+
+    S = np.cumsum(e[:, ::-1], axis=1)[:, ::-1]
+    inv_S = np.where(mask, 1.0 / np.where(mask, S, 1.0), 0.0)
+
+    nll = np.where(mask, np.log(np.where(mask, S, 1.0)) - (u - shift), 0.0).sum()
+    grad = np.where(mask, e * np.cumsum(inv_S, axis=1) - 1.0, 0.0)
+
+    return float(nll), grad
+
+
+# -----------------------------
+# BATCHES
+# -----------------------------
+def ranking_batch(
+    X: np.ndarray,
+    starts: np.ndarray,
+    sizes: np.ndarray,
+    races: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Padded (B × L × F) features and (B × L) mask for races `races`.
+
+    X holds every ranked driver, grouped by race in finishing order;
+    race r is rows starts[r] .. starts[r] + sizes[r]. Only the batch
+    is ever padded, so memory is bounded by the batch size.
+    """
+
+    L = int(sizes[races].max())
+    slot = np.arange(L)
+
+    mask = slot[None, :] < sizes[races][:, None]
+    rows = np.where(mask, starts[races][:, None] + slot[None, :], 0)
+
+    return X[rows], mask
+
+
+def fit_plackett_luce(
+    X: np.ndarray,
+    sizes: np.ndarray,
+    epochs: int = 60,
+    batch_races: int = 128,
+    learning_rate: float = LEARNING_RATE,
+    l2: float = 1e-4,
+    seed: int = 0,
+) -> RankingFit:
+    """
+    Fit linear utilities u = X · w to observed finishing orders by
+    mini-batch Adam on the Plackett–Luce likelihood.
+
+    X:     (n_ranked × F) features, grouped by race in finishing order
+    sizes: ranked drivers per race, in the same race order
+
+    Each step scores `batch_races` races as one padded tensor: the
+    likelihood and gradient are computed for all of them at once.
+    """
+
+    X = np.asarray(X, dtype=float)
+    sizes = np.asarray(sizes, dtype=np.int64)
+
+    if len(sizes) == 0 or sizes.sum() != len(X):
+        raise ValueError("sizes must partition the rows of X by race")
+
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    n_races, F = len(sizes), X.shape[1]
+
+    rng = np.random.default_rng(seed)
+    w = np.zeros(F)
+    m, v = np.zeros(F), np.zeros(F)
+    step = 0
+    history = []
+
+    for epoch in range(epochs):
+        order = rng.permutation(n_races)
+        total = 0.0
+
+        # Step size decays so mini-batch noise settles by the last epoch
+        rate = learning_rate / np.sqrt(1 + epoch)
+
+        for b in range(0, n_races, batch_races):
+            batch = order[b:b + batch_races]
+            Xb, mask = ranking_batch(X, starts, sizes, batch)
+
+            nll, grad_u = plackett_luce_nll(Xb @ w, mask)
+            total += nll
+
+            n = mask.sum()
+            grad = np.einsum("bl,blf->f", grad_u, Xb) / n + l2 * w
+
+            step += 1
+            m = BETA1 * m + (1 - BETA1) * grad
+            v = BETA2 * v + (1 - BETA2) * grad ** 2
+            m_hat = m / (1 - BETA1 ** step)
+            v_hat = v / (1 - BETA2 ** step)
+            w -= rate * m_hat / (np.sqrt(v_hat) + ADAM_EPS)
+
+        history.append(total / sizes.sum())
+
+    return RankingFit(weights=w, history=np.array(history))
+
+
+def ranking_nll(
+    X: np.ndarray,
+    sizes: np.ndarray,
+    weights: np.ndarray,
+    batch_races: int = 512,
+) -> float:
+    """
+    Mean negative log-likelihood per ranked driver under `weights`.
+    """
+
+    X = np.asarray(X, dtype=float)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    total = 0.0
+    for b in range(0, len(sizes), batch_races):
+        batch = np.arange(b, min(b + batch_races, len(sizes)))
+        Xb, mask = ranking_batch(X, starts, sizes, batch)
+        total += plackett_luce_nll(Xb @ weights, mask)[0]
+
+    return total / sizes.sum()
@@ -0,0 +1,82 @@
+import pandas as pd
+
+STATS = {"mean", "median", "rate"}
+
+
+def per_race_values(
+    dataset: pd.DataFrame,
+    entity: str,
+    value_col: str,
+    agg: str,
+) -> pd.DataFrame:
+    """
+    Collapse rows to one value per (entity, race), e.g. the median
+    finish of a team or "any failure" of a driver, in time order.
+
+    Columns: entity, race_id, season, round, value
+    """
+
+    per_race = (
+        dataset
+        .groupby([entity, "race_id"], sort=False)
+        .agg(
+            season=("season", "first"),
+            round=("round", "first"),
+            value=(value_col, agg),
+        )
+        .reset_index()
+    )
+
+    return per_race.sort_values(
+        [entity, "season", "round"],
+        kind="mergesort",
+    ).reset_index(drop=True)
+
+
+def prior_rolling(
+    per_race: pd.DataFrame,
+    entity: str,
+    window: int,
+    stat: str,
+) -> pd.Series:
+    """
+    Rolling `stat` over each entity's previous `window` races.
+
+    Shifted by one race per entity, so a race never sees its own
+    value (leakage-safe). NaN for an entity's first race.
+    """
+
+    if stat not in STATS:
+        raise RuntimeError(f"Unknown rolling stat '{stat}'")
+
+    keys = per_race[entity]
+    prior = per_race["value"].astype(float).groupby(keys, sort=False).shift(1)
+
+    rolling = prior.groupby(keys, sort=False).rolling(window, min_periods=1)
+    rolled = rolling.median() if stat == "median" else rolling.mean()
+
+    return rolled.reset_index(level=0, drop=True).reindex(per_race.index)
+
+
+def rolling_prior_stat(
+    dataset: pd.DataFrame,
+    entity: str,
+    value_col: str,
+    agg: str,
+    window: int,
+    stat: str,
+    out_col: str,
+) -> pd.DataFrame:
+    """
+    Shared rolling-window engine for entity features.
+
+    1. aggregate rows to one value per (entity, race) with `agg`
+    2. take `stat` over the entity's previous `window` races
+
+    Returns one row per (entity, race): race_id, entity, out_col
+    """
+
+    per_race = per_race_values(dataset, entity, value_col, agg)
+    per_race[out_col] = prior_rolling(per_race, entity, window, stat)
+
+    return per_race[["race_id", entity, out_col]]
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Mechanical failure keywords from Ergast status descriptions
+MECHANICAL_KEYWORDS = [
+    "engine", "gearbox", "transmission", "clutch",
+    "hydraulics", "electrical", "oil", "water",
+    "fuel", "battery", "power unit", "driveshaft",
+    "brakes", "suspension", "overheating", "tyre",
+]
+
+ACCIDENT_KEYWORDS = ["accident", "collision", "spun off"]
+
+DISQUALIFIED_KEYWORDS = ["disqualified", "excluded", "underweight"]
+
+# -----------------------------
+# CATEGORY CODES
+# -----------------------------
+FINISHED = 0
+LAPPED = 1
+MECHANICAL = 2
+ACCIDENT = 3
+DISQUALIFIED = 4
+OTHER = 5
+
+CATEGORY_NAMES = (
+    "finished",
+    "lapped",
+    "mechanical",
+    "accident",
+    "disqualified",
+    "other",
+)
+
+
+def classify_status(status_text) -> int:
+    """
+    Category code for one Ergast status description.
+    Mechanical is checked before accident so the mechanical label
+    matches the historical keyword rule exactly.
+    """
+
+    if not isinstance(status_text, str):
+        return OTHER
+
+    s = status_text.lower()
+
+    if s == "finished":
+        return FINISHED
+    if s.startswith("+") and "lap" in s:
+        return LAPPED
+    if any(k in s for k in MECHANICAL_KEYWORDS):
+        return MECHANICAL
+    if any(k in s for k in ACCIDENT_KEYWORDS):
+        return ACCIDENT
+    if any(k in s for k in DISQUALIFIED_KEYWORDS):
+        return DISQUALIFIED
+
+    return OTHER
+
+
+@dataclass(frozen=True)
+class StatusTaxonomy:
+    """
+    Category of every status id, classified once.
+
+    codes[status_id] = category code; ids missing from status.csv
+    map to OTHER. Labelling results is a single integer take.
+    """
+
+    codes: np.ndarray
+    status: pd.DataFrame
+
+    def category(self, status_ids) -> np.ndarray:
+        ids = np.asarray(status_ids, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self.codes))
+
+        return np.where(
+            known,
+            self.codes[np.where(known, ids, 0)],
+            OTHER,
+        )
+
+    def is_mechanical(self, status_ids) -> np.ndarray:
+        return (self.category(status_ids) == MECHANICAL).astype(np.int64)
+
+    def is_accident(self, status_ids) -> np.ndarray:
+        return (self.category(status_ids) == ACCIDENT).astype(np.int64)
+
+    def labels(self) -> pd.DataFrame:
+        """
+        statusId, status, category — for inspection.
+        """
+
+        out = self.status.copy()
+        out["category"] = [
+            CATEGORY_NAMES[c] for c in self.category(out["statusId"])
+        ]
+        return out
+
+
+def build_status_taxonomy(status_df: pd.DataFrame) -> StatusTaxonomy:
+    if not {"statusId", "status"}.issubset(status_df.columns):
+        raise RuntimeError("status.csv missing required columns")
+
+    ids = status_df["statusId"].to_numpy(dtype=np.int64)
+
+    codes = np.full(ids.max() + 1, OTHER, dtype=np.int8)
+    codes[ids] = [classify_status(s) for s in status_df["status"]]
+
+    return StatusTaxonomy(
+        codes=codes,
+        status=status_df[["statusId", "status"]].reset_index(drop=True),
+    )
+
+
+def attach_status_labels(
+    dataset: pd.DataFrame,
+    taxonomy: StatusTaxonomy,
+) -> pd.DataFrame:
+    """
+    Copy of dataset with 0/1 mechanical_failure and accident columns.
+    """
+
+    df = dataset.copy()
+    category = taxonomy.category(df["status_id"])
+
+    df["mechanical_failure"] = (category == MECHANICAL).astype(np.int64)
+    df["accident"] = (category == ACCIDENT).astype(np.int64)
+
+    return df
@@ -0,0 +1,281 @@
+import sys
+from pathlib import Path
+
+# -----------------------------
+# Ensure project root on path
+# -----------------------------
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from simulation.circuit_registry import get_circuit_profile
+from simulation.monte_carlo import simulate_race
+from simulation.simulator import run_race_simulation
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+# Per-machine run history. benchmarks/ is git-ignored: timings only
+# compare against earlier runs on the same machine, so the gate below
+# is a local check, not a committed reference baseline.
+HISTORY_PATH = PROJECT_ROOT / "benchmarks" / "simulation_history.jsonl"
+
+GRID_SIZES = (10, 20, 26)
+SIM_COUNTS = (10**3, 10**4, 10**5, 10**6)
+QUICK_SIM_COUNTS = (10**3, 10**4)
+
+BENCH_SEED = 1234
+CIRCUIT_ID = 1
+SCENARIO = {
+    "weather": {"rain_prob": 0.0},
+    "mechanical": {"reliability_multiplier": 1.0},
+    "chaos": {"accident_multiplier": 1.0},
+}
+
+
+# -----------------------------
+# SYNTHETIC INPUTS
+# -----------------------------
+def synthetic_dataset(n_drivers: int) -> pd.DataFrame:
+    """
+    One-race processed dataset with a realistic spread of features.
+    Fixed seed so every run benchmarks the same grid.
+    """
+
+    rng = np.random.default_rng(BENCH_SEED + n_drivers)
+
+    return pd.DataFrame({
+        "season": 2024,
+        "round": 1,
+        "race_id": 1,
+        "circuit_id": CIRCUIT_ID,
+        "driver_id": np.arange(1, n_drivers + 1),
+        "constructor_id": np.arange(n_drivers) // 2 + 1,
+        "position_order": np.arange(1, n_drivers + 1),
+        "driver_elo": rng.normal(1600, 150, n_drivers),
+        "constructor_pace_index": rng.uniform(2, 10, n_drivers),
+        "constructor_reliability": rng.uniform(0.8, 0.99, n_drivers),
+    })
+
+
+def benchmark_cases(quick: bool) -> list[dict]:
+    counts = QUICK_SIM_COUNTS if quick else SIM_COUNTS
+
+    return [
+        {"target": target, "n_drivers": n_drivers, "n_simulations": n}
+        for target in ("simulate_race", "run_race_simulation")
+        for n_drivers in GRID_SIZES
+        for n in counts
+    ]
+
+
+def case_name(case: dict) -> str:
+    return f"{case['target']}[N={case['n_drivers']},sims={case['n_simulations']}]"
+
+
+# -----------------------------
+# MEASUREMENT
+# -----------------------------
+def _runner(case: dict):
+    dataset = synthetic_dataset(case["n_drivers"])
+    n = case["n_simulations"]
+
+    if case["target"] == "simulate_race":
+        circuit = get_circuit_profile(CIRCUIT_ID)
+        return lambda: simulate_race(
+            dataset, circuit, SCENARIO,
+            n_simulations=n, random_seed=BENCH_SEED,
+        )
+
+    return lambda: run_race_simulation(
+        dataset=dataset,
+        season=2024,
+        round=1,
+        circuit_id=CIRCUIT_ID,
+        scenario=SCENARIO,
+        n_simulations=n,
+        random_seed=BENCH_SEED,
+    )
+
+
+def measure(case: dict, repeat: int) -> dict:
+    run = _runner(case)
+
+    # Warm-up (imports, caches, allocator)
+    run()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    # Peak memory in a separate pass — tracing slows the timed runs
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall = min(times)
+
+    return {
+        "case": case_name(case),
+        **case,
+        "wall_time_s": wall,
+        "sims_per_s": case["n_simulations"] / wall,
+        "peak_memory_mb": peak / 1e6,
+    }
+
+
+# -----------------------------
+# LOCAL HISTORY + REGRESSION GATE
+# -----------------------------
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history: list[dict], window: int) -> dict:
+    """
+    Best (lowest) wall time and peak memory per case over
+    the last `window` recorded runs.
+    """
+
+    best = {}
+    for record in history[-window:]:
+        for r in record["results"]:
+            b = best.setdefault(r["case"], dict(r))
+            b["wall_time_s"] = min(b["wall_time_s"], r["wall_time_s"])
+            b["peak_memory_mb"] = min(b["peak_memory_mb"], r["peak_memory_mb"])
+    return best
+
+
+def regressions(results: list[dict], base: dict, threshold: float) -> list[str]:
+    failures = []
+
+    for r in results:
+        b = base.get(r["case"])
+        if b is None:
+            continue
+
+        for metric in ("wall_time_s", "peak_memory_mb"):
+            if b[metric] > 0 and r[metric] > b[metric] * (1 + threshold):
+                failures.append(
+                    f"{r['case']}: {metric} {r[metric]:.4g} vs "
+                    f"baseline {b[metric]:.4g} (+{r[metric] / b[metric] - 1:.0%})"
+                )
+
+    return failures
+
+
+# -----------------------------
+# EXECUTION
+# -----------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the race simulation engine and compare against "
+            "earlier runs recorded on this machine."
+        )
+    )
+    parser.add_argument(
+        "--history", type=Path, default=HISTORY_PATH,
+        help="local run history (not version controlled)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.20,
+        help="allowed slowdown / memory growth vs baseline (0.20 = 20%%)",
+    )
+    parser.add_argument(
+        "--window", type=int, default=5,
+        help="number of past runs the baseline is taken from",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick", action="store_true",
+        help="only 10^3 and 10^4 simulations",
+    )
+    record_mode = parser.add_mutually_exclusive_group()
+    record_mode.add_argument(
+        "--no-record", action="store_true",
+        help="compare against history without appending this run",
+    )
+    record_mode.add_argument(
+        "--record-anyway", action="store_true",
+        help="append this run even if it regressed (e.g. an accepted slowdown)",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for case in benchmark_cases(args.quick):
+        r = measure(case, args.repeat)
+        results.append(r)
+        print(
+            f"{r['case']:<48} {r['wall_time_s'] * 1e3:10.2f} ms "
+            f"{r['sims_per_s']:14,.0f} sims/s {r['peak_memory_mb']:9.2f} MB"
+        )
+
+    history = load_history(args.history)
+    compared = bool(history)
+    failures = regressions(results, baseline(history, args.window), args.threshold)
+
+    # Regressed runs would push good ones out of the baseline window
+    keep = not args.no_record and (not failures or args.record_anyway)
+
+    if keep:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    if failures:
+        print("\nPerformance regressions:")
+        for line in failures:
+            print(f"  {line}")
+        if not keep:
+            print(f"Not recorded in {args.history}; use --record-anyway to accept it.")
+        return 1
+
+    if not compared:
+        print(f"\nNo local history at {args.history}; nothing to compare against.")
+    else:
+        print("\nNo regressions against local history.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,208 +7,453 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
+import argparse
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 
-from models.driver_elo import compute_driver_elo
-from models.constructor_pace import compute_constructor_pace
-from models.constructor_reliability import compute_constructor_reliability
+from data.columnar import (
+    base_path,
+    load_context_dataset,
+    read_columnar,
+    write_columnar,
+)
+from data.feature_store import write_feature_store
+from data.store import build_base_dataset, load_table
+from features.producers import (
+    attach_outputs,
+    feature_cache,
+    feature_producers,
+    placeholder_feature,
+    resolve_producers,
+    run_producers,
+    with_params,
+)
+from features.registry import CONTEXTS, context_features, load_feature_registry
+from models.status_taxonomy import build_status_taxonomy
 
 # -----------------------------
 # CONFIG
 # -----------------------------
-RAW_DATA_DIR = Path("data/raw")
 PROCESSED_DATA_DIR = Path("data/processed")
-FEATURE_REGISTRY_PATH = Path("features/feature_registry.csv")
+BUILD_STATE_PATH = PROCESSED_DATA_DIR / "build_state.pkl"
+
+# Bump when the build state layout changes; older states force a full build
+STATE_VERSION = 2
+
+RAW_ROW_COLUMNS = [
+    "race_id",
+    "driver_id",
+    "constructor_id",
+    "position_order",
+    "status_id",
+    "season",
+    "round",
+    "race_date",
+    "circuit_id",
+]
 
 PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # -----------------------------
 # LOAD FEATURE REGISTRY
 # -----------------------------
-registry = pd.read_csv(FEATURE_REGISTRY_PATH)
-
-REQUIRED_COLUMNS = {
-    "feature_name",
-    "entity",
-    "description",
-    "source",
-    "available_at",
-    "valid_for",
-    "leakage_risk",
-}
-
-if not REQUIRED_COLUMNS.issubset(registry.columns):
-    raise RuntimeError("Feature registry schema is invalid")
-
-ALLOWED_TIMINGS = {
-    "season_start",
-    "pre_weekend",
-    "post_qualifying",
-    "race_morning",
-}
-
-if not set(registry["available_at"]).issubset(ALLOWED_TIMINGS):
-    raise RuntimeError("Illegal available_at value in feature registry")
+registry = load_feature_registry()
 
 # -----------------------------
 # LOAD RAW DATA
 # -----------------------------
-results = pd.read_csv(RAW_DATA_DIR / "results.csv")
-races   = pd.read_csv(RAW_DATA_DIR / "races.csv")
-status  = pd.read_csv(RAW_DATA_DIR / "status.csv")
+def load_raw_tables():
+    return load_table("results"), load_table("races"), load_table("status")
 
 # -----------------------------
-# INJECT SEASON / ROUND / META
+# MODEL FEATURES
 # -----------------------------
-results = results.merge(
-    races[["race_id", "season", "round", "race_date", "circuit_id"]],
-    how="left",
-    on="race_id",
-)
-
-# Drop races not present in races.csv
-missing = results["season"].isna()
-if missing.any():
-    bad_ids = results.loc[missing, "race_id"].unique()
-    print(
-        f"Dropping {len(bad_ids)} races missing from races.csv "
-        f"(max race_id={bad_ids.max()})"
+def add_model_features(
+    dataset: pd.DataFrame,
+    taxonomy,
+    history: pd.DataFrame | None = None,
+    state: dict | None = None,
+    params: dict | None = None,
+    cache=None,
+    n_workers: int = 1,
+):
+    """
+    Run the registry's feature producers and attach their outputs.
+    Independent producers run concurrently across `n_workers` processes.
+
+    Incremental builds pass the previous `state` (per producer, e.g.
+    Elo ratings after the last processed race) and `history` — the
+    raw rows of each driver's and constructor's last races — which
+    the rolling producers read as prior context.
+
+    Returns (dataset with features, producer state after the last race).
+    """
+
+    outputs, state = run_producers(
+        dataset,
+        taxonomy,
+        registry,
+        params=params,
+        cache=cache,
+        history=history,
+        state=state,
+        n_workers=n_workers,
+        verbose=True,
     )
 
-results = results.loc[~missing].copy()
+    return attach_outputs(dataset, outputs, params), state
+
+def final_snapshot(
+    dataset: pd.DataFrame,
+    taxonomy,
+    history: pd.DataFrame,
+    state: dict,
+    params: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Every driver's and constructor's features after its last race.
+
+    Runs the producers, resumed from the build's `history` and
+    `state` like an incremental build, over a phantom race after the
+    table's last one that every driver and constructor enters: its
+    pre-race values are everyone's current state. Constructors no
+    driver last raced for enter with placeholder (negative) driver ids.
+    """
+
+    last = dataset.sort_values(["season", "round"], kind="mergesort")
+    drivers = last.drop_duplicates("driver_id", keep="last")
+
+    orphans = np.setdiff1d(
+        dataset["constructor_id"].unique(), drivers["constructor_id"].unique()
+    )
 
-# -----------------------------
-# CANONICAL DRIVER–RACE DATASET
-# -----------------------------
-dataset = results.sort_values(
-    ["season", "round", "position_order"]
-).reset_index(drop=True)
+    phantom = pd.DataFrame({
+        "driver_id": np.concatenate(
+            [drivers["driver_id"], -np.arange(1, len(orphans) + 1)]
+        ),
+        "constructor_id": np.concatenate([drivers["constructor_id"], orphans]),
+    })
+    phantom = phantom.assign(
+        race_id=dataset["race_id"].max() + 1,
+        season=dataset["season"].max() + 1,
+        round=1,
+        race_date="",
+        circuit_id=0,
+        position_order=np.arange(1, len(phantom) + 1),
+        status_id=1,
+    )[RAW_ROW_COLUMNS]
+
+    outputs, _ = run_producers(
+        phantom,
+        taxonomy,
+        registry,
+        params=params,
+        history=history_tail(history, history_races(params)),
+        state=state,
+    )
 
-# -----------------------------
-# DRIVER ELO (ONCE, CHRONOLOGICAL)
-# -----------------------------
-driver_elo_df = compute_driver_elo(dataset)
+    return build_base_table(attach_outputs(phantom, outputs, params))
 
-dataset = dataset.merge(
-    driver_elo_df,
-    how="left",
-    on=["race_id", "driver_id"],
-)
+def history_races(params: dict | None = None) -> int:
+    """
+    Races of history per entity the incremental state must keep:
+    the largest rolling window among the registry's producers.
+    """
 
-dataset["driver_elo"] = dataset["driver_elo"].fillna(1500.0)
+    params = params or {}
+    windows = [
+        with_params(p, params.get(p.name)).params.get("window", 0)
+        for p in resolve_producers(registry)
+    ]
+    return max(windows, default=0)
 
 # -----------------------------
-# CONSTRUCTOR PACE (ONCE)
+# BASE TABLE
 # -----------------------------
-constructor_pace_df = compute_constructor_pace(dataset)
+def build_base_table(dataset: pd.DataFrame) -> pd.DataFrame:
+    """
+    Every registry feature on every row. Contexts are read as
+    column projections of this one table (see load_context_dataset),
+    so they share rows by construction.
+    """
 
-dataset = dataset.merge(
-    constructor_pace_df,
-    how="left",
-    on=["race_id", "constructor_id"],
-)
+    # Fail the build, not just the read, on a leaky registry
+    for context in CONTEXTS:
+        context_features(context, registry)
 
-# -----------------------------
-# CONSTRUCTOR RELIABILITY (ONCE)
-# -----------------------------
-constructor_reliability_df = compute_constructor_reliability(
-    dataset,
-    status_df=status,
-)
+    df = dataset.copy()
+    produced = feature_producers(registry)
+
+    for fname in registry["feature_name"]:
+        if fname not in produced:
+            df[fname] = placeholder_feature(fname, df.index)
+
+    return df
+
+def write_base_table(
+    dataset: pd.DataFrame,
+    final: pd.DataFrame,
+    out_dir: Path = PROCESSED_DATA_DIR,
+    append: bool = False,
+):
+    out = base_path(out_dir)
+    df = build_base_table(dataset)
+
+    # Columns are single files: appending rewrites them whole,
+    # which is still far cheaper than recomputing the features
+    if append:
+        df = pd.concat(
+            [read_columnar(out, mmap=False), df],
+            ignore_index=True,
+        )
 
-dataset = dataset.merge(
-    constructor_reliability_df,
-    how="left",
-    on=["race_id", "constructor_id"],
-)
+    write_columnar(df, out)
+    print(f"{'Appended to' if append else 'Saved'} {out}")
 
-dataset["constructor_reliability"] = (
-    dataset["constructor_reliability"]
-    .fillna(1.0)
-)
+    # As-of store over the whole table, rebuilt with it
+    write_feature_store(df, final, out_dir, registry)
 
 # -----------------------------
-# FEATURE COMPUTATION
+# INCREMENTAL STATE
 # -----------------------------
-IDENTITY_COLUMNS = {
-    "season",
-    "round",
-    "race_id",
-    "driver_id",
-    "constructor_id",
-    "circuit_id",
-    "race_date",
-    "position_order",
-    "status_id",
-}
-
-def compute_feature(feature_name: str, df: pd.DataFrame) -> pd.Series:
-
-    if feature_name in IDENTITY_COLUMNS:
-        raise RuntimeError(
-            f"Illegal feature '{feature_name}': identity columns are not features"
+def history_tail(rows: pd.DataFrame, n_races: int) -> pd.DataFrame:
+    """
+    Raw rows of each constructor's and each driver's last `n_races`
+    races — all a rolling producer needs as prior context.
+    """
+
+    rows = rows[RAW_ROW_COLUMNS]
+    keep = pd.Series(False, index=rows.index)
+
+    for entity in ("constructor_id", "driver_id"):
+        last_races = (
+            rows[[entity, "race_id", "season", "round"]]
+            .drop_duplicates([entity, "race_id"])
+            .sort_values([entity, "season", "round"])
+            .groupby(entity)
+            .tail(n_races)
         )
 
-    # -------------------------
-    # REAL FEATURES
-    # -------------------------
-    if feature_name == "driver_elo":
-        return df["driver_elo"]
-
-    if feature_name == "constructor_pace_index":
-        return df["constructor_pace_index"]
-
-    if feature_name == "constructor_reliability":
-        return df["constructor_reliability"]
+        pairs = pd.MultiIndex.from_frame(last_races[[entity, "race_id"]])
+        keep |= pd.MultiIndex.from_frame(rows[[entity, "race_id"]]).isin(pairs)
+
+    return rows[keep].reset_index(drop=True)
+
+def save_state(
+    dataset: pd.DataFrame,
+    history: pd.DataFrame,
+    producer_state: dict,
+    params: dict,
+):
+    pd.to_pickle(
+        {
+            "version": STATE_VERSION,
+            "race_ids": sorted(dataset["race_id"].unique().tolist()),
+            "last_race": (
+                dataset["season"].max(),
+                dataset.loc[dataset["season"] == dataset["season"].max(), "round"].max(),
+            ),
+            "producer_state": producer_state,
+            "params": params,
+            "history": history_tail(history, history_races(params)),
+        },
+        BUILD_STATE_PATH,
+    )
 
-    # -------------------------
-    # PLACEHOLDERS (INTENTIONAL)
-    # -------------------------
-    if feature_name.startswith("driver_"):
-        return pd.Series(0.0, index=df.index)
+# -----------------------------
+# BUILD MODES
+# -----------------------------
+def build_full(
+    params: dict | None = None,
+    use_cache: bool = True,
+    n_workers: int = 1,
+):
+    """
+    Build the base table from raw data. With the feature cache, only
+    producers whose inputs, code or parameters changed are rerun.
+    """
+
+    params = params or {}
+
+    results, races, status = load_raw_tables()
+
+    # Classify every status id once; models label results by lookup
+    taxonomy = build_status_taxonomy(status)
+
+    dataset = build_base_dataset(results, races)
+    dataset, producer_state = add_model_features(
+        dataset,
+        taxonomy,
+        params=params,
+        cache=feature_cache() if use_cache else None,
+        n_workers=n_workers,
+    )
 
-    if feature_name.startswith("constructor_"):
-        return pd.Series(0.0, index=df.index)
+    write_base_table(
+        dataset, final_snapshot(dataset, taxonomy, dataset, producer_state, params)
+    )
+    save_state(dataset, dataset, producer_state, params)
+
+    return dataset
+
+def build_incremental(
+    params: dict | None = None,
+    use_cache: bool = True,
+    n_workers: int = 1,
+    verify: bool = False,
+):
+    """
+    Append only races not yet in the processed tables, resuming from
+    the persisted producer state. Falls back to a full rebuild when
+    there is no usable state or a new race would land before
+    processed ones.
+    """
+
+    params = params or {}
+
+    state = None
+    if BUILD_STATE_PATH.exists() and base_path().exists():
+        state = pd.read_pickle(BUILD_STATE_PATH)
+
+    if state is None or state.get("version") != STATE_VERSION:
+        print("No build state found — running full build")
+        return build_full(params, use_cache, n_workers)
+
+    if state["params"] != params:
+        print("Producer parameters changed — running full build")
+        return build_full(params, use_cache, n_workers)
+
+    results, races, status = load_raw_tables()
+    taxonomy = build_status_taxonomy(status)
+
+    dataset = build_base_dataset(results, races)
+
+    processed = set(state["race_ids"])
+    new_rows = dataset[~dataset["race_id"].isin(processed)].reset_index(drop=True)
+
+    if new_rows.empty:
+        print("Processed datasets are up to date")
+        return None
+
+    # Producers run in (season, round) order: new races must come
+    # after everything already processed
+    first_new = tuple(new_rows[["season", "round"]].iloc[0])
+    if first_new <= tuple(state["last_race"]):
+        print("New races precede processed ones — running full build")
+        return build_full(params, use_cache, n_workers)
+
+    print(f"Appending {new_rows['race_id'].nunique()} new races")
+
+    new_rows, producer_state = add_model_features(
+        new_rows,
+        taxonomy,
+        history=state["history"],
+        state=state["producer_state"],
+        params=params,
+        n_workers=n_workers,
+    )
 
-    if feature_name.startswith("quali_"):
-        return pd.Series(pd.NA, index=df.index)
+    history = pd.concat(
+        [state["history"], new_rows[RAW_ROW_COLUMNS]], ignore_index=True
+    )
 
-    if feature_name.startswith("weather_"):
-        return pd.Series(0.0, index=df.index)
+    write_base_table(
+        new_rows,
+        final_snapshot(dataset, taxonomy, history, producer_state, params),
+        append=True,
+    )
+    save_state(dataset, history, producer_state, params)
 
-    return pd.Series(pd.NA, index=df.index)
+    if verify:
+        verify_against_full_build(dataset, taxonomy, params)
 
-# -----------------------------
-# BUILD DATASETS BY CONTEXT
-# -----------------------------
-def build_context_dataset(context: str):
-    assert context in {"pre_quali", "post_quali"}
+    return new_rows
 
-    allowed_features = registry[
-        (registry["valid_for"] == "both") |
-        (registry["valid_for"] == context)
-    ]
+def verify_against_full_build(dataset: pd.DataFrame, taxonomy, params: dict):
+    """
+    Rebuild everything in a scratch directory and check every
+    context view of the appended base table is identical.
+    """
 
-    df = dataset.copy()
+    full, state = add_model_features(dataset, taxonomy, params=params)
+    final = final_snapshot(dataset, taxonomy, dataset, state, params)
 
-    for _, row in allowed_features.iterrows():
-        fname = row["feature_name"]
-        available_at = row["available_at"]
+    with tempfile.TemporaryDirectory() as tmp:
+        write_base_table(full, final, out_dir=Path(tmp))
 
-        if context == "pre_quali" and available_at == "post_qualifying":
-            raise RuntimeError(
-                f"Illegal feature {fname} in pre_quali context"
+        for context in CONTEXTS:
+            pd.testing.assert_frame_equal(
+                load_context_dataset(context),
+                load_context_dataset(context, processed_dir=Path(tmp)),
             )
 
-        df[fname] = compute_feature(fname, df)
-
-    out = PROCESSED_DATA_DIR / f"dataset_{context}.csv"
-    df.to_csv(out, index=False)
-    print(f"Saved {out}")
+    print("Incremental build matches a full rebuild")
 
 # -----------------------------
 # EXECUTION
 # -----------------------------
+def parse_param(text: str) -> tuple[str, str, int | float]:
+    """
+    "constructor_pace.window=7" → ("constructor_pace", "window", 7)
+    """
+
+    try:
+        target, value = text.split("=", 1)
+        producer, name = target.split(".", 1)
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected producer.param=value, got '{text}'"
+        )
+
+    return producer, name, int(number) if number.is_integer() else number
+
 if __name__ == "__main__":
-    build_context_dataset("pre_quali")
-    build_context_dataset("post_quali")
+    parser = argparse.ArgumentParser(description="Build processed datasets.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="append only races not yet processed, from saved model state",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="with --incremental: check the result equals a full rebuild",
+    )
+    parser.add_argument(
+        "--set",
+        type=parse_param,
+        action="append",
+        default=[],
+        metavar="PRODUCER.PARAM=VALUE",
+        help="override a producer parameter, e.g. constructor_pace.window=7",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="processes for running independent feature producers",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="recompute every producer instead of reusing cached outputs",
+    )
+    args = parser.parse_args()
+
+    params = {}
+    for producer, name, value in args.set:
+        params.setdefault(producer, {})[name] = value
+
+    if args.incremental:
+        build_incremental(
+            params,
+            not args.no_cache,
+            n_workers=args.workers,
+            verify=args.verify,
+        )
+    else:
+        build_full(params, not args.no_cache, n_workers=args.workers)
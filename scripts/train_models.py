@@ -0,0 +1,518 @@
+import sys
+from pathlib import Path
+
+# -----------------------------
+# Ensure project root on path
+# -----------------------------
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from data.columnar import load_context_dataset
+from data.store import build_base_dataset, load_table
+from features.producers import (
+    PRODUCERS,
+    attach_outputs,
+    feature_cache,
+    run_producers,
+    with_params,
+)
+from features.registry import context_features, load_feature_registry
+from models.pace_ranking import fit_plackett_luce, ranking_nll
+from models.status_taxonomy import FINISHED, LAPPED, build_status_taxonomy
+from simulation.pace import (
+    PACE_MODEL_PATH,
+    FittedPaceModel,
+    PaceModel,
+    TRANSFORMS,
+    save_pace_model,
+)
+from validation.backtest import run_backtest
+from validation.metrics import position_rps, score_predictions
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+RESULTS_PATH = Path("data/processed/hyperparameter_search.csv")
+
+# "producer.param" tunes a feature producer, "pace.field" the
+# simulator's PaceModel
+SEARCH_SPACE = {
+    "driver_elo.k_factor": [8, 16, 24, 32],
+    "driver_elo.initial_elo": [1400, 1500, 1600],
+    "constructor_pace.window": [3, 5, 8],
+    "constructor_reliability.window": [5, 10, 20],
+    "pace.elo_weight": [0.3, 0.45, 0.6],
+    "pace.pace_weight": [400.0, 600.0, 800.0],
+    "pace.noise_sigma": [30.0, 50.0, 80.0],
+}
+
+# Pace model features and the transform applied before weighting
+PACE_FEATURES = {
+    "driver_elo": "identity",
+    "constructor_pace_index": "inverse",
+    "constructor_reliability": "identity",
+    "driver_incident_rate": "identity",
+    "driver_dnf_rate_mech": "identity",
+}
+
+# Standard deviation of Gumbel(0, 1), the race-day noise under which
+# ranking by utility is exactly Plackett–Luce
+GUMBEL_SD = np.pi / np.sqrt(6)
+
+# All lower-is-better
+METRICS = (
+    "rps",
+    "win_brier",
+    "win_log_loss",
+    "podium_brier",
+    "podium_log_loss",
+)
+
+# -----------------------------
+# CANDIDATES
+# -----------------------------
+def grid_candidates(space: dict) -> list[dict]:
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[n] for n in names))
+    ]
+
+def random_candidates(space: dict, n: int, seed: int = 0) -> list[dict]:
+    """
+    Up to `n` distinct candidates drawn uniformly from the grid.
+    """
+
+    rng = np.random.default_rng(seed)
+    size = int(np.prod([len(v) for v in space.values()]))
+
+    candidates, seen = [], set()
+    for _ in range(min(n, size) * 20):
+        if len(candidates) == min(n, size):
+            break
+        picks = tuple(int(rng.integers(len(v))) for v in space.values())
+        if picks not in seen:
+            seen.add(picks)
+            candidates.append({
+                name: values[i]
+                for (name, values), i in zip(space.items(), picks)
+            })
+
+    return candidates
+
+def split_candidate(candidate: dict) -> tuple[dict, PaceModel]:
+    """
+    {"driver_elo.k_factor": 24, "pace.noise_sigma": 40, ...}
+    → ({"driver_elo": {"k_factor": 24}}, PaceModel(noise_sigma=40))
+    """
+
+    params, pace = {}, {}
+
+    for name, value in candidate.items():
+        target, param = name.split(".", 1)
+        if target == "pace":
+            pace[param] = value
+        elif target in PRODUCERS:
+            params.setdefault(target, {})[param] = value
+        else:
+            raise ValueError(f"Unknown search parameter '{name}'")
+
+    # Fail on unknown producer parameters before any work is done
+    for producer, overrides in params.items():
+        with_params(PRODUCERS[producer], overrides)
+
+    return params, PaceModel(**pace)
+
+# -----------------------------
+# EVALUATION
+# -----------------------------
+@lru_cache(maxsize=1)
+def base_rows() -> tuple[pd.DataFrame, object]:
+    """
+    Raw driver–race rows and the status taxonomy, once per process.
+    """
+
+    # Same rows as build_dataset, so both share cached feature outputs
+    dataset = build_base_dataset(load_table("results"), load_table("races"))
+
+    return dataset, build_status_taxonomy(load_table("status"))
+
+def evaluate(
+    candidate: dict,
+    first_season: int,
+    last_season: int | None,
+    n_simulations: int,
+    random_seed: int,
+) -> dict:
+    """
+    Walk-forward scores of one candidate.
+
+    Features come from the shared feature cache, keyed per producer:
+    a candidate that only changes Elo parameters reruns Elo and
+    loads every other producer's output.
+    """
+
+    params, pace_model = split_candidate(candidate)
+    dataset, taxonomy = base_rows()
+
+    outputs, _ = run_producers(
+        dataset,
+        taxonomy,
+        load_feature_registry(),
+        params=params,
+        cache=feature_cache(),
+    )
+
+    result = run_backtest(
+        attach_outputs(dataset, outputs, params),
+        first_season=first_season,
+        last_season=last_season,
+        n_simulations=n_simulations,
+        random_seed=random_seed,
+        pace_model=pace_model,
+    )
+
+    return {**candidate, **backtest_scores(result)}
+
+def backtest_scores(result) -> dict:
+    """
+    METRICS of one backtest result.
+    """
+
+    scores = {
+        "rps": float(position_rps(result.distributions, result.predictions)["rps"].mean()),
+    }
+    for row in score_predictions(result.predictions).itertuples(index=False):
+        scores[f"{row.event}_brier"] = row.brier
+        scores[f"{row.event}_log_loss"] = row.log_loss
+
+    return scores
+
+def search(
+    candidates: list[dict],
+    first_season: int = 2009,
+    last_season: int | None = None,
+    n_simulations: int = 1000,
+    random_seed: int = 0,
+    metric: str = "rps",
+    n_workers: int = 1,
+) -> pd.DataFrame:
+    """
+    Score every candidate by walk-forward backtest, best first.
+
+    Candidates run in parallel, one per worker process. All of them
+    share `random_seed`, so every candidate sees the same random
+    draws per race and score differences come from the parameters.
+    """
+
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}' (expected one of {METRICS})")
+
+    for candidate in candidates:
+        split_candidate(candidate)
+
+    args = (first_season, last_season, n_simulations, random_seed)
+    rows = []
+
+    def report(row):
+        rows.append(row)
+        print(f"  [{len(rows)}/{len(candidates)}] {metric}={row[metric]:.5f}")
+
+    if n_workers > 1 and len(candidates) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(evaluate, c, *args) for c in candidates]
+            for future in as_completed(futures):
+                report(future.result())
+    else:
+        for candidate in candidates:
+            report(evaluate(candidate, *args))
+
+    return (
+        pd.DataFrame(rows)
+        .sort_values(metric, kind="mergesort")
+        .reset_index(drop=True)
+    )
+
+# -----------------------------
+# PACE MODEL
+# -----------------------------
+def ranked_finishers(
+    dataset: pd.DataFrame,
+    first_season: int | None = None,
+    last_season: int | None = None,
+) -> pd.DataFrame:
+    """
+    Classified finishers of every race in the range, grouped by race
+    in finishing order. DNFs are left out: the simulator retires
+    them separately and ranks the rest by pace.
+    """
+
+    taxonomy = build_status_taxonomy(load_table("status"))
+    rows = dataset[np.isin(taxonomy.category(dataset["status_id"]), (FINISHED, LAPPED))]
+
+    if first_season is not None:
+        rows = rows[rows["season"] >= first_season]
+    if last_season is not None:
+        rows = rows[rows["season"] <= last_season]
+
+    rows = (
+        rows
+        .sort_values(["season", "round", "position_order"], kind="mergesort")
+        .drop_duplicates(["race_id", "driver_id"])
+    )
+
+    # A race needs two finishers to say anything about pace
+    sizes = rows.groupby("race_id", sort=False)["race_id"].transform("size")
+    return rows[sizes >= 2].reset_index(drop=True)
+
+def fit_pace_model(
+    dataset: pd.DataFrame | None = None,
+    features: dict = PACE_FEATURES,
+    first_season: int | None = None,
+    last_season: int | None = None,
+    epochs: int = 60,
+    batch_races: int = 128,
+    noise_sigma: float = 50.0,
+    seed: int = 0,
+) -> tuple[FittedPaceModel, dict]:
+    """
+    Fit Plackett–Luce weights of finishing order on pre-race
+    features and turn them into a simulator pace model.
+
+    Features are standardized for the fit; the saved weights act on
+    raw (transformed) values. Utilities are rescaled so Gumbel(0, 1)
+    noise becomes noise of sd `noise_sigma`, the hand model's pace
+    scale, which the lap engine's seconds-per-point assumes.
+
+    Returns (model, fit statistics).
+    """
+
+    if dataset is None:
+        dataset = load_context_dataset("pre_quali")
+
+    allowed = set(context_features("pre_quali"))
+    leaky = set(features) - allowed
+    if leaky:
+        raise RuntimeError(f"Not pre-race features: {sorted(leaky)}")
+
+    rows = ranked_finishers(dataset, first_season, last_season)
+    if rows.empty:
+        raise RuntimeError("No ranked races in the requested season range")
+
+    names = list(features)
+    X = np.column_stack([
+        TRANSFORMS[features[f]](rows[f].to_numpy(dtype=float))
+        for f in names
+    ])
+    X[~np.isfinite(X)] = np.nan
+
+    mean = np.nanmean(X, axis=0)
+    sd = np.nanstd(X, axis=0)
+    sd[~(sd > 0)] = 1.0
+
+    Xs = np.nan_to_num((X - mean) / sd, nan=0.0)
+    sizes = rows.groupby("race_id", sort=False).size().to_numpy()
+
+    fit = fit_plackett_luce(
+        Xs, sizes, epochs=epochs, batch_races=batch_races, seed=seed
+    )
+
+    scale = noise_sigma / GUMBEL_SD
+    registry = load_feature_registry().set_index("feature_name")
+
+    model = FittedPaceModel(
+        features=tuple(names),
+        weights=tuple(float(w) for w in scale * fit.weights / sd),
+        transforms=tuple(features[f] for f in names),
+        fills=tuple(float(m) for m in mean),
+        entities=tuple(registry.loc[f, "entity"] for f in names),
+        noise_sigma=noise_sigma,
+        last_season=int(rows["season"].max()),
+    )
+
+    stats = {
+        "first_season": int(rows["season"].min()),
+        "last_season": int(rows["season"].max()),
+        "races": len(sizes),
+        "ranked_drivers": int(sizes.sum()),
+        "nll": ranking_nll(Xs, sizes, fit.weights),
+        # Every order equally likely
+        "uniform_nll": float(
+            sum(np.log(np.arange(1, n + 1)).sum() for n in sizes) / sizes.sum()
+        ),
+    }
+
+    return model, stats
+
+# -----------------------------
+# EXECUTION
+# -----------------------------
+def parse_values(text: str) -> tuple[str, list]:
+    """
+    "driver_elo.k_factor=16,24" → ("driver_elo.k_factor", [16, 24])
+    """
+
+    try:
+        name, values = text.split("=", 1)
+        numbers = [float(v) for v in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected name=value[,value...], got '{text}'"
+        )
+
+    return name, [int(v) if v.is_integer() else v for v in numbers]
+
+def run_tune(args):
+    space = {**SEARCH_SPACE, **dict(args.set)}
+
+    if args.search == "grid":
+        candidates = grid_candidates(space)
+    else:
+        candidates = random_candidates(space, args.candidates, args.seed)
+
+    print(f"Evaluating {len(candidates)} candidates")
+
+    scores = search(
+        candidates,
+        first_season=args.first_season,
+        last_season=args.last_season,
+        n_simulations=args.simulations,
+        random_seed=args.seed,
+        metric=args.metric,
+        n_workers=args.workers,
+    )
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    scores.to_csv(args.out, index=False)
+
+    print(f"\nBest by {args.metric}:")
+    print(scores.iloc[0].to_string())
+    print(f"\nSaved {args.out}")
+
+def run_pace(args):
+    model, stats = fit_pace_model(
+        first_season=args.first_season,
+        last_season=args.last_season,
+        epochs=args.epochs,
+        batch_races=args.batch_races,
+        noise_sigma=args.noise_sigma,
+        seed=args.seed,
+    )
+
+    print(
+        f"Fitted {stats['races']} races ({stats['first_season']}–"
+        f"{stats['last_season']}, {stats['ranked_drivers']} finishers)"
+    )
+    print(
+        f"NLL per finisher: {stats['nll']:.4f} "
+        f"(uniform order: {stats['uniform_nll']:.4f})"
+    )
+    for f, w in zip(model.features, model.weights):
+        print(f"  {f:<26} {w:+.4g}")
+
+    save_pace_model(model, args.out, **stats)
+    print(f"Saved {args.out}")
+
+    if args.backtest:
+        # Out of sample: every season after the training cutoff
+        print(f"\nBacktest from {model.last_season + 1}:")
+        scores = pd.DataFrame({
+            name: backtest_scores(run_backtest(
+                first_season=model.last_season + 1,
+                n_simulations=args.simulations,
+                random_seed=args.seed,
+                pace_model=pace_model,
+                n_workers=args.workers,
+            ))
+            for name, pace_model in (("hand", PaceModel()), ("fitted", model))
+        })
+        print(scores.to_string(float_format="{:.4f}".format))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and tune race models.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # -----------------------------
+    # tune: hyperparameter search
+    # -----------------------------
+    tune = commands.add_parser(
+        "tune",
+        help="search model and simulator parameters by walk-forward backtest",
+    )
+    tune.add_argument("--search", choices=("grid", "random"), default="random")
+    tune.add_argument(
+        "--candidates",
+        type=int,
+        default=20,
+        help="number of random-search candidates",
+    )
+    tune.add_argument(
+        "--set",
+        type=parse_values,
+        action="append",
+        default=[],
+        metavar="NAME=V1[,V2...]",
+        help="replace a search dimension, e.g. driver_elo.k_factor=16,24,32; "
+             "a single value fixes it",
+    )
+    tune.add_argument("--metric", choices=METRICS, default="rps")
+    tune.add_argument("--first-season", type=int, default=2009)
+    tune.add_argument("--last-season", type=int, default=None)
+    tune.add_argument("--simulations", type=int, default=1000)
+    tune.add_argument("--seed", type=int, default=0)
+    tune.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="candidates evaluated in parallel",
+    )
+    tune.add_argument("--out", type=Path, default=RESULTS_PATH)
+    tune.set_defaults(run=run_tune)
+
+    # -----------------------------
+    # pace: Plackett–Luce pace model
+    # -----------------------------
+    pace = commands.add_parser(
+        "pace",
+        help="fit the simulator's pace model on finishing orders",
+        description=(
+            "Fit the pace model and save it (default: data/processed/"
+            "pace_model.json, not version controlled). The model records "
+            "its last training season, and run_backtest only accepts it "
+            "from the season after: to backtest from 2009, train with "
+            "--last-season 2008."
+        ),
+    )
+    pace.add_argument("--first-season", type=int, default=None)
+    pace.add_argument(
+        "--last-season",
+        type=int,
+        default=None,
+        help="last training season; backtest later seasons out of sample",
+    )
+    pace.add_argument("--epochs", type=int, default=60)
+    pace.add_argument("--batch-races", type=int, default=128)
+    pace.add_argument("--noise-sigma", type=float, default=50.0)
+    pace.add_argument("--seed", type=int, default=0)
+    pace.add_argument("--out", type=Path, default=PACE_MODEL_PATH)
+    pace.add_argument(
+        "--backtest",
+        action="store_true",
+        help="score the fitted and hand-weighted models on the seasons "
+             "after the training cutoff",
+    )
+    pace.add_argument("--simulations", type=int, default=1000)
+    pace.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    pace.set_defaults(run=run_pace)
+
+    args = parser.parse_args()
+    args.run(args)
@@ -1,48 +1,32 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
-RAW = Path("data/raw")
-PROCESSED = Path("data/processed")
-
-# Load processed dataset
-df = pd.read_csv(PROCESSED / "dataset_pre_quali.csv")
-
-# Load lookup tables
-drivers = pd.read_csv(RAW / "drivers.csv")
-constructors = pd.read_csv(RAW / "constructors.csv")
-circuits = pd.read_csv(RAW / "circuits.csv")
-
-# Build readable names
-drivers["driver_name"] = drivers["forename"] + " " + drivers["surname"]
-
-# Merge names (LEFT joins — never drop rows)
-df = df.merge(
-    drivers[["driverId", "driver_name"]],
-    how="left",
-    left_on="driver_id",
-    right_on="driverId",
-)
-
-df = df.merge(
-    constructors[["constructorId", "name"]],
-    how="left",
-    left_on="constructor_id",
-    right_on="constructorId",
-)
-
-df = df.merge(
-    circuits[["circuitId", "name"]],
-    how="left",
-    left_on="circuit_id",
-    right_on="circuitId",
-    suffixes=("", "_circuit"),
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from data.columnar import load_context_dataset
+from data.store import circuit_names, constructor_names, driver_names
+
+# Load processed dataset (only the columns this view needs)
+df = load_context_dataset(
+    "pre_quali",
+    columns=[
+        "season",
+        "round",
+        "driver_id",
+        "constructor_id",
+        "circuit_id",
+        "driver_elo",
+        "constructor_pace_index",
+        "constructor_reliability",
+        "driver_dnf_rate_mech",
+    ],
 )
 
-# Rename for clarity
-df = df.rename(columns={
-    "name": "constructor_name",
-    "name_circuit": "circuit_name",
-})
+# Attach readable names (id → name lookups, no joins)
+df["driver_name"] = driver_names().take(df["driver_id"])
+df["constructor_name"] = constructor_names().take(df["constructor_id"])
+df["circuit_name"] = circuit_names().take(df["circuit_id"])
 
 # Select a clean view
 view_cols = [
@@ -1,9 +1,7 @@
 import pandas as pd
 
-from data.metadata import (
-    load_driver_lookup,
-    load_constructor_lookup,
-)
+from data.store import constructor_names, driver_names
+from simulation.grid import grid_index
 from simulation.simulator import run_race_simulation
 
 
@@ -15,6 +13,11 @@ def simulate_with_names(
     scenario: dict,
     selected_drivers=None,
     n_simulations: int = 5000,
+    tolerance: float | None = None,
+    max_simulations: int | None = None,
+    random_seed: int | None = None,
+    cache=None,
+    engine: str = "monte_carlo",
 ):
     # -----------------------------
     # Run simulation (IDs only)
@@ -27,28 +30,29 @@ def simulate_with_names(
         scenario=scenario,
         selected_drivers=selected_drivers,
         n_simulations=n_simulations,
+        tolerance=tolerance,
+        max_simulations=max_simulations,
+        random_seed=random_seed,
+        cache=cache,
+        engine=engine,
     )
 
     # -----------------------------
     # Build GRID-LOCKED mapping
     # -----------------------------
-    grid = dataset[
-        (dataset["season"] == season) &
-        (dataset["round"] == round)
-    ][["driver_id", "constructor_id"]].drop_duplicates()
+    grid = grid_index(dataset).arrays(season, round)
+    team_of = dict(zip(grid["driver_id"].tolist(), grid["constructor_id"].tolist()))
 
     # -----------------------------
-    # Load metadata
+    # Attach names (id → name lookups, no joins)
     # -----------------------------
-    drivers = load_driver_lookup()
-    constructors = load_constructor_lookup()
+    driver_ids = result["driver_id"].to_numpy()
+    constructor_ids = [team_of.get(d, -1) for d in driver_ids.tolist()]
 
-    # -----------------------------
-    # Attach names (SAFE JOINS)
-    # -----------------------------
-    result = result.merge(drivers, on="driver_id", how="left")
-    result = result.merge(grid, on="driver_id", how="left")
-    result = result.merge(constructors, on="constructor_id", how="left")
+    result = result.assign(
+        driver_name=driver_names().take(driver_ids),
+        constructor_name=constructor_names().take(constructor_ids),
+    )
 
     # -----------------------------
     # Final presentation
@@ -61,6 +65,11 @@ def simulate_with_names(
         "avg_finish",
         "dnf_prob",
     ]
+    # Early-stopped runs also report their precision and run count
+    cols += [
+        c for c in ("win_prob_ci", "podium_prob_ci", "n_simulations")
+        if c in result.columns
+    ]
 
     return (
         result[cols]
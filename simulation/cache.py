@@ -0,0 +1,28 @@
+import hashlib
+import json
+from dataclasses import asdict
+
+from data.content_cache import ContentCache
+
+
+def simulation_key(dataset_fp: str, circuit, **inputs) -> str:
+    """
+    Cache key for one simulation request: dataset fingerprint,
+    full circuit profile and every request input.
+    """
+
+    payload = {
+        "dataset": dataset_fp,
+        "circuit": asdict(circuit),
+        "inputs": inputs,
+    }
+
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class SimulationCache(ContentCache):
+    """
+    Simulation results keyed by simulation_key(), so rebuilding the
+    dataset or editing a circuit profile makes old entries unreachable.
+    """
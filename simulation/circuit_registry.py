@@ -1,89 +1,180 @@
-import pandas as pd
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from data.store import load_table
 from simulation.circuit_profile import CircuitProfile
 
-RAW = Path("data/raw")
-
-def load_all_circuit_profiles():
-    circuits = pd.read_csv(RAW / "circuits.csv")
-
-    profiles = {}
-
-    # -------------------------
-    # DEFAULT BASELINE (neutral circuit)
-    # -------------------------
-    DEFAULT = dict(
-        overtake_difficulty=1.0,
-        safety_car_rate=0.30,
-        accident_multiplier=1.0,
-        pit_loss_seconds=22.5,
-        power_sensitivity=1.0,
-        aero_sensitivity=1.0,
-        tyre_deg_rate=1.0,
-        quali_weight=0.7,
-    )
+OVERRIDES_PATH = Path(__file__).resolve().parent / "circuit_overrides.csv"
+
+# -------------------------
+# DEFAULT BASELINE (neutral circuit)
+# -------------------------
+DEFAULT = MappingProxyType(dict(
+    overtake_difficulty=1.0,
+    safety_car_rate=0.30,
+    accident_multiplier=1.0,
+    pit_loss_seconds=22.5,
+    power_sensitivity=1.0,
+    aero_sensitivity=1.0,
+    tyre_deg_rate=1.0,
+    quali_weight=0.7,
+))
+
+PROFILE_FIELDS = tuple(
+    f.name for f in fields(CircuitProfile)
+    if f.name not in ("circuit_id", "name")
+)
+
+
+@dataclass(frozen=True)
+class CircuitArrays:
+    """
+    Every circuit profile as a struct of arrays: row i of each field
+    belongs to circuit_ids[i]. Lets a simulation broadcast over many
+    circuits at once.
+    """
+
+    circuit_ids: np.ndarray
+    names: np.ndarray
+    values: MappingProxyType
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[field]
+
+    def rows(self, circuit_ids) -> np.ndarray:
+        """
+        Row index of each circuit id; raises on unknown ids.
+        """
+
+        circuit_ids = np.asarray(circuit_ids)
+        rows = np.searchsorted(self.circuit_ids, circuit_ids)
+        rows = np.minimum(rows, len(self.circuit_ids) - 1)
+
+        unknown = self.circuit_ids[rows] != circuit_ids
+        if unknown.any():
+            raise RuntimeError(f"Circuit {circuit_ids[unknown][0]} not found")
+
+        return rows
+
+    def take(self, field: str, circuit_ids) -> np.ndarray:
+        return self.values[field][self.rows(circuit_ids)]
+
+
+# -----------------------------
+# LOADING
+# -----------------------------
+def load_circuit_overrides(path: Path = OVERRIDES_PATH) -> dict:
+    """
+    circuit_id → {field: value} for every non-blank override cell.
+    """
+
+    overrides = pd.read_csv(path)
+
+    unknown = set(overrides.columns) - {"circuit_id", "circuit", *PROFILE_FIELDS}
+    if unknown:
+        raise RuntimeError(f"Unknown circuit override columns: {sorted(unknown)}")
 
-    for _, row in circuits.iterrows():
-        profiles[row["circuitId"]] = CircuitProfile(
-            circuit_id=row["circuitId"],
-            name=row["name"],
-            **DEFAULT,
+    not_numeric = [
+        c for c in overrides.columns
+        if c in PROFILE_FIELDS and not pd.api.types.is_numeric_dtype(overrides[c])
+    ]
+    if not_numeric:
+        raise RuntimeError(f"Non-numeric circuit override columns: {not_numeric}")
+
+    if overrides["circuit_id"].duplicated().any():
+        raise RuntimeError("Duplicate circuit in circuit overrides")
+
+    return {
+        int(row["circuit_id"]): {
+            k: float(v) for k, v in row.items()
+            if k in PROFILE_FIELDS and pd.notna(v)
+        }
+        for row in overrides.to_dict("records")
+    }
+
+
+def load_all_circuit_profiles(
+    overrides_path: Path = OVERRIDES_PATH,
+) -> dict[int, CircuitProfile]:
+    circuits = load_table("circuits")
+    overrides = load_circuit_overrides(overrides_path)
+
+    missing = set(overrides) - set(circuits["circuitId"].tolist())
+    if missing:
+        raise RuntimeError(f"Overrides for unknown circuits: {sorted(missing)}")
+
+    return {
+        cid: CircuitProfile(
+            circuit_id=cid,
+            name=name,
+            **{**DEFAULT, **overrides.get(cid, {})},
+        )
+        for cid, name in zip(
+            circuits["circuitId"].tolist(),
+            circuits["name"].tolist(),
         )
+    }
 
-    # -------------------------
-    # REALISTIC OVERRIDES
-    # -------------------------
-    def override(cid, **kwargs):
-        for k, v in kwargs.items():
-            setattr(profiles[cid], k, v)
-
-    # Monaco
-    override(
-        6,
-        overtake_difficulty=2.0,
-        safety_car_rate=0.75,
-        accident_multiplier=1.6,
-        pit_loss_seconds=21.0,
-        power_sensitivity=0.6,
-        aero_sensitivity=1.4,
-        tyre_deg_rate=0.8,
-        quali_weight=0.9,
-    )
 
-    # Monza
-    override(
-        14,
-        overtake_difficulty=0.7,
-        power_sensitivity=1.6,
-        aero_sensitivity=0.7,
-        quali_weight=0.6,
-    )
+def compile_circuit_arrays(profiles: dict) -> CircuitArrays:
+    ordered = [profiles[cid] for cid in sorted(profiles)]
 
-    # Singapore
-    override(
-        15,
-        safety_car_rate=0.80,
-        accident_multiplier=1.5,
-        tyre_deg_rate=1.4,
-        pit_loss_seconds=24.0,
-        quali_weight=0.85,
+    return CircuitArrays(
+        circuit_ids=np.array([p.circuit_id for p in ordered], dtype=np.int64),
+        names=np.array([p.name for p in ordered], dtype=object),
+        values=MappingProxyType({
+            f: np.array([getattr(p, f) for p in ordered], dtype=float)
+            for f in PROFILE_FIELDS
+        }),
     )
 
-    # Spa
-    override(
-        13,
-        power_sensitivity=1.3,
-        aero_sensitivity=1.2,
-        safety_car_rate=0.45,
-    )
 
-    return profiles
+# -----------------------------
+# LAZY REGISTRY
+# -----------------------------
+# Built on first access, once per process; read-only afterwards
+_REGISTRY = None
+_LOCK = threading.Lock()
 
 
-# Global registry
-CIRCUIT_PROFILES = load_all_circuit_profiles()
+def _registry():
+    global _REGISTRY
+
+    if _REGISTRY is None:
+        with _LOCK:
+            if _REGISTRY is None:
+                profiles = load_all_circuit_profiles()
+                _REGISTRY = (
+                    MappingProxyType(profiles),
+                    compile_circuit_arrays(profiles),
+                )
+
+    return _REGISTRY
+
+
+def circuit_profiles() -> MappingProxyType:
+    return _registry()[0]
+
+
+def circuit_arrays() -> CircuitArrays:
+    return _registry()[1]
+
 
 def get_circuit_profile(circuit_id: int) -> CircuitProfile:
-    if circuit_id not in CIRCUIT_PROFILES:
+    profiles = circuit_profiles()
+
+    if circuit_id not in profiles:
         raise RuntimeError(f"Circuit {circuit_id} not found")
-    return CIRCUIT_PROFILES[circuit_id]
+    return profiles[circuit_id]
+
+
+def __getattr__(name):
+    # Global registry, kept importable as a module attribute
+    if name == "CIRCUIT_PROFILES":
+        return circuit_profiles()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
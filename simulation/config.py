@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from itertools import product
 from typing import Optional, Dict
 
 
@@ -78,6 +79,73 @@ def validate_config(cfg: RaceConfig):
         raise ValueError("n_simulations too small to be meaningful")
 
 
+# -------------------------------------------------
+# SCENARIO DICTS (what the simulation engine reads)
+# -------------------------------------------------
+
+# scenario knob -> section of the scenario dict
+SCENARIO_FIELDS = {
+    "rain_prob": "weather",
+    "weather_volatility": "weather",
+    "reliability_multiplier": "mechanical",
+    "accident_multiplier": "chaos",
+    "safety_car_multiplier": "chaos",
+    "pit_time_variance": "strategy",
+    "driver_aggression": "strategy",
+}
+
+
+def scenario_from_config(cfg: RaceConfig) -> dict:
+    """
+    Nested scenario dict (same shape the UI builds) from a RaceConfig.
+    """
+
+    validate_config(cfg)
+
+    scenario = {section: {} for section in SCENARIO_FIELDS.values()}
+    for name, section in SCENARIO_FIELDS.items():
+        scenario[section][name] = getattr(cfg, name)
+
+    return scenario
+
+
+def flatten_scenario(scenario: dict) -> dict:
+    """
+    {"mechanical": {"reliability_multiplier": 1.2}, ...}
+    → {"reliability_multiplier": 1.2, ...}
+    """
+
+    return {
+        name: value
+        for section in scenario.values()
+        for name, value in section.items()
+    }
+
+
+def scenario_grid(**axes) -> list[dict]:
+    """
+    Cartesian product of scenario knobs, e.g.
+
+        scenario_grid(rain_prob=[0.0, 0.5], reliability_multiplier=[1, 1.5])
+
+    Knobs not given keep their RaceConfig defaults.
+    """
+
+    unknown = set(axes) - set(SCENARIO_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown scenario knobs: {sorted(unknown)}")
+
+    defaults = RaceConfig(season=0, circuit_id=0)
+    names = list(axes)
+
+    scenarios = []
+    for values in product(*(axes[name] for name in names)):
+        cfg = replace(defaults, **dict(zip(names, values)))
+        scenarios.append(scenario_from_config(cfg))
+
+    return scenarios
+
+
 # -------------------------------------------------
 # PRESET SCENARIOS (for UI buttons)
 # -------------------------------------------------
@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# z-score for the 95% confidence intervals used by early stopping
+CONFIDENCE_Z = 1.96
+
+# Current F1 points for P1..P10 (no fastest-lap bonus)
+POINTS_SYSTEM = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+
+
+def wilson_half_width(successes: np.ndarray, n: int) -> np.ndarray:
+    """
+    Half-width of the Wilson score interval for a binomial proportion.
+    Stays > 0 when p is 0 or 1, unlike the normal approximation.
+    """
+
+    z2 = CONFIDENCE_Z ** 2
+    p = successes / n
+
+    return (
+        CONFIDENCE_Z * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) /
+        (1 + z2 / n)
+    )
+
+
+def points_vector(n_positions: int, points=POINTS_SYSTEM) -> np.ndarray:
+    """
+    Points awarded for positions 1..n_positions (0 beyond the table).
+    """
+
+    out = np.zeros(n_positions, dtype=float)
+    k = min(n_positions, len(points))
+    out[:k] = points[:k]
+    return out
+
+
+def finishing_positions(pace: np.ndarray, dnfs: np.ndarray) -> np.ndarray:
+    """
+    Rank every simulation at once.
+
+    pace: (n_simulations × N) matrix.
+    dnfs: same shape, or with extra leading axes (e.g. one slice per
+    scenario) that all share the same pace ranking.
+
+    Returns an int array shaped like dnfs holding each driver's
+    finishing position (1 = winner), or 0 for a DNF.
+    """
+
+    # Fastest first, one argsort along the driver axis
+    order = np.broadcast_to(np.argsort(-pace, axis=-1), dnfs.shape)
+
+    # Finishers are classified in pace order, DNFs drop out
+    finished = ~np.take_along_axis(dnfs, order, axis=-1)
+    ranked = np.cumsum(finished, axis=-1) * finished
+
+    positions = np.empty_like(ranked)
+    np.put_along_axis(positions, order, ranked, axis=-1)
+
+    return positions
+
+
+def position_histogram(positions: np.ndarray) -> np.ndarray:
+    """
+    Fold an (n × N) block of finishing positions (0 = DNF)
+    into an N × (N + 1) count matrix.
+    """
+
+    n, N = positions.shape
+    flat = np.arange(N) * (N + 1) + positions
+
+    return np.bincount(
+        flat.ravel(),
+        minlength=N * (N + 1),
+    ).reshape(N, N + 1)
+
+
+@dataclass
+class PositionDistribution:
+    """
+    Finishing-position histogram of a Monte Carlo run.
+
+    counts[i, 0] = DNFs of driver i
+    counts[i, k] = times driver i finished in position k (1..N)
+
+    Memory is N × (N + 1) integers regardless of n_simulations.
+    """
+
+    driver_ids: np.ndarray
+    counts: np.ndarray
+    n_simulations: int
+
+    @property
+    def n_drivers(self) -> int:
+        return len(self.driver_ids)
+
+    @property
+    def finishes(self) -> np.ndarray:
+        return self.n_simulations - self.counts[:, 0]
+
+    # -----------------------------
+    # PROBABILITIES
+    # -----------------------------
+    def position_probs(self) -> pd.DataFrame:
+        """
+        P(driver finishes in position k), one row per driver.
+        Columns: dnf, 1..N
+        """
+
+        return pd.DataFrame(
+            self.counts / self.n_simulations,
+            index=pd.Index(self.driver_ids, name="driver_id"),
+            columns=["dnf"] + list(range(1, self.n_drivers + 1)),
+        )
+
+    def finish_quantiles(self, q=(0.25, 0.5, 0.75)) -> pd.DataFrame:
+        """
+        Quantiles of finishing position, conditional on finishing.
+        NaN for drivers that never finished.
+        """
+
+        finished = self.counts[:, 1:]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cdf = np.cumsum(finished, axis=1) / self.finishes[:, None]
+
+        out = {}
+        for level in q:
+            # smallest position whose CDF reaches the level
+            pos = (cdf < level - 1e-12).sum(axis=1) + 1.0
+            pos[self.finishes == 0] = np.nan
+            out[f"finish_q{round(level * 100):02d}"] = pos
+
+        return pd.DataFrame(
+            out,
+            index=pd.Index(self.driver_ids, name="driver_id"),
+        )
+
+    def expected_points(self, points=POINTS_SYSTEM) -> np.ndarray:
+        pts = points_vector(self.n_drivers, points)
+        return self.counts[:, 1:] @ pts / self.n_simulations
+
+    # -----------------------------
+    # SUMMARY TABLE
+    # -----------------------------
+    def summary(self, with_precision: bool = False) -> pd.DataFrame:
+        """
+        Classic per-driver summary (win / podium / DNF / avg finish).
+        with_precision adds 95% interval half-widths and the
+        number of simulations used.
+        """
+
+        n = self.n_simulations
+        wins = self.counts[:, 1]
+        podiums = self.counts[:, 1:4].sum(axis=1)
+        finishes = self.finishes
+
+        positions = np.arange(1, self.n_drivers + 1)
+        position_sum = self.counts[:, 1:] @ positions
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_finish = np.where(finishes > 0, position_sum / finishes, np.nan)
+
+        summary = pd.DataFrame({
+            "driver_id": self.driver_ids,
+            "win_prob": wins / n,
+            "podium_prob": podiums / n,
+            "dnf_prob": self.counts[:, 0] / n,
+            "avg_finish": avg_finish,
+        })
+
+        if with_precision:
+            summary["win_prob_ci"] = wilson_half_width(wins, n)
+            summary["podium_prob_ci"] = wilson_half_width(podiums, n)
+            summary["n_simulations"] = n
+
+        return summary.sort_values("win_prob", ascending=False)
+
+    def detailed_summary(self, q=(0.25, 0.5, 0.75)) -> pd.DataFrame:
+        """
+        Summary plus median / quantiles of finishing position
+        and expected points.
+        """
+
+        summary = self.summary()
+        extra = self.finish_quantiles(q)
+        extra["expected_points"] = self.expected_points()
+
+        return summary.merge(
+            extra.reset_index(),
+            on="driver_id",
+            how="left",
+        )
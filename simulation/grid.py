@@ -1,22 +1,120 @@
+import weakref
+
+import numpy as np
 import pandas as pd
 
+from data.feature_store import FeatureStore
+
+# Columns the simulation engines read from a grid
+GRID_ARRAY_COLUMNS = (
+    "driver_id",
+    "constructor_id",
+    "driver_elo",
+    "constructor_pace_index",
+    "constructor_reliability",
+)
+
+
+class GridIndex:
+    """
+    (season, round) → row positions of a processed dataset.
+
+    Built once per dataset; every grid lookup afterwards is a dict
+    hit plus a positional take instead of a boolean scan of the
+    whole table. The dataset is treated as read-only once indexed.
+    """
+
+    def __init__(self, dataset: pd.DataFrame):
+        self.dataset = dataset
+
+        self._rows = {
+            (int(season), int(round)): positions
+            for (season, round), positions in dataset.groupby(
+                ["season", "round"], sort=False
+            ).indices.items()
+        }
+
+        self._season_drivers = {
+            int(season): sorted(drivers.unique().tolist())
+            for season, drivers in dataset.groupby("season")["driver_id"]
+        }
+
+        self._season_rounds = {}
+        for season, round in sorted(self._rows):
+            self._season_rounds.setdefault(season, []).append(round)
+
+        self._arrays = {
+            col: dataset[col].to_numpy()
+            for col in GRID_ARRAY_COLUMNS
+            if col in dataset.columns
+        }
+
+    def positions(self, season: int, round: int) -> np.ndarray:
+        return self._rows.get((int(season), int(round)), np.empty(0, dtype=np.int64))
+
+    def rows(self, season: int, round: int) -> pd.DataFrame:
+        return self.dataset.iloc[self.positions(season, round)]
+
+    def arrays(self, season: int, round: int) -> dict:
+        """
+        Compact per-driver arrays for one grid
+        (driver id, constructor id, Elo, pace, reliability).
+        """
+
+        idx = self.positions(season, round)
+        return {col: values[idx] for col, values in self._arrays.items()}
+
+    def rounds(self, season: int) -> list[int]:
+        return list(self._season_rounds.get(int(season), []))
+
+    def active_drivers(self, season: int) -> list[int]:
+        return list(self._season_drivers.get(int(season), []))
+
+
+# id(dataset) → (weakref to dataset, GridIndex)
+_INDEXES = {}
+
+
+def grid_index(dataset: pd.DataFrame) -> GridIndex:
+    """
+    Shared GridIndex for a dataset, built on first use and
+    dropped when the dataset is garbage collected.
+    """
+
+    key = id(dataset)
+    entry = _INDEXES.get(key)
+
+    if entry is not None and entry[0]() is dataset:
+        return entry[1]
+
+    index = GridIndex(dataset)
+    ref = weakref.ref(dataset, lambda _, key=key: _INDEXES.pop(key, None))
+    _INDEXES[key] = (ref, index)
+
+    return index
+
+
 def list_all_drivers(dataset: pd.DataFrame):
     return sorted(dataset["driver_id"].unique().tolist())
 
 def list_active_drivers(dataset: pd.DataFrame, season: int):
-    df = dataset[dataset["season"] == season]
-    return sorted(df["driver_id"].unique().tolist())
+    return grid_index(dataset).active_drivers(season)
 
 def build_starting_grid(
-    dataset: pd.DataFrame,
+    dataset: pd.DataFrame | FeatureStore,
     season: int,
     round: int,
     selected_drivers: list[int] | None = None,
 ):
-    race_df = dataset[
-        (dataset["season"] == season) &
-        (dataset["round"] == round)
-    ].copy()
+    """
+    A race's grid rows, from a processed dataset or — without reading
+    the full table — from the point-in-time feature store.
+    """
+
+    if isinstance(dataset, FeatureStore):
+        race_df = dataset.grid_for(season, round)
+    else:
+        race_df = grid_index(dataset).rows(season, round)
 
     if selected_drivers is not None:
         race_df = race_df[race_df["driver_id"].isin(selected_drivers)]
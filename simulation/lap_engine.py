@@ -0,0 +1,286 @@
+import numpy as np
+import pandas as pd
+
+from simulation.distribution import finishing_positions
+from simulation.pace import DEFAULT_PACE_MODEL, PaceModel
+
+# -------------------------------------------------
+# ENGINE CONSTANTS
+# -------------------------------------------------
+DEFAULT_LAPS = 57
+
+# Lap-time scale: 100 pace points ≈ 0.5 s per lap
+SECONDS_PER_PACE_POINT = 0.005
+
+LAP_NOISE_SECONDS = 0.30
+START_GAP_SECONDS = 0.25      # per grid slot, scaled by quali_weight
+DIRTY_AIR_GAP = 0.20          # gap held behind a car you failed to pass
+PASS_MARGIN_SECONDS = 0.50    # per unit of overtake_difficulty
+
+TYRE_DEG_PER_LAP = 0.05       # s per lap of tyre age at tyre_deg_rate 1
+STINT_FRACTION = 0.45         # nominal stint length as share of race
+STINT_SPREAD_LAPS = 4.0
+
+ACCIDENTS_PER_RACE = 0.04     # per driver, neutral circuit, dry
+ACCIDENT_SC_PROB = 0.6        # accidents that bring out the safety car
+SAFETY_CAR_LAPS = 4
+SC_GAP_SHRINK = 0.5           # gaps to the leader halve each SC lap
+SC_PIT_DISCOUNT = 0.5
+
+WET_NOISE_FACTOR = 2.0
+WET_ACCIDENT_FACTOR = 1.5
+
+
+def _per_lap(p_race, n_laps: int):
+    """
+    Per-lap hazard that compounds to p_race over the race distance.
+    """
+
+    p_race = np.clip(p_race, 0.0, 1.0)
+    return 1.0 - (1.0 - p_race) ** (1.0 / n_laps)
+
+
+def lap_engine_inputs(
+    grid_df: pd.DataFrame,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+) -> tuple:
+    """
+    Split the pace formula into driver skill and car pace.
+    Unknown car pace (no history yet) counts as the slowest car.
+    """
+
+    skill = pace_model.skill(grid_df)
+
+    car = pace_model.car(grid_df)
+    if np.isnan(car).all():
+        car = np.zeros_like(car)
+    else:
+        car = np.where(np.isnan(car), np.nanmin(car), car)
+
+    return skill, car
+
+
+def resolve_overtakes(
+    sorted_time: np.ndarray,
+    uniforms: np.ndarray,
+    overtake_difficulty: float,
+) -> np.ndarray:
+    """
+    Settle one lap of overtaking.
+
+    sorted_time: (n × N) race times after the lap, columns in running
+    order before the lap; inf = retired. uniforms: one draw per car.
+
+    Cars are resolved front to back, so each one races the car
+    directly ahead of it on the road as already settled. A car that
+    is faster attempts a pass, succeeding with probability
+    margin / (margin + PASS_MARGIN_SECONDS · overtake_difficulty):
+    a failed pass leaves it DIRTY_AIR_GAP behind that car, and a
+    successful one gains that single place, never two. The loop runs
+    over the N grid positions; every step is vectorized over the n
+    simulations.
+    """
+
+    n, N = sorted_time.shape
+    resolved = np.empty_like(sorted_time)
+
+    # Slowest and second-slowest settled times ahead, i.e. the car
+    # directly in front on the road and the one in front of that
+    first = np.full(n, -np.inf)
+    second = np.full(n, -np.inf)
+
+    for k in range(N):
+        t = sorted_time[:, k]
+        running = np.isfinite(t)
+
+        attempt = running & np.isfinite(first) & (t < first)
+
+        with np.errstate(invalid="ignore"):
+            margin = first - t
+            pass_prob = margin / (
+                margin + PASS_MARGIN_SECONDS * overtake_difficulty
+            )
+
+        blocked = attempt & (uniforms[:, k] >= pass_prob)
+        passed = attempt & ~blocked
+
+        t = np.where(blocked, first + DIRTY_AIR_GAP, t)
+        t = np.where(passed, np.maximum(t, second + DIRTY_AIR_GAP), t)
+        resolved[:, k] = t
+
+        on_road = np.where(running, t, -np.inf)
+        second = np.where(on_road > first, first, np.maximum(second, on_road))
+        first = np.maximum(first, on_road)
+
+    return resolved
+
+
+def scenario_knobs(scenario: dict) -> tuple:
+    weather = scenario.get("weather", {})
+    chaos = scenario.get("chaos", {})
+    strategy = scenario.get("strategy", {})
+
+    return (
+        weather.get("rain_prob", 0.0),
+        weather.get("weather_volatility", 0.0),
+        chaos.get("accident_multiplier", 1.0),
+        chaos.get("safety_car_multiplier", 1.0),
+        strategy.get("pit_time_variance", 1.0),
+        strategy.get("driver_aggression", 0.5),
+    )
+
+
+def simulate_lap_chunk(
+    skill: np.ndarray,
+    car: np.ndarray,
+    dnf_prob: np.ndarray,
+    circuit,
+    knobs: tuple,
+    n_laps: int,
+    noise_sigma: float,
+    n: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Lap-resolved race for one (n × N) block of simulations.
+
+    State is held as (simulations × drivers) arrays — race time,
+    tyre age, stint target, retirement — plus a per-simulation
+    safety-car counter, and all simulations advance one lap at a
+    time with vectorized updates.
+
+    Returns finishing positions (0 = DNF), like the one-shot kernel.
+    """
+
+    (
+        rain_prob,
+        volatility,
+        accident_mult,
+        sc_mult,
+        pit_variance,
+        aggression,
+    ) = knobs
+
+    N = len(skill)
+    rows = np.arange(n)[:, None]
+
+    # -----------------------------
+    # RACE-DAY FORM + GRID
+    # -----------------------------
+    car_factor = (circuit.power_sensitivity + circuit.aero_sensitivity) / 2
+    form = skill + car * car_factor + rng.normal(0, noise_sigma, (n, N))
+
+    # Faster (higher pace) → shorter laps, relative to the field
+    lap_delta = -(form - form.mean(axis=1, keepdims=True)) * SECONDS_PER_PACE_POINT
+
+    grid_slot = np.argsort(np.argsort(-form, axis=1), axis=1)
+    race_time = grid_slot * START_GAP_SECONDS * circuit.quali_weight
+
+    # -----------------------------
+    # WEATHER
+    # -----------------------------
+    wet = rng.random((n, 1)) < rain_prob
+    noise_scale = LAP_NOISE_SECONDS * (1 + volatility) * np.where(
+        wet, WET_NOISE_FACTOR, 1.0
+    )
+
+    # -----------------------------
+    # HAZARDS
+    # -----------------------------
+    mech_hazard = _per_lap(dnf_prob, n_laps)
+
+    accident_race = (
+        ACCIDENTS_PER_RACE *
+        circuit.accident_multiplier *
+        accident_mult *
+        (0.5 + aggression) *
+        np.where(wet, WET_ACCIDENT_FACTOR, 1.0)
+    )
+    accident_hazard = _per_lap(accident_race, n_laps)           # (n, 1)
+
+    sc_hazard = _per_lap(circuit.safety_car_rate * sc_mult, n_laps)
+
+    # -----------------------------
+    # TYRES / STRATEGY
+    # -----------------------------
+    deg = TYRE_DEG_PER_LAP * circuit.tyre_deg_rate
+    nominal_stint = n_laps * STINT_FRACTION / circuit.tyre_deg_rate
+    stint_target = np.maximum(
+        rng.normal(nominal_stint, STINT_SPREAD_LAPS, (n, N)), 5.0
+    )
+    tyre_age = np.zeros((n, N))
+
+    retired = np.zeros((n, N), dtype=bool)
+    sc_laps_left = np.zeros((n, 1), dtype=np.int64)
+
+    # -----------------------------
+    # LAP LOOP (vectorized over sims × drivers)
+    # -----------------------------
+    for _ in range(n_laps):
+        running = ~retired
+        under_sc = sc_laps_left > 0
+
+        # Retirements this lap
+        mech = rng.random((n, N)) < mech_hazard
+        crash = rng.random((n, N)) < accident_hazard
+        out = running & (mech | crash)
+
+        sc_trigger = (
+            (out & crash & (rng.random((n, N)) < ACCIDENT_SC_PROB)).any(axis=1, keepdims=True) |
+            (rng.random((n, 1)) < sc_hazard)
+        )
+
+        # Lap time
+        lap = (
+            lap_delta +
+            tyre_age * deg +
+            rng.normal(0, 1, (n, N)) * noise_scale
+        )
+        lap = np.where(under_sc, 0.0, lap)
+
+        # Pit stops
+        pitting = running & (tyre_age >= stint_target)
+        pit_cost = circuit.pit_loss_seconds * np.where(under_sc, SC_PIT_DISCOUNT, 1.0)
+        pit_cost = pit_cost + rng.normal(0, 1.0, (n, N)) * pit_variance
+        lap = lap + np.where(pitting, pit_cost, 0.0)
+
+        tyre_age = np.where(pitting, 0.0, tyre_age + 1)
+
+        # Order before this lap (retired cars are already at the back)
+        order = np.argsort(np.where(retired, np.inf, race_time), axis=1)
+
+        new_time = race_time + lap
+        retired |= out
+        new_time = np.where(retired, np.inf, new_time)
+
+        # -----------------------------
+        # OVERTAKING
+        # -----------------------------
+        new_time[rows, order] = resolve_overtakes(
+            new_time[rows, order],
+            rng.random((n, N)),
+            circuit.overtake_difficulty,
+        )
+
+        # -----------------------------
+        # SAFETY CAR
+        # -----------------------------
+        leader = np.min(new_time, axis=1, keepdims=True)
+        compress = under_sc & np.isfinite(leader) & ~retired
+
+        with np.errstate(invalid="ignore"):
+            new_time = np.where(
+                compress,
+                leader + (new_time - leader) * SC_GAP_SHRINK,
+                new_time,
+            )
+
+        sc_laps_left = np.where(
+            under_sc,
+            sc_laps_left - 1,
+            np.where(sc_trigger, SAFETY_CAR_LAPS, 0),
+        )
+
+        race_time = new_time
+
+    return finishing_positions(-race_time, retired)
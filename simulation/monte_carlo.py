@@ -1,63 +1,296 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 
-def simulate_race(
+from simulation.distribution import (
+    PositionDistribution,
+    finishing_positions,
+    position_histogram,
+    wilson_half_width,
+)
+from simulation.lap_engine import (
+    DEFAULT_LAPS,
+    lap_engine_inputs,
+    scenario_knobs,
+    simulate_lap_chunk,
+)
+from simulation.pace import DEFAULT_PACE_MODEL, PaceModel, as_pace_model
+
+
+def base_pace(
+    grid_df: pd.DataFrame,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+) -> np.ndarray:
+    """
+    Deterministic pace per driver, before noise and circuit weighting.
+    """
+
+    return pace_model.pace(grid_df)
+
+
+def dnf_probability(grid_df: pd.DataFrame, scenario: dict) -> np.ndarray:
+    """
+    Per-driver DNF probability under a scenario.
+    """
+
+    return (
+        (1 - grid_df["constructor_reliability"].to_numpy(dtype=float)) *
+        scenario["mechanical"]["reliability_multiplier"]
+    )
+
+
+def _simulate_chunk(
+    driver_pace: np.ndarray,
+    dnf_prob: np.ndarray,
+    quali_weight: float,
+    noise_sigma: float,
+    n: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw and rank one (n × N) block of races.
+    """
+
+    N = len(driver_pace)
+
+    pace = driver_pace + rng.normal(0, noise_sigma, (n, N))
+    pace *= quali_weight
+
+    dnfs = rng.random((n, N)) < dnf_prob
+
+    return finishing_positions(pace, dnfs)
+
+
+def chunk_rng(entropy: int, chunk: int) -> np.random.Generator:
+    """
+    Independent random stream for chunk `chunk` of a run.
+
+    Streams depend only on the run entropy and the chunk index,
+    never on which worker executes the chunk.
+    """
+
+    return np.random.default_rng(
+        np.random.SeedSequence(entropy, spawn_key=(chunk,))
+    )
+
+
+def _run_chunk(args) -> np.ndarray:
+    # Top-level so it can be pickled into a process pool
+    kernel, inputs, n, entropy, chunk = args
+
+    positions = kernel(*inputs, n, chunk_rng(entropy, chunk))
+
+    return position_histogram(positions)
+
+
+ENGINES = ("monte_carlo", "lap")
+
+
+def engine_kernel(
+    engine: str,
     grid_df: pd.DataFrame,
     circuit,
     scenario: dict,
-    n_simulations: int = 5000,
+    n_laps: int,
+    pace_model: PaceModel,
 ):
-    drivers = grid_df.copy()
-    N = len(drivers)
-
-    results = {
-        d: {"wins": 0, "podiums": 0, "dnf": 0, "positions": []}
-        for d in drivers["driver_id"]
-    }
-
-    for _ in range(n_simulations):
-        pace = (
-            drivers["driver_elo"] * 0.45 +
-            (1 / drivers["constructor_pace_index"]) * 600 +
-            np.random.normal(0, 50, N)
-        )
+    """
+    Chunk kernel + its per-race inputs for the selected engine.
+    Every kernel is called as kernel(*inputs, n, rng) and returns
+    (n × N) finishing positions.
+    """
 
-        pace *= circuit.quali_weight
+    dnf_prob = dnf_probability(grid_df, scenario)
 
-        # DNFs
-        dnf_prob = (
-            (1 - drivers["constructor_reliability"]) *
-            scenario["mechanical"]["reliability_multiplier"]
+    if engine == "monte_carlo":
+        return _simulate_chunk, (
+            base_pace(grid_df, pace_model),
+            dnf_prob,
+            circuit.quali_weight,
+            pace_model.noise_sigma,
         )
 
-        dnfs = np.random.rand(N) < dnf_prob
-        order = np.argsort(-pace)
+    if engine == "lap":
+        skill, car = lap_engine_inputs(grid_df, pace_model)
+        return simulate_lap_chunk, (
+            skill,
+            car,
+            dnf_prob,
+            circuit,
+            scenario_knobs(scenario),
+            n_laps,
+            pace_model.noise_sigma,
+        )
+
+    raise ValueError(f"Unknown engine '{engine}' (expected one of {ENGINES})")
+
+
+def chunk_plan(budget: int, chunk_size: int) -> list[int]:
+    if budget < 1:
+        raise ValueError("n_simulations must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    full, rest = divmod(budget, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def simulate_position_distribution(
+    grid_df: pd.DataFrame,
+    circuit,
+    scenario: dict,
+    n_simulations: int = 5000,
+    tolerance: float | None = None,
+    max_simulations: int | None = None,
+    chunk_size: int = 1000,
+    random_seed: int | None = None,
+    n_workers: int = 1,
+    engine: str = "monte_carlo",
+    n_laps: int = DEFAULT_LAPS,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+) -> PositionDistribution:
+    """
+    Vectorized Monte Carlo race simulation.
+
+    Races are drawn and ranked in (chunk_size × N) blocks and folded
+    into an N × (N + 1) finishing-position histogram, so memory does
+    not grow with n_simulations.
+
+    Each block gets its own random stream derived from `random_seed`,
+    so blocks can be spread over `n_workers` processes and the same
+    seed gives the same answer for any worker count.
+
+    Fixed mode (tolerance=None): runs exactly n_simulations.
+
+    Convergence mode: keeps adding blocks until the 95% interval
+    half-width of every driver's win_prob and podium_prob is below
+    `tolerance`, or `max_simulations` (default n_simulations) is hit.
+
+    engine="lap" swaps the one-shot pace draw for the lap-by-lap
+    engine (see lap_engine.simulate_lap_chunk), which uses the full
+    circuit profile and scenario.
+
+    pace_model: weights turning features into pace — a PaceModel,
+    a trained FittedPaceModel or the path of a saved one (see
+    simulation.pace).
+    """
+
+    if n_simulations < 1:
+        raise ValueError("n_simulations must be >= 1")
+    if max_simulations is not None and max_simulations < 1:
+        raise ValueError("max_simulations must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    if tolerance is not None and tolerance <= 0:
+        raise ValueError("tolerance must be > 0")
+    if n_workers < 1:
+        raise ValueError("n_workers must be >= 1")
+
+    driver_ids = grid_df["driver_id"].to_numpy()
+    N = len(driver_ids)
+
+    kernel, inputs = engine_kernel(
+        engine, grid_df, circuit, scenario, n_laps, as_pace_model(pace_model)
+    )
+
+    if tolerance is None or max_simulations is None:
+        budget = n_simulations
+    else:
+        budget = max_simulations
+
+    entropy = np.random.SeedSequence(random_seed).entropy
+
+    tasks = [
+        (kernel, inputs, n, entropy, chunk)
+        for chunk, n in enumerate(chunk_plan(budget, chunk_size))
+    ]
+
+    # -----------------------------
+    # ACCUMULATE IN CHUNKS
+    # -----------------------------
+    counts = np.zeros((N, N + 1), dtype=np.int64)
+    done = 0
+    converged = False
+
+    # Fixed runs submit every chunk at once. Convergence runs go in
+    # waves of one chunk per worker, folded in chunk order, so early
+    # stopping never depends on the worker count.
+    wave_size = len(tasks) if tolerance is None else n_workers
 
-        finishing_order = []
-        for i in order:
-            if dnfs.iloc[i]:
-                results[drivers.iloc[i]["driver_id"]]["dnf"] += 1
+    pool = ProcessPoolExecutor(n_workers) if n_workers > 1 else None
+
+    try:
+        for start in range(0, len(tasks), wave_size):
+            wave = tasks[start:start + wave_size]
+
+            if pool is None:
+                wave_counts = map(_run_chunk, wave)
             else:
-                finishing_order.append(i)
-
-        for pos, idx in enumerate(finishing_order):
-            did = drivers.iloc[idx]["driver_id"]
-            results[did]["positions"].append(pos + 1)
-            if pos == 0:
-                results[did]["wins"] += 1
-            if pos < 3:
-                results[did]["podiums"] += 1
-
-    summary = []
-    for did, r in results.items():
-        summary.append({
-            "driver_id": did,
-            "win_prob": r["wins"] / n_simulations,
-            "podium_prob": r["podiums"] / n_simulations,
-            "dnf_prob": r["dnf"] / n_simulations,
-            "avg_finish": (
-                np.mean(r["positions"]) if r["positions"] else None
-            )
-        })
-
-    return pd.DataFrame(summary).sort_values("win_prob", ascending=False)
+                wave_counts = pool.map(_run_chunk, wave)
+
+            for task, chunk_counts in zip(wave, wave_counts):
+                counts += chunk_counts
+                done += task[2]
+
+                if tolerance is not None:
+                    win_ci = wilson_half_width(counts[:, 1], done)
+                    podium_ci = wilson_half_width(
+                        counts[:, 1:4].sum(axis=1), done
+                    )
+
+                    if max(win_ci.max(), podium_ci.max()) < tolerance:
+                        converged = True
+                        break
+
+            if converged:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return PositionDistribution(
+        driver_ids=driver_ids,
+        counts=counts,
+        n_simulations=done,
+    )
+
+
+def simulate_race(
+    grid_df: pd.DataFrame,
+    circuit,
+    scenario: dict,
+    n_simulations: int = 5000,
+    tolerance: float | None = None,
+    max_simulations: int | None = None,
+    chunk_size: int = 1000,
+    random_seed: int | None = None,
+    n_workers: int = 1,
+    engine: str = "monte_carlo",
+    n_laps: int = DEFAULT_LAPS,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+):
+    """
+    Per-driver race summary (see simulate_position_distribution).
+
+    In convergence mode the summary also reports the achieved
+    precision (win_prob_ci, podium_prob_ci) and the number of
+    simulations used.
+    """
+
+    distribution = simulate_position_distribution(
+        grid_df=grid_df,
+        circuit=circuit,
+        scenario=scenario,
+        n_simulations=n_simulations,
+        tolerance=tolerance,
+        max_simulations=max_simulations,
+        chunk_size=chunk_size,
+        random_seed=random_seed,
+        n_workers=n_workers,
+        engine=engine,
+        n_laps=n_laps,
+        pace_model=pace_model,
+    )
+
+    return distribution.summary(with_precision=tolerance is not None)
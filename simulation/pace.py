@@ -0,0 +1,192 @@
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Generated, never committed: train it with
+#   scripts/train_models.py pace --last-season <season before the backtest>
+PACE_MODEL_PATH = Path("data/processed/pace_model.json")
+
+# Feature transforms a fitted model may apply before weighting
+TRANSFORMS = {
+    "identity": lambda x: x,
+    "inverse": lambda x: 1 / x,
+}
+
+# Entities whose terms go into driver skill / car pace
+SKILL_ENTITY = "driver"
+CAR_ENTITY = "constructor"
+
+
+@dataclass(frozen=True)
+class PaceModel:
+    """
+    Race pace from pre-race features:
+
+        pace = driver_elo · elo_weight
+             + (1 / constructor_pace_index) · pace_weight
+             + N(0, noise_sigma)   (race-day form, drawn per simulation)
+    """
+
+    elo_weight: float = 0.45
+    pace_weight: float = 600.0
+    noise_sigma: float = 50.0
+
+    def skill(self, grid_df: pd.DataFrame) -> np.ndarray:
+        return grid_df["driver_elo"].to_numpy(dtype=float) * self.elo_weight
+
+    def car(self, grid_df: pd.DataFrame) -> np.ndarray:
+        return (
+            (1 / grid_df["constructor_pace_index"].to_numpy(dtype=float)) *
+            self.pace_weight
+        )
+
+    def pace(self, grid_df: pd.DataFrame) -> np.ndarray:
+        """
+        Deterministic pace per driver, before noise and circuit weighting.
+        """
+
+        return self.skill(grid_df) + self.car(grid_df)
+
+
+@dataclass(frozen=True)
+class FittedPaceModel:
+    """
+    Linear pace over any pre-race features, with trained weights
+    (see scripts/train_models.py pace):
+
+        pace = Σ_f weight_f · transform_f(feature_f) + N(0, noise_sigma)
+
+    A missing feature value counts as `fill_f`, its training mean.
+    Driver-entity terms make up skill and constructor-entity terms
+    make up car pace, as the lap engine expects.
+
+    last_season is the training cutoff (None: unknown); backtests
+    only accept the model on later seasons.
+    """
+
+    features: tuple[str, ...]
+    weights: tuple[float, ...]
+    transforms: tuple[str, ...]
+    fills: tuple[float, ...]
+    entities: tuple[str, ...]
+    noise_sigma: float = 50.0
+    last_season: int | None = None
+
+    def __post_init__(self):
+        n = len(self.features)
+        if any(
+            len(v) != n
+            for v in (self.weights, self.transforms, self.fills, self.entities)
+        ):
+            raise ValueError("Pace model fields must have one entry per feature")
+
+        unknown = set(self.transforms) - set(TRANSFORMS)
+        if unknown:
+            raise ValueError(f"Unknown pace feature transforms: {sorted(unknown)}")
+
+        unknown = set(self.entities) - {SKILL_ENTITY, CAR_ENTITY}
+        if unknown:
+            raise ValueError(
+                f"Pace features must be driver or constructor, got {sorted(unknown)}"
+            )
+
+    def _terms(self, grid_df: pd.DataFrame, entity: str) -> np.ndarray:
+        total = np.zeros(len(grid_df))
+
+        for f, w, t, fill, e in zip(
+            self.features, self.weights, self.transforms, self.fills, self.entities
+        ):
+            if e != entity:
+                continue
+            x = TRANSFORMS[t](grid_df[f].to_numpy(dtype=float))
+            total += w * np.where(np.isfinite(x), x, fill)
+
+        return total
+
+    def skill(self, grid_df: pd.DataFrame) -> np.ndarray:
+        return self._terms(grid_df, SKILL_ENTITY)
+
+    def car(self, grid_df: pd.DataFrame) -> np.ndarray:
+        return self._terms(grid_df, CAR_ENTITY)
+
+    def pace(self, grid_df: pd.DataFrame) -> np.ndarray:
+        return self.skill(grid_df) + self.car(grid_df)
+
+
+DEFAULT_PACE_MODEL = PaceModel()
+
+
+# -----------------------------
+# SAVE / LOAD
+# -----------------------------
+def save_pace_model(model: FittedPaceModel, path: Path = PACE_MODEL_PATH, **meta):
+    """
+    Write a fitted model as JSON; `meta` (training range, fit
+    statistics) is stored alongside and ignored on load.
+    """
+
+    payload = {
+        "features": [
+            {
+                "name": f,
+                "weight": w,
+                "transform": t,
+                "fill": fill,
+                "entity": e,
+            }
+            for f, w, t, fill, e in zip(
+                model.features, model.weights, model.transforms,
+                model.fills, model.entities,
+            )
+        ],
+        "noise_sigma": model.noise_sigma,
+        "last_season": model.last_season,
+        "meta": meta,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_pace_model(path: Path = PACE_MODEL_PATH) -> FittedPaceModel:
+    path = Path(path)
+    if not path.exists():
+        raise RuntimeError(
+            f"No pace model at {path}. Run scripts/train_models.py pace first."
+        )
+
+    with open(path) as f:
+        payload = json.load(f)
+
+    terms = payload["features"]
+
+    return FittedPaceModel(
+        features=tuple(t["name"] for t in terms),
+        weights=tuple(float(t["weight"]) for t in terms),
+        transforms=tuple(t["transform"] for t in terms),
+        fills=tuple(float(t["fill"]) for t in terms),
+        entities=tuple(t["entity"] for t in terms),
+        noise_sigma=float(payload["noise_sigma"]),
+        last_season=payload.get("last_season"),
+    )
+
+
+def as_pace_model(model) -> PaceModel | FittedPaceModel:
+    """
+    A pace model, or the path of a saved one.
+    """
+
+    if isinstance(model, (str, Path)):
+        return load_pace_model(model)
+    return model
+
+
+def pace_model_config(model) -> dict:
+    # JSON-able identity of a model, for cache keys and checkpoints
+    model = as_pace_model(model)
+    return {"type": type(model).__name__, **asdict(model)}
@@ -0,0 +1,305 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from features.registry import load_feature_registry
+from simulation.distribution import (
+    POINTS_SYSTEM,
+    finishing_positions,
+    points_vector,
+)
+from simulation.monte_carlo import (
+    base_pace,
+    chunk_plan,
+    chunk_rng,
+    dnf_probability,
+)
+from simulation.pace import DEFAULT_PACE_MODEL, PaceModel, as_pace_model
+
+# Season-long form, drawn once per simulated season and shared by all
+# its rounds: sd as a fraction of the pace model's race-day noise_sigma
+DRIVER_FORM = 0.3
+TEAM_FORM = 0.4
+
+
+@dataclass
+class SeasonSimulation:
+    """
+    Championship outcome of a simulated season.
+
+    drivers / constructors: one row per entrant with title probability,
+    expected points and points quantiles.
+    driver_points / constructor_points: points histograms,
+    [entrant, p] = number of simulations ending on p points.
+    """
+
+    drivers: pd.DataFrame
+    constructors: pd.DataFrame
+    driver_points: np.ndarray
+    constructor_points: np.ndarray
+    n_simulations: int
+
+
+def _points_quantiles(hist: np.ndarray, q) -> dict:
+    cdf = np.cumsum(hist, axis=1) / hist.sum(axis=1, keepdims=True)
+
+    return {
+        f"points_q{round(level * 100):02d}": (cdf < level - 1e-12).sum(axis=1)
+        for level in q
+    }
+
+
+def _standings(ids, id_name, title, hist, base_points, n, q) -> pd.DataFrame:
+    points = np.arange(hist.shape[1])
+
+    df = pd.DataFrame({
+        id_name: ids,
+        "title_prob": title / n,
+        "current_points": base_points,
+        "expected_points": hist @ points / n,
+        **_points_quantiles(hist, q),
+    })
+
+    return df.sort_values(
+        ["title_prob", "expected_points"],
+        ascending=False,
+    ).reset_index(drop=True)
+
+
+def _title_share(points: np.ndarray) -> np.ndarray:
+    # Ties for the lead split the title fractionally
+    leaders = points == points.max(axis=1, keepdims=True)
+    return (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+
+
+def _histogram(points: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    (n × E) integer points → (E × (max_points + 1)) counts.
+    """
+
+    _, E = points.shape
+    flat = np.arange(E) * (max_points + 1) + np.rint(points).astype(np.int64)
+
+    return np.bincount(
+        flat.ravel(),
+        minlength=E * (max_points + 1),
+    ).reshape(E, max_points + 1)
+
+
+def freeze_features(grids: list, registry: pd.DataFrame | None = None) -> list:
+    """
+    Grids (in round order) with every driver and constructor feature
+    fixed at its value going into the first of them.
+
+    Features only move on races an entity takes part in, so its row
+    in the first grid it appears in holds exactly its state before
+    the first round — later rounds' rows also reflect results from
+    the simulated rounds in between, which a forecast cannot know.
+    """
+
+    if registry is None:
+        registry = load_feature_registry()
+
+    rows = pd.concat(grids, ignore_index=True)
+    frozen = []
+
+    for grid in grids:
+        grid = grid.copy()
+
+        for entity, key in (("driver", "driver_id"), ("constructor", "constructor_id")):
+            features = [
+                f for f in registry.loc[registry["entity"] == entity, "feature_name"]
+                if f in grid.columns
+            ]
+            first = rows.drop_duplicates(key).set_index(key)[features]
+            grid[features] = first.reindex(grid[key]).to_numpy()
+
+        frozen.append(grid)
+
+    return frozen
+
+
+def sample_season_positions(
+    pace: np.ndarray,
+    dnf_prob: np.ndarray,
+    quali_weight: np.ndarray,
+    team: np.ndarray,
+    noise_sigma: float,
+    n: int,
+    rng: np.random.Generator,
+    driver_form: float = DRIVER_FORM,
+    team_form: float = TEAM_FORM,
+) -> np.ndarray:
+    """
+    (n × R × D) finishing positions (0 = DNF) of n simulated seasons.
+
+    pace, dnf_prob: (R × D); quali_weight: (R × 1); team: (R × D × C)
+    one-hot driver → constructor per round.
+
+    Race-day noise is drawn per (season, round, driver). On top, each
+    simulated season draws one form offset per driver and one per
+    constructor, shared by all its rounds, so results within a season
+    are correlated the way a real championship's are.
+    """
+
+    R, D, C = team.shape
+
+    form = (
+        rng.normal(0, driver_form * noise_sigma, (n, 1, D)) +
+        np.einsum("nc,rdc->nrd", rng.normal(0, team_form * noise_sigma, (n, C)), team)
+    )
+
+    sampled = (pace + form + rng.normal(0, noise_sigma, (n, R, D))) * quali_weight
+    dnfs = rng.random((n, R, D)) < dnf_prob
+
+    return finishing_positions(sampled, dnfs)
+
+
+def simulate_season(
+    rounds: list,
+    scenario: dict,
+    completed: pd.DataFrame | None = None,
+    n_simulations: int = 5000,
+    chunk_size: int = 500,
+    random_seed: int | None = None,
+    points=POINTS_SYSTEM,
+    q=(0.1, 0.5, 0.9),
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+    driver_form: float = DRIVER_FORM,
+    team_form: float = TEAM_FORM,
+) -> SeasonSimulation:
+    """
+    Vectorized championship simulation.
+
+    rounds: list of (grid_df, circuit) for every round still to race.
+    completed: rows already raced this season (driver_id,
+    constructor_id, position_order); their points are banked.
+
+    Banked points score position_order with `points`: the raw results
+    carry no recorded points, so for seasons under another points
+    system pass that system, and shared drives, fastest-lap and
+    sprint points are not counted.
+
+    All rounds of a chunk are drawn as one (n × R × D) tensor over the
+    union of drivers D, ranked along the driver axis and scored in one
+    pass. Season-long driver and team form (see
+    sample_season_positions) ties the rounds of a simulated season
+    together.
+    """
+
+    if not rounds:
+        raise ValueError("No rounds left to simulate")
+
+    if completed is None:
+        completed = pd.DataFrame(
+            columns=["driver_id", "constructor_id", "position_order"]
+        )
+
+    pace_model = as_pace_model(pace_model)
+    grids = [grid for grid, _ in rounds]
+
+    # -----------------------------
+    # ENTRANT UNIVERSE
+    # -----------------------------
+    driver_ids = np.unique(np.concatenate(
+        [g["driver_id"].to_numpy() for g in grids] +
+        [completed["driver_id"].to_numpy()]
+    ).astype(np.int64))
+
+    constructor_ids = np.unique(np.concatenate(
+        [g["constructor_id"].to_numpy() for g in grids] +
+        [completed["constructor_id"].to_numpy()]
+    ).astype(np.int64))
+
+    R, D, C = len(rounds), len(driver_ids), len(constructor_ids)
+
+    # -----------------------------
+    # (R × D) ROUND TENSORS
+    # -----------------------------
+    pace = np.full((R, D), -np.inf)
+    dnf_prob = np.ones((R, D))          # absent drivers never classify
+    quali_weight = np.ones((R, 1))
+    team = np.zeros((R, D, C))          # one-hot driver → constructor
+
+    for r, (grid, circuit) in enumerate(rounds):
+        grid = grid.drop_duplicates("driver_id")
+        d = np.searchsorted(driver_ids, grid["driver_id"].to_numpy())
+        c = np.searchsorted(constructor_ids, grid["constructor_id"].to_numpy())
+
+        pace[r, d] = base_pace(grid, pace_model)
+        dnf_prob[r, d] = dnf_probability(grid, scenario)
+        quali_weight[r] = circuit.quali_weight
+        team[r, d, c] = 1.0
+
+    # Unknown pace sorts last instead of poisoning the ranking
+    pace = np.nan_to_num(pace, nan=-np.inf)
+
+    pts = np.concatenate([[0.0], points_vector(D, points)])
+
+    # -----------------------------
+    # BANKED POINTS
+    # -----------------------------
+    done_pts = pts[np.minimum(
+        completed["position_order"].to_numpy(dtype=np.int64), D
+    )] if len(completed) else np.zeros(0)
+
+    base_driver = np.zeros(D)
+    np.add.at(
+        base_driver,
+        np.searchsorted(driver_ids, completed["driver_id"].to_numpy()),
+        done_pts,
+    )
+
+    base_team = np.zeros(C)
+    np.add.at(
+        base_team,
+        np.searchsorted(constructor_ids, completed["constructor_id"].to_numpy()),
+        done_pts,
+    )
+
+    # -----------------------------
+    # SIMULATE
+    # -----------------------------
+    cars = int(team.sum(axis=1).max())
+    max_pts = int(base_driver.max(initial=0) + pts[1] * R)
+    max_team_pts = int(base_team.max(initial=0) + pts[1:cars + 1].sum() * R)
+
+    driver_hist = np.zeros((D, max_pts + 1), dtype=np.int64)
+    team_hist = np.zeros((C, max_team_pts + 1), dtype=np.int64)
+    driver_title = np.zeros(D)
+    team_title = np.zeros(C)
+
+    entropy = np.random.SeedSequence(random_seed).entropy
+
+    for chunk, n in enumerate(chunk_plan(n_simulations, chunk_size)):
+        rng = chunk_rng(entropy, chunk)
+
+        positions = sample_season_positions(
+            pace, dnf_prob, quali_weight, team, pace_model.noise_sigma, n, rng,
+            driver_form=driver_form, team_form=team_form,
+        )
+        race_pts = pts[positions]                              # (n, R, D)
+
+        driver_pts = race_pts.sum(axis=1) + base_driver        # (n, D)
+        team_pts = np.einsum("nrd,rdc->nc", race_pts, team) + base_team
+
+        driver_title += _title_share(driver_pts)
+        team_title += _title_share(team_pts)
+
+        driver_hist += _histogram(driver_pts, max_pts)
+        team_hist += _histogram(team_pts, max_team_pts)
+
+    return SeasonSimulation(
+        drivers=_standings(
+            driver_ids, "driver_id", driver_title,
+            driver_hist, base_driver, n_simulations, q,
+        ),
+        constructors=_standings(
+            constructor_ids, "constructor_id", team_title,
+            team_hist, base_team, n_simulations, q,
+        ),
+        driver_points=driver_hist,
+        constructor_points=team_hist,
+        n_simulations=n_simulations,
+    )
@@ -1,22 +1,183 @@
 import pandas as pd
 
-from simulation.grid import build_starting_grid
+from data.content_cache import shared_fingerprint
+from data.feature_store import FeatureStore
+from simulation.cache import SimulationCache, simulation_key
+from simulation.grid import build_starting_grid, grid_index
 from simulation.circuit_registry import get_circuit_profile
-from simulation.monte_carlo import simulate_race
+from simulation.distribution import POINTS_SYSTEM, PositionDistribution
+from simulation.monte_carlo import simulate_position_distribution
+from simulation.pace import (
+    DEFAULT_PACE_MODEL,
+    PaceModel,
+    as_pace_model,
+    pace_model_config,
+)
+from simulation.season import SeasonSimulation, freeze_features, simulate_season
+from simulation.sweep import simulate_scenario_sweep, sweep_summary
+
+
+def _fingerprint(dataset: pd.DataFrame | FeatureStore) -> str:
+    if isinstance(dataset, FeatureStore):
+        return dataset.fingerprint
+    # The app's table lives for the process; hash it once, not per request
+    return shared_fingerprint(dataset)
+
+
+def run_race_distribution(
+    dataset: pd.DataFrame | FeatureStore,
+    season: int,
+    round: int,
+    circuit_id: int,
+    scenario: dict,
+    selected_drivers: list[int] | None = None,
+    n_simulations: int = 5000,
+    tolerance: float | None = None,
+    max_simulations: int | None = None,
+    random_seed: int | None = None,
+    n_workers: int = 1,
+    engine: str = "monte_carlo",
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+) -> PositionDistribution:
+    """
+    Full finishing-position distribution for a race:
+    P(position k), quantiles and expected points per driver.
+
+    engine: "monte_carlo" (one-shot pace draw) or "lap" (lap-by-lap).
+
+    dataset: processed table, or a FeatureStore (see
+    data.feature_store), which serves the grid by index.
+    """
+
+    grid = build_starting_grid(
+        dataset=dataset,
+        season=season,
+        round=round,
+        selected_drivers=selected_drivers,
+    )
+
+    circuit = get_circuit_profile(circuit_id)
+
+    return simulate_position_distribution(
+        grid_df=grid,
+        circuit=circuit,
+        scenario=scenario,
+        n_simulations=n_simulations,
+        tolerance=tolerance,
+        max_simulations=max_simulations,
+        random_seed=random_seed,
+        n_workers=n_workers,
+        engine=engine,
+        pace_model=pace_model,
+    )
 
 
 def run_race_simulation(
-    dataset: pd.DataFrame,
+    dataset: pd.DataFrame | FeatureStore,
     season: int,
     round: int,
     circuit_id: int,
     scenario: dict,
     selected_drivers: list[int] | None = None,
     n_simulations: int = 5000,
+    tolerance: float | None = None,
+    max_simulations: int | None = None,
+    random_seed: int | None = None,
+    n_workers: int = 1,
+    cache: SimulationCache | None = None,
+    engine: str = "monte_carlo",
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
 ):
     """
     High-level race simulation entry point.
     This is what UI / API / CLI should call.
+
+    Pass `tolerance` to stop early once win / podium probabilities
+    have converged (see simulate_race).
+
+    `random_seed` makes runs reproducible; `n_workers` shards the
+    simulations across a process pool without changing the result.
+
+    engine="lap" runs the lap-by-lap engine instead of the one-shot
+    Monte Carlo kernel.
+
+    `pace_model` may be a trained model or the path of a saved one
+    (see scripts/train_models.py pace).
+
+    With a `cache`, seeded requests are served from it when the same
+    inputs, dataset and circuit profile were simulated before.
+    Unseeded runs are never cached.
+    """
+
+    pace_model = as_pace_model(pace_model)
+
+    key = None
+    if cache is not None and random_seed is not None:
+        key = simulation_key(
+            _fingerprint(dataset),
+            get_circuit_profile(circuit_id),
+            season=season,
+            round=round,
+            scenario=scenario,
+            selected_drivers=(
+                sorted(selected_drivers)
+                if selected_drivers is not None else None
+            ),
+            n_simulations=n_simulations,
+            tolerance=tolerance,
+            max_simulations=max_simulations,
+            random_seed=random_seed,
+            engine=engine,
+            pace_model=pace_model_config(pace_model),
+        )
+
+        hit = cache.get(key)
+        if hit is not None:
+            return hit.copy()
+
+    distribution = run_race_distribution(
+        dataset=dataset,
+        season=season,
+        round=round,
+        circuit_id=circuit_id,
+        scenario=scenario,
+        selected_drivers=selected_drivers,
+        n_simulations=n_simulations,
+        tolerance=tolerance,
+        max_simulations=max_simulations,
+        random_seed=random_seed,
+        n_workers=n_workers,
+        engine=engine,
+        pace_model=pace_model,
+    )
+
+    results = distribution.summary(with_precision=tolerance is not None)
+
+    if key is not None:
+        cache.put(key, results.copy())
+
+    return results
+
+
+def run_scenario_sweep(
+    dataset: pd.DataFrame | FeatureStore,
+    season: int,
+    round: int,
+    circuit_id: int,
+    scenarios: list,
+    selected_drivers: list[int] | None = None,
+    n_simulations: int = 5000,
+    random_seed: int | None = None,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+    engine: str = "monte_carlo",
+):
+    """
+    Sensitivity table for many scenarios of the same race.
+
+    `scenarios` is a list of scenario dicts and / or RaceConfigs
+    (see config.scenario_grid). All scenarios share the same random
+    draws. Sweeping weather or chaos knobs needs engine="lap" (see
+    simulate_scenario_sweep).
     """
 
     grid = build_starting_grid(
@@ -28,11 +189,76 @@ def run_race_simulation(
 
     circuit = get_circuit_profile(circuit_id)
 
-    results = simulate_race(
+    distributions = simulate_scenario_sweep(
         grid_df=grid,
         circuit=circuit,
-        scenario=scenario,
+        scenarios=scenarios,
         n_simulations=n_simulations,
+        random_seed=random_seed,
+        pace_model=pace_model,
+        engine=engine,
     )
 
-    return results
+    return sweep_summary(scenarios, distributions)
+
+
+def run_season_simulation(
+    dataset: pd.DataFrame,
+    season: int,
+    scenario: dict,
+    from_round: int | None = None,
+    n_simulations: int = 5000,
+    random_seed: int | None = None,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+    points=POINTS_SYSTEM,
+) -> SeasonSimulation:
+    """
+    Championship simulation for a season.
+
+    Rounds before `from_round` are banked from actual results, scored
+    with `points` (see simulate_season); every round from `from_round`
+    on (default: the whole season) is simulated with its own entry
+    list and circuit profile.
+
+    Driver and constructor features are frozen at their values going
+    into `from_round`: a forecast made then cannot see the results of
+    the rounds it simulates.
+    """
+
+    index = grid_index(dataset)
+
+    all_rounds = index.rounds(season)
+    if not all_rounds:
+        raise RuntimeError(f"No races found for season {season}")
+
+    if from_round is None:
+        from_round = all_rounds[0]
+
+    rounds = []
+    completed = []
+    for r in all_rounds:
+        if r < from_round:
+            completed.append(index.rows(season, r))
+            continue
+
+        rounds.append(build_starting_grid(dataset=dataset, season=season, round=r))
+
+    rounds = [
+        (grid, get_circuit_profile(int(grid["circuit_id"].iloc[0])))
+        for grid in freeze_features(rounds)
+    ]
+
+    completed = (
+        pd.concat(completed) if completed
+        else dataset.iloc[:0]
+    )
+
+    return simulate_season(
+        rounds=rounds,
+        scenario=scenario,
+        completed=completed[["driver_id", "constructor_id", "position_order"]],
+        n_simulations=n_simulations,
+        random_seed=random_seed,
+        points=points,
+        pace_model=pace_model,
+    )
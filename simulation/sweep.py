@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+from simulation.config import RaceConfig, flatten_scenario, scenario_from_config
+from simulation.distribution import (
+    PositionDistribution,
+    finishing_positions,
+    position_histogram,
+)
+from simulation.lap_engine import DEFAULT_LAPS
+from simulation.monte_carlo import (
+    ENGINES,
+    base_pace,
+    chunk_plan,
+    chunk_rng,
+    dnf_probability,
+    engine_kernel,
+)
+from simulation.pace import DEFAULT_PACE_MODEL, PaceModel, as_pace_model
+
+# The only knob the one-shot monte_carlo kernel reads; weather, chaos
+# and the rest need the lap engine
+MONTE_CARLO_KNOBS = {"reliability_multiplier"}
+
+
+def _as_scenario(item) -> dict:
+    if isinstance(item, RaceConfig):
+        return scenario_from_config(item)
+    return item
+
+
+def _batched_histogram(positions: np.ndarray) -> np.ndarray:
+    """
+    (K × n × N) positions → (K × N × (N + 1)) counts.
+    """
+
+    K, _, N = positions.shape
+    flat = (
+        np.arange(K)[:, None, None] * (N * (N + 1)) +
+        np.arange(N) * (N + 1) +
+        positions
+    )
+
+    return np.bincount(
+        flat.ravel(),
+        minlength=K * N * (N + 1),
+    ).reshape(K, N, N + 1)
+
+
+def _ignored_knobs(scenarios: list[dict]) -> list[str]:
+    # Knobs that vary across the sweep but the monte_carlo kernel ignores
+    knobs = [flatten_scenario(s) for s in scenarios]
+    return sorted(
+        name for name in knobs[0]
+        if name not in MONTE_CARLO_KNOBS
+        and any(k.get(name) != knobs[0][name] for k in knobs)
+    )
+
+
+def _lap_sweep(
+    grid_df: pd.DataFrame,
+    circuit,
+    scenarios: list[dict],
+    n_simulations: int,
+    chunk_size: int,
+    random_seed: int | None,
+    n_laps: int,
+    pace_model: PaceModel,
+) -> np.ndarray:
+    """
+    (K × N × (N + 1)) counts from the lap engine. Scenarios change the
+    engine's control flow, so each runs on its own pass — over the
+    same per-chunk random streams.
+    """
+
+    N = len(grid_df)
+    entropy = np.random.SeedSequence(random_seed).entropy
+    counts = np.zeros((len(scenarios), N, N + 1), dtype=np.int64)
+
+    kernels = [
+        engine_kernel("lap", grid_df, circuit, s, n_laps, pace_model)
+        for s in scenarios
+    ]
+
+    for chunk, n in enumerate(chunk_plan(n_simulations, chunk_size)):
+        for k, (kernel, inputs) in enumerate(kernels):
+            counts[k] += position_histogram(
+                kernel(*inputs, n, chunk_rng(entropy, chunk))
+            )
+
+    return counts
+
+
+def simulate_scenario_sweep(
+    grid_df: pd.DataFrame,
+    circuit,
+    scenarios: list,
+    n_simulations: int = 5000,
+    chunk_size: int = 1000,
+    random_seed: int | None = None,
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+    engine: str = "monte_carlo",
+    n_laps: int = DEFAULT_LAPS,
+) -> list[PositionDistribution]:
+    """
+    Evaluate K scenarios with common random numbers.
+
+    monte_carlo: every chunk draws its pace noise and DNF uniforms
+    once and ranks the grid once; all scenarios are then applied to
+    those same draws as a (K × n × N) batch. This kernel only reads
+    reliability_multiplier, so sweeping any other knob raises.
+
+    lap: every scenario runs the lap-by-lap engine on the same
+    per-chunk random streams, so weather and chaos knobs take effect.
+
+    Either way differences between scenarios are low-variance, and
+    each scenario matches what simulate_position_distribution returns
+    for the same seed, engine and chunk_size.
+
+    `scenarios` may mix scenario dicts and RaceConfig objects.
+    """
+
+    scenarios = [_as_scenario(s) for s in scenarios]
+    if not scenarios:
+        raise ValueError("No scenarios to sweep")
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (expected one of {ENGINES})")
+
+    if engine == "monte_carlo":
+        ignored = _ignored_knobs(scenarios)
+        if ignored:
+            raise ValueError(
+                f"The monte_carlo engine ignores {ignored}; "
+                "sweep them with engine='lap'"
+            )
+
+    pace_model = as_pace_model(pace_model)
+
+    if engine == "lap":
+        counts = _lap_sweep(
+            grid_df, circuit, scenarios, n_simulations, chunk_size,
+            random_seed, n_laps, pace_model,
+        )
+        return [
+            PositionDistribution(
+                driver_ids=grid_df["driver_id"].to_numpy(),
+                counts=counts[k],
+                n_simulations=n_simulations,
+            )
+            for k in range(len(scenarios))
+        ]
+
+    driver_ids = grid_df["driver_id"].to_numpy()
+    N = len(driver_ids)
+    K = len(scenarios)
+
+    pace = base_pace(grid_df, pace_model)
+
+    # (K × N) thresholds, one row per scenario
+    dnf_prob = np.stack([dnf_probability(grid_df, s) for s in scenarios])
+
+    entropy = np.random.SeedSequence(random_seed).entropy
+    counts = np.zeros((K, N, N + 1), dtype=np.int64)
+
+    for chunk, n in enumerate(chunk_plan(n_simulations, chunk_size)):
+        rng = chunk_rng(entropy, chunk)
+
+        # Same draw order as the single-scenario kernel
+        sampled = pace + rng.normal(0, pace_model.noise_sigma, (n, N))
+        sampled *= circuit.quali_weight
+        uniforms = rng.random((n, N))
+
+        dnfs = uniforms[None, :, :] < dnf_prob[:, None, :]
+        positions = finishing_positions(sampled, dnfs)
+
+        counts += _batched_histogram(positions)
+
+    return [
+        PositionDistribution(
+            driver_ids=driver_ids,
+            counts=counts[k],
+            n_simulations=n_simulations,
+        )
+        for k in range(K)
+    ]
+
+
+def sweep_summary(
+    scenarios: list,
+    distributions: list[PositionDistribution],
+) -> pd.DataFrame:
+    """
+    Long sensitivity table: one row per (scenario, driver), with the
+    scenario knobs as columns next to the usual summary.
+    """
+
+    frames = []
+    for k, (item, dist) in enumerate(zip(scenarios, distributions)):
+        summary = dist.summary()
+
+        knobs = flatten_scenario(_as_scenario(item))
+        for name, value in reversed(list(knobs.items())):
+            summary.insert(0, name, value)
+        summary.insert(0, "scenario", k)
+
+        frames.append(summary)
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.store import load_table
+
+
+@pytest.fixture(scope="module")
+def results() -> pd.DataFrame:
+    """
+    Raw result rows of the 2000–2005 seasons, with season and round.
+    """
+
+    races = load_table("races")
+    races = races[races["season"].between(2000, 2005)]
+
+    return load_table("results").merge(
+        races[["race_id", "season", "round"]], on="race_id"
+    )
+
+
+@pytest.fixture
+def grid() -> pd.DataFrame:
+    """
+    Synthetic 12-car grid with a realistic spread of features.
+    """
+
+    n_drivers = 12
+    rng = np.random.default_rng(n_drivers)
+
+    return pd.DataFrame({
+        "driver_id": np.arange(1, n_drivers + 1),
+        "constructor_id": np.arange(n_drivers) // 2 + 1,
+        "driver_elo": rng.normal(1600, 150, n_drivers),
+        "constructor_pace_index": rng.uniform(2, 10, n_drivers),
+        "constructor_reliability": rng.uniform(0.8, 0.99, n_drivers),
+    })
+
+
+@pytest.fixture
+def scenario() -> dict:
+    return {
+        "weather": {"rain_prob": 0.2},
+        "mechanical": {"reliability_multiplier": 1.0},
+        "chaos": {"accident_multiplier": 1.0},
+    }
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from data.columnar import load_context_dataset
+from data.feature_store import load_feature_store
+from validation.backtest import run_backtest
+
+
+@pytest.fixture(scope="module")
+def store():
+    try:
+        return load_feature_store()
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+
+def test_store_and_table_backtests_agree(store):
+    dataset = load_context_dataset("pre_quali", mmap=False)
+    settings = dict(first_season=2023, last_season=2023, n_simulations=300, random_seed=3)
+
+    from_store = run_backtest(store=store, **settings)
+    from_table = run_backtest(dataset, **settings)
+
+    keys = ["race_id", "driver_id"]
+    pd.testing.assert_frame_equal(
+        from_store.predictions.sort_values(keys).reset_index(drop=True),
+        from_table.predictions.sort_values(keys).reset_index(drop=True),
+        check_like=True,
+    )
@@ -0,0 +1,83 @@
+import pytest
+
+import simulation.simulator as simulator
+from data.columnar import load_context_dataset
+from data.content_cache import dataset_fingerprint, shared_fingerprint
+from data.store import load_table
+from simulation.cache import SimulationCache
+from simulation.simulator import run_race_simulation
+
+
+@pytest.fixture(scope="module")
+def race() -> dict:
+    races = load_table("races")
+    row = races[(races["season"] == 2023) & (races["round"] == 1)].iloc[0]
+    return dict(season=2023, round=1, circuit_id=int(row["circuit_id"]))
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return load_context_dataset("pre_quali", mmap=False)
+
+
+def _simulate(dataset, race, scenario, cache, **overrides):
+    settings = dict(n_simulations=200, random_seed=5, cache=cache, **race)
+    settings.update(overrides)
+    return run_race_simulation(dataset, scenario=scenario, **settings)
+
+
+def test_hit_skips_simulation(dataset, race, scenario, tmp_path, monkeypatch):
+    cache = SimulationCache(cache_dir=tmp_path)
+    first = _simulate(dataset, race, scenario, cache)
+
+    def fail(**_):
+        raise AssertionError("cache hit expected")
+
+    monkeypatch.setattr(simulator, "run_race_distribution", fail)
+    again = _simulate(dataset, race, scenario, cache)
+
+    assert again.equals(first)
+    assert len(cache) == 1
+
+
+def test_disk_tier_survives_restart(dataset, race, scenario, tmp_path):
+    first = _simulate(dataset, race, scenario, SimulationCache(cache_dir=tmp_path))
+    fresh = SimulationCache(cache_dir=tmp_path)
+
+    assert len(fresh) == 0
+    assert _simulate(dataset, race, scenario, fresh).equals(first)
+    assert fresh.disk_entries() == 1
+
+
+def test_changed_inputs_miss(dataset, race, scenario, tmp_path):
+    cache = SimulationCache(cache_dir=tmp_path)
+    _simulate(dataset, race, scenario, cache)
+
+    # Another seed, another circuit profile, a rebuilt dataset
+    _simulate(dataset, race, scenario, cache, random_seed=6)
+    _simulate(dataset, race, scenario, cache, circuit_id=race["circuit_id"] + 1)
+
+    rebuilt = dataset.copy()
+    rebuilt.loc[rebuilt.index[-1], "driver_elo"] += 1.0
+    _simulate(rebuilt, race, scenario, cache)
+
+    assert cache.disk_entries() == 4
+
+
+def test_unseeded_runs_are_not_cached(dataset, race, scenario):
+    cache = SimulationCache()
+    _simulate(dataset, race, scenario, cache, random_seed=None)
+
+    assert len(cache) == 0
+
+
+def test_shared_fingerprint_is_per_object(dataset):
+    fp = shared_fingerprint(dataset)
+    copy = dataset.copy()
+
+    assert shared_fingerprint(dataset) is fp
+    assert fp == dataset_fingerprint(copy)
+
+    copy.loc[copy.index[0], "driver_elo"] += 1.0
+    assert shared_fingerprint(copy) != fp
+
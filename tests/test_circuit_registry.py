@@ -0,0 +1,44 @@
+import pytest
+
+from simulation.circuit_registry import (
+    DEFAULT,
+    load_all_circuit_profiles,
+    load_circuit_overrides,
+)
+
+
+def _overrides(tmp_path, text: str):
+    path = tmp_path / "circuit_overrides.csv"
+    path.write_text(text)
+    return path
+
+
+def test_blank_cells_keep_defaults(tmp_path):
+    path = _overrides(
+        tmp_path,
+        "circuit_id,circuit,overtake_difficulty,safety_car_rate\n"
+        "6,Monaco,2.5,\n",
+    )
+
+    assert load_circuit_overrides(path) == {6: {"overtake_difficulty": 2.5}}
+
+    monaco = load_all_circuit_profiles(path)[6]
+    assert monaco.overtake_difficulty == 2.5
+    assert monaco.safety_car_rate == DEFAULT["safety_car_rate"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("circuit_id,grip\n6,1.0\n", "Unknown circuit override columns"),
+    ("circuit_id,overtake_difficulty\n6,high\n", "Non-numeric"),
+    ("circuit_id,overtake_difficulty\n6,2.0\n6,2.5\n", "Duplicate circuit"),
+])
+def test_bad_overrides_rejected(tmp_path, text, message):
+    with pytest.raises(RuntimeError, match=message):
+        load_circuit_overrides(_overrides(tmp_path, text))
+
+
+def test_overrides_for_unknown_circuit_rejected(tmp_path):
+    path = _overrides(tmp_path, "circuit_id,overtake_difficulty\n99999,2.0\n")
+
+    with pytest.raises(RuntimeError, match="unknown circuits"):
+        load_all_circuit_profiles(path)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.columnar import read_columnar, read_schema, write_columnar
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "race_id": [1, 2, 1100],
+        "position_order": [1, 20, 3],
+        "race_date": pd.to_datetime(["2023-03-05", "2023-03-19", "2024-12-08"]),
+        "circuit_type": ["street", "permanent", "street"],
+        "driver_elo": [1500.0, np.nan, 1623.25],
+    })
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(frame, tmp_path, mmap):
+    path = tmp_path / "dataset"
+    write_columnar(frame, path)
+
+    loaded = read_columnar(path, mmap=mmap)
+
+    assert loaded.columns.tolist() == frame.columns.tolist()
+    assert loaded.dtypes.astype(str).drop("race_date").tolist() == [
+        "int16", "int8", "category", "float32",
+    ]
+    # Stored as day precision; pandas picks the nearest unit it supports
+    assert loaded["race_date"].dtype.kind == "M"
+    assert loaded["race_id"].tolist() == [1, 2, 1100]
+    assert loaded["race_date"].tolist() == frame["race_date"].tolist()
+    assert loaded["circuit_type"].tolist() == ["street", "permanent", "street"]
+    assert np.allclose(loaded["driver_elo"], frame["driver_elo"], equal_nan=True)
+
+
+def test_projection_and_rewrite(frame, tmp_path):
+    path = tmp_path / "dataset"
+    write_columnar(frame, path)
+    write_columnar(frame.iloc[:2], path)
+
+    loaded = read_columnar(path, columns=["position_order"])
+
+    assert loaded.columns.tolist() == ["position_order"]
+    assert read_schema(path)["n_rows"] == 2
+
+    with pytest.raises(RuntimeError):
+        read_columnar(path, columns=["quali_position"])
+
+
+def test_value_out_of_dtype_range(frame, tmp_path):
+    # position_order is int8
+    frame.loc[0, "position_order"] = 200
+    path = tmp_path / "dataset"
+
+    with pytest.raises(ValueError, match="out of range for int8"):
+        write_columnar(frame, path)
+
+    # The failed write leaves nothing behind for readers
+    with pytest.raises(RuntimeError, match="No columnar dataset"):
+        read_columnar(path)
+
+
+def test_missing_integer_values(frame, tmp_path):
+    frame["race_id"] = frame["race_id"].astype("Int64")
+    frame.loc[1, "race_id"] = pd.NA
+
+    with pytest.raises(ValueError, match="missing values"):
+        write_columnar(frame, tmp_path / "dataset")
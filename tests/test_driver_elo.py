@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from data.store import load_table
+from models.driver_elo import INITIAL_ELO, K_FACTOR, compute_driver_elo, expected_score
+
+
+def _baseline_elo(results: pd.DataFrame) -> pd.DataFrame:
+    # The original nested loop, over races in (season, round) order
+    elo = defaultdict(lambda: INITIAL_ELO)
+    records = []
+
+    results = results.sort_values(["season", "round", "position_order"])
+
+    for (_, _, race_id), race_df in results.groupby(["season", "round", "race_id"]):
+        drivers = race_df.loc[race_df["status_id"] == 1, "driver_id"].tolist()
+
+        for d in drivers:
+            records.append({"race_id": race_id, "driver_id": d, "driver_elo": elo[d]})
+
+        for i in range(len(drivers)):
+            ri = elo[drivers[i]]
+            for j in range(i + 1, len(drivers)):
+                ei = expected_score(ri, elo[drivers[j]])
+                elo[drivers[i]] += K_FACTOR * (1 - ei)
+                elo[drivers[j]] += K_FACTOR * (0 - (1 - ei))
+
+    return pd.DataFrame(records)
+
+
+def test_vectorized_elo_matches_baseline(results):
+    keys = ["race_id", "driver_id"]
+    finishers = results.loc[results["status_id"] == 1, keys]
+
+    got = (
+        compute_driver_elo(results)
+        .merge(finishers, on=keys)
+        .sort_values(keys)
+        .reset_index(drop=True)
+    )
+    want = _baseline_elo(results).sort_values(keys).reset_index(drop=True)
+
+    np.testing.assert_array_equal(got[keys].to_numpy(), want[keys].to_numpy())
+    np.testing.assert_allclose(got["driver_elo"], want["driver_elo"], rtol=1e-12)
+
+
+def test_elo_runs_in_season_order():
+    # Ergast race ids are not chronological: 2009 is ids 1-17, 2008 starts at 18
+    races = load_table("races")
+    races = races[races["season"].between(2008, 2009)]
+    results = load_table("results").merge(
+        races[["race_id", "season", "round"]], on="race_id"
+    )
+
+    elo = compute_driver_elo(results).merge(races, on="race_id")
+
+    opener_2008 = elo[(elo["season"] == 2008) & (elo["round"] == 1)]
+    opener_2009 = elo[(elo["season"] == 2009) & (elo["round"] == 1)]
+
+    assert (opener_2008["driver_elo"] == INITIAL_ELO).all()
+    assert (opener_2009["driver_elo"] != INITIAL_ELO).any()
+
+
+def test_retirements_are_rated_but_do_not_move_the_rating(results):
+    elo = compute_driver_elo(results).merge(
+        results[["race_id", "driver_id", "season", "round", "status_id"]]
+        .drop_duplicates(["race_id", "driver_id"]),
+        on=["race_id", "driver_id"],
+    )
+    assert len(elo) == len(results.drop_duplicates(["race_id", "driver_id"]))
+
+    elo = elo.sort_values(["driver_id", "season", "round"]).reset_index(drop=True)
+    next_elo = elo.groupby("driver_id")["driver_elo"].shift(-1)
+
+    retired = (elo["status_id"] != 1) & next_elo.notna()
+    assert retired.any()
+    np.testing.assert_allclose(elo.loc[retired, "driver_elo"], next_elo[retired])
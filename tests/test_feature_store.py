@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.columnar import load_context_dataset
+from data.feature_store import FeatureStore, load_feature_store
+
+
+@pytest.fixture
+def small_store() -> FeatureStore:
+    """
+    Three races, the last not raced yet. Driver 1 enters races 10
+    and 11; driver 2 enters race 10 only.
+    """
+
+    races = pd.DataFrame({
+        "race_id": [10, 11, 12],
+        "season": [2030, 2030, 2030],
+        "round": [1, 2, 3],
+        "circuit_id": [1, 1, 1],
+    })
+    entries = pd.DataFrame({
+        "race_id": [10, 10, 11],
+        "driver_id": [1, 2, 1],
+        "constructor_id": [1, 1, 1],
+    })
+
+    driver = pd.DataFrame({
+        "driver_id": [1, 2, 1],
+        "race_id": [10, 10, 11],
+        "driver_elo": [1500.0, 1500.0, 1510.0],
+    })
+    driver_post = driver.assign(driver_elo=[1510.0, 1490.0, 1520.0])
+
+    constructor = pd.DataFrame({
+        "constructor_id": [1, 1],
+        "race_id": [10, 11],
+        "constructor_pace_index": [np.nan, 1.5],
+    })
+    constructor_post = constructor.assign(constructor_pace_index=[1.5, 1.0])
+
+    return FeatureStore(
+        races=races,
+        entries=entries,
+        observations={"driver": driver, "constructor": constructor},
+        post={"driver": driver_post, "constructor": constructor_post},
+    )
+
+
+def _elo(store: FeatureStore, race_id: int) -> list[float]:
+    return store.lookup("driver", [1, 2], race_id, ["driver_elo"])["driver_elo"].tolist()
+
+
+def test_entered_race_reads_pre_race_values(small_store):
+    assert _elo(small_store, 10) == [1500.0, 1500.0]
+    assert small_store.grid(11)["driver_elo"].tolist() == [1510.0]
+
+
+def test_skipped_race_reads_state_after_the_last_one(small_store):
+    # Driver 2 sat out race 11: its rating after race 10, not before
+    assert _elo(small_store, 11) == [1510.0, 1490.0]
+
+
+def test_upcoming_race_reads_state_after_the_last_one(small_store):
+    assert _elo(small_store, 12) == [1520.0, 1490.0]
+    assert small_store.get("constructor", 1, 12, "constructor_pace_index") == 1.0
+
+
+def test_no_observation_yet_is_nan():
+    races = pd.DataFrame({
+        "race_id": [1, 2], "season": [2030, 2030],
+        "round": [1, 2], "circuit_id": [1, 1],
+    })
+    driver = pd.DataFrame({"driver_id": [5], "race_id": [2], "driver_elo": [1500.0]})
+    constructor = pd.DataFrame({
+        "constructor_id": [1], "race_id": [2], "constructor_pace_index": [2.0],
+    })
+    store = FeatureStore(
+        races=races,
+        entries=pd.DataFrame({"race_id": [2], "driver_id": [5], "constructor_id": [1]}),
+        observations={"driver": driver, "constructor": constructor},
+        post={"driver": driver, "constructor": constructor},
+    )
+
+    assert np.isnan(store.get("driver", 5, 1, "driver_elo"))
+
+
+def test_built_store_rolls_values_past_a_race_without_results():
+    try:
+        store = load_feature_store()
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+    # 2024 R2 has no results in the raw data: nobody entered it
+    dataset = load_context_dataset("pre_quali", mmap=False)
+    r1 = dataset[(dataset["season"] == 2024) & (dataset["round"] == 1)]
+    r3 = dataset[(dataset["season"] == 2024) & (dataset["round"] == 3)]
+    assert r1.size and r3.size
+
+    features = ["driver_elo", "driver_incident_rate"]
+    skipped = store.lookup(
+        "driver", r1["driver_id"], store.race_id(2024, 2), features
+    )
+    following = r3.set_index("driver_id")[features].reindex(r1["driver_id"])
+
+    np.testing.assert_allclose(
+        skipped.to_numpy(dtype=float), following.to_numpy(dtype=float), rtol=1e-6
+    )
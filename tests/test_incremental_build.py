@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import scripts.build_dataset as build_dataset
+from data.columnar import load_context_dataset
+from data.feature_store import load_feature_store
+from features.registry import CONTEXTS
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    Scratch project root: raw data and the registry are shared, every
+    build output (processed tables, state, feature cache) is not.
+    """
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "raw").symlink_to(ROOT / "data" / "raw")
+    (tmp_path / "features").symlink_to(ROOT / "features")
+    monkeypatch.chdir(tmp_path)
+
+    return tmp_path
+
+
+def _snapshot() -> tuple[dict, str]:
+    views = {c: load_context_dataset(c, mmap=False) for c in CONTEXTS}
+    return views, load_feature_store().fingerprint
+
+
+def test_incremental_matches_full_build(workdir, monkeypatch):
+    results, races, status = build_dataset.load_raw_tables()
+
+    raced = races[races["race_id"].isin(results["race_id"])]
+    last = raced.sort_values(["season", "round"])["race_id"].tail(3)
+
+    monkeypatch.setattr(
+        build_dataset,
+        "load_raw_tables",
+        lambda: (results[~results["race_id"].isin(last)], races, status),
+    )
+    build_dataset.build_full(use_cache=False)
+
+    # The trimmed races arrive: only they are computed and appended
+    monkeypatch.setattr(
+        build_dataset, "load_raw_tables", lambda: (results, races, status)
+    )
+    appended = build_dataset.build_incremental(use_cache=False)
+
+    assert sorted(appended["race_id"].unique()) == sorted(last)
+    incremental_views, incremental_store = _snapshot()
+
+    build_dataset.build_full(use_cache=False)
+    full_views, full_store = _snapshot()
+
+    for context in CONTEXTS:
+        pd.testing.assert_frame_equal(incremental_views[context], full_views[context])
+    assert incremental_store == full_store
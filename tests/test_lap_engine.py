@@ -0,0 +1,43 @@
+import numpy as np
+
+from simulation.lap_engine import DIRTY_AIR_GAP, resolve_overtakes
+
+
+def _finishing_order(times: np.ndarray) -> np.ndarray:
+    return np.argsort(times, axis=1, kind="stable")
+
+
+def test_blocked_chain_keeps_its_order():
+    times = np.array([[10.0, 9.9, 9.8]])
+
+    resolved = resolve_overtakes(times, np.ones_like(times), 1.0)
+
+    np.testing.assert_allclose(
+        resolved, [[10.0, 10.0 + DIRTY_AIR_GAP, 10.0 + 2 * DIRTY_AIR_GAP]]
+    )
+
+
+def test_no_swaps_when_every_pass_is_blocked():
+    rng = np.random.default_rng(0)
+    times = 100 + rng.normal(0, 1, (500, 20))
+    times[rng.random(times.shape) < 0.05] = np.inf
+
+    # A uniform of 1 never falls under the pass probability
+    resolved = resolve_overtakes(times, np.ones_like(times), 1.0)
+
+    running = np.isfinite(times)
+    for row in range(len(times)):
+        finite = resolved[row, running[row]]
+        assert (np.diff(finite) > 0).all()
+    assert (np.isinf(resolved) == ~running).all()
+
+
+def test_a_pass_gains_at_most_one_place():
+    rng = np.random.default_rng(1)
+    times = 100 + rng.normal(0, 1, (500, 20))
+
+    # A uniform of 0 always falls under the pass probability
+    resolved = resolve_overtakes(times, np.zeros_like(times), 1.0)
+
+    place = np.argsort(_finishing_order(resolved), axis=1)
+    assert (place >= np.arange(times.shape[1]) - 1).all()
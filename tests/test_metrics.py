@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.metrics import (
+    LOG_LOSS_EPS,
+    brier_score,
+    calibration_curve,
+    log_loss,
+    ranked_probability_score,
+    score_predictions,
+)
+
+
+def test_brier_by_hand():
+    y = [1, 0, 0, 1]
+
+    assert brier_score(y, y) == 0.0
+    assert brier_score([0.5] * 4, y) == 0.25
+    # (0.2² + 0.3²) / 2
+    assert np.isclose(brier_score([0.8, 0.3], [1, 0]), 0.065)
+
+
+def test_log_loss_by_hand():
+    y = [1, 0, 0, 1]
+
+    assert np.isclose(log_loss([0.5] * 4, y), np.log(2))
+    assert np.isclose(log_loss([0.8, 0.3], [1, 0]), -(np.log(0.8) + np.log(0.7)) / 2)
+    assert log_loss(y, y) < 1e-12
+
+
+def test_log_loss_clips_certain_misses():
+    # A certain forecast that misses costs -log(eps), not infinity
+    # (1 - eps rounds in float64, hence the looser tolerance)
+    worst = -np.log(LOG_LOSS_EPS)
+
+    assert np.isclose(log_loss([0.0], [1]), worst)
+    assert np.isclose(log_loss([1.0], [0]), worst, rtol=1e-3)
+    assert np.isclose(log_loss([0.0, 1.0], [1, 0], eps=0.01), -np.log(0.01))
+
+
+def test_rps_by_hand():
+    perfect = np.array([[1.0, 0.0, 0.0]])
+    uniform = np.full((2, 3), 1 / 3)
+
+    assert ranked_probability_score(perfect, [0])[0] == 0.0
+
+    # CDFs (1/3, 2/3, 1) against (1, 1, 1) and (0, 1, 1), over K - 1 = 2
+    assert np.allclose(ranked_probability_score(uniform, [0, 1]), [5 / 18, 1 / 9])
+
+    # A certain forecast of the opposite end scores the maximum
+    assert ranked_probability_score(perfect, [2])[0] == 1.0
+
+
+def test_rps_ignores_padding_columns():
+    padded = np.array([[1 / 3, 1 / 3, 1 / 3, 0.0]])
+
+    assert np.isclose(ranked_probability_score(padded, [0], [3])[0], 5 / 18)
+
+
+def test_calibration_curve_by_hand():
+    p = [0.05, 0.15, 0.15, 0.95, 1.0]
+    y = [0, 1, 0, 1, 1]
+
+    curve = calibration_curve(p, y, n_bins=10)
+
+    # Empty bins are dropped; p == 1 lands in the last bin
+    assert np.allclose(curve["bin_lower"], [0.0, 0.1, 0.9])
+    assert np.allclose(curve["mean_predicted"], [0.05, 0.15, 0.975])
+    assert np.allclose(curve["observed_freq"], [0.0, 0.5, 1.0])
+    assert curve["count"].tolist() == [1, 2, 2]
+
+
+def test_calibration_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        calibration_curve([0.5], [1], strategy="isotonic")
+
+
+def test_score_predictions_events():
+    predictions = pd.DataFrame({
+        "win_prob": [0.5, 0.5, 0.0, 0.0],
+        "podium_prob": [1.0, 1.0, 1.0, 0.0],
+        "position_order": [1, 2, 3, 4],
+    })
+
+    scores = score_predictions(predictions).set_index("event")
+
+    assert scores.loc["win", "brier"] == (0.25 + 0.25) / 4
+    assert scores.loc["win", "base_rate"] == 0.25
+    assert scores.loc["podium", "brier"] == 0.0
+    assert scores.loc["podium", "n"] == 4
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from simulation.circuit_registry import get_circuit_profile
+from simulation.monte_carlo import chunk_plan, simulate_position_distribution
+
+
+def test_chunk_plan_covers_the_budget():
+    assert chunk_plan(2500, 1000) == [1000, 1000, 500]
+    assert chunk_plan(999, 1000) == [999]
+
+
+@pytest.mark.parametrize("budget, chunk_size", [(0, 1000), (1000, 0), (1000, -5)])
+def test_chunk_plan_rejects_empty_budgets_and_chunks(budget, chunk_size):
+    with pytest.raises(ValueError):
+        chunk_plan(budget, chunk_size)
+
+
+# -----------------------------
+# SEEDED DETERMINISM
+# -----------------------------
+@pytest.mark.parametrize("engine", ["monte_carlo", "lap"])
+def test_seeded_runs_do_not_depend_on_worker_count(grid, scenario, engine):
+    runs = [
+        simulate_position_distribution(
+            grid,
+            get_circuit_profile(1),
+            scenario,
+            n_simulations=1200,
+            chunk_size=250,
+            random_seed=7,
+            n_workers=n_workers,
+            engine=engine,
+            n_laps=20,
+        )
+        for n_workers in (1, 2)
+    ]
+
+    np.testing.assert_array_equal(runs[0].counts, runs[1].counts)
+    assert runs[0].counts.sum() == 1200 * len(grid)
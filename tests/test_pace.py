@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from simulation.pace import FittedPaceModel, load_pace_model, save_pace_model
+from validation.backtest import run_backtest
+
+
+def _model(last_season: int | None) -> FittedPaceModel:
+    return FittedPaceModel(
+        features=("driver_elo", "constructor_pace_index"),
+        weights=(0.5, 600.0),
+        transforms=("identity", "inverse"),
+        fills=(1500.0, 5.0),
+        entities=("driver", "constructor"),
+        last_season=last_season,
+    )
+
+
+def test_saved_model_keeps_its_training_cutoff(tmp_path):
+    path = tmp_path / "pace_model.json"
+    save_pace_model(_model(2015), path, races=10)
+
+    assert load_pace_model(path) == _model(2015)
+
+
+def test_backtest_refuses_a_model_trained_on_its_seasons():
+    with pytest.raises(RuntimeError, match="trained through 2024"):
+        run_backtest(pd.DataFrame(), first_season=2009, pace_model=_model(2024))
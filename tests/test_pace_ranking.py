@@ -0,0 +1,49 @@
+import itertools
+
+import numpy as np
+
+from models.pace_ranking import plackett_luce_nll
+
+
+def _padded_batch(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    u = rng.normal(0, 2, (4, 6))
+    mask = np.arange(6)[None, :] < np.array([[6], [4], [2], [5]])
+    return u, mask
+
+
+def test_nll_matches_the_product_formula():
+    u = np.array([[0.3, -1.2, 2.0]])
+    mask = np.ones_like(u, dtype=bool)
+
+    # P(order) = Π_i exp(u_i) / Σ_{k ≥ i} exp(u_k)
+    e = np.exp(u[0])
+    p = np.prod([e[i] / e[i:].sum() for i in range(3)])
+
+    nll, _ = plackett_luce_nll(u, mask)
+    assert np.isclose(nll, -np.log(p))
+
+    # And the probabilities of all orders sum to one
+    total = sum(
+        np.exp(-plackett_luce_nll(u[:, list(order)], mask)[0])
+        for order in itertools.permutations(range(3))
+    )
+    assert np.isclose(total, 1.0)
+
+
+def test_gradient_matches_finite_differences():
+    u, mask = _padded_batch()
+    _, grad = plackett_luce_nll(u, mask)
+
+    eps = 1e-6
+    numeric = np.zeros_like(u)
+    for idx in zip(*np.nonzero(mask)):
+        up, down = u.copy(), u.copy()
+        up[idx] += eps
+        down[idx] -= eps
+        numeric[idx] = (
+            plackett_luce_nll(up, mask)[0] - plackett_luce_nll(down, mask)[0]
+        ) / (2 * eps)
+
+    np.testing.assert_allclose(grad, numeric, atol=1e-6)
+    assert (grad[~mask] == 0).all()
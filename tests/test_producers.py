@@ -0,0 +1,76 @@
+import argparse
+
+import pytest
+
+from data.content_cache import ContentCache
+from data.store import load_table
+from features.producers import PRODUCERS, feature_cache, run_producers, with_params
+from features.registry import load_feature_registry
+from models.status_taxonomy import build_status_taxonomy
+from scripts.build_dataset import parse_param
+
+
+def test_param_change_reruns_only_its_producer(results, tmp_path):
+    taxonomy = build_status_taxonomy(load_table("status"))
+    registry = load_feature_registry()
+    cache = feature_cache(tmp_path)
+
+    base, _ = run_producers(results, taxonomy, registry, cache=cache)
+    n_entries = cache.disk_entries()
+    assert n_entries == len(base)
+
+    params = {"constructor_pace": {"window": 3}}
+    changed, _ = run_producers(results, taxonomy, registry, params=params, cache=cache)
+
+    # One new entry: the re-keyed producer; everything else was a hit
+    assert cache.disk_entries() == n_entries + 1
+    assert not changed["constructor_pace"].equals(base["constructor_pace"])
+    for name in base:
+        if name != "constructor_pace":
+            assert changed[name].equals(base[name])
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = ContentCache(maxsize=1, cache_dir=tmp_path, max_disk_entries=2)
+    for i in range(4):
+        cache.put(f"k{i}", i)
+
+    assert cache.disk_entries() == 2
+    assert cache.get("k0") is None
+    assert cache.get("k3") == 3
+
+
+def test_unknown_producer_rejected(results):
+    registry = load_feature_registry()
+    taxonomy = build_status_taxonomy(load_table("status"))
+
+    with pytest.raises(ValueError, match="Unknown producer"):
+        run_producers(results, taxonomy, registry, params={"driver_pace": {"window": 3}})
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"span": 3}, "Unknown parameter"),
+    ({"window": 2.5}, "must be an int"),
+    ({"window": "3"}, "must be an int"),
+    ({"window": True}, "must be an int"),
+])
+def test_bad_param_rejected(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        with_params(PRODUCERS["constructor_pace"], overrides)
+
+
+def test_float_params_accept_ints():
+    producer = with_params(PRODUCERS["driver_elo"], {"k_factor": 24})
+    assert producer.params["k_factor"] == 24
+
+    with pytest.raises(ValueError, match="must be a number"):
+        with_params(PRODUCERS["driver_elo"], {"k_factor": "24"})
+
+
+def test_parse_param():
+    assert parse_param("constructor_pace.window=7") == ("constructor_pace", "window", 7)
+    assert parse_param("driver_elo.k_factor=20.5") == ("driver_elo", "k_factor", 20.5)
+
+    for text in ("constructor_pace.window", "window=7", "constructor_pace.window=seven"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_param(text)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from models.constructor_pace import compute_constructor_pace
+
+
+def _baseline_constructor_pace(dataset: pd.DataFrame, window: int) -> pd.DataFrame:
+    # The original per-constructor, per-race loop
+    df = dataset.sort_values(["season", "round", "position_order"])
+    records = []
+
+    for constructor_id, group in df.groupby("constructor_id"):
+        history = []
+
+        for race_id, race_group in group.groupby("race_id", sort=False):
+            records.append({
+                "race_id": race_id,
+                "constructor_id": constructor_id,
+                "constructor_pace_index": (
+                    pd.Series(history).median() if history else np.nan
+                ),
+            })
+            history = (history + [race_group["position_order"].median()])[-window:]
+
+    return pd.DataFrame(records)
+
+
+def test_rolling_constructor_pace_matches_baseline(results):
+    keys = ["race_id", "constructor_id"]
+    got = compute_constructor_pace(results, window=5).sort_values(keys).reset_index(drop=True)
+    want = _baseline_constructor_pace(results, window=5).sort_values(keys).reset_index(drop=True)
+
+    np.testing.assert_array_equal(got[keys].to_numpy(), want[keys].to_numpy())
+    np.testing.assert_allclose(
+        got["constructor_pace_index"].to_numpy(dtype=float),
+        want["constructor_pace_index"].to_numpy(dtype=float),
+    )
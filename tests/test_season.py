@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.columnar import load_context_dataset
+from simulation.season import freeze_features, sample_season_positions
+from simulation.simulator import run_season_simulation
+
+SCENARIO = {
+    "weather": {"rain_prob": 0.0},
+    "mechanical": {"reliability_multiplier": 1.0},
+    "chaos": {"accident_multiplier": 1.0},
+}
+
+
+def _round_correlation(**form) -> float:
+    R, D, C = 2, 10, 5
+
+    team = np.zeros((R, D, C))
+    team[:, np.arange(D), np.arange(D) // 2] = 1.0
+
+    positions = sample_season_positions(
+        pace=np.zeros((R, D)),
+        dnf_prob=np.zeros((R, D)),
+        quali_weight=np.ones((R, 1)),
+        team=team,
+        noise_sigma=50.0,
+        n=4000,
+        rng=np.random.default_rng(0),
+        **form,
+    )
+
+    # Driver 0's finishing position in round 1 vs round 2
+    return np.corrcoef(positions[:, 0, 0], positions[:, 1, 0])[0, 1]
+
+
+def test_rounds_of_a_season_are_correlated():
+    assert _round_correlation() > 0.15
+
+
+def test_without_form_rounds_are_independent():
+    assert abs(_round_correlation(driver_form=0.0, team_form=0.0)) < 0.05
+
+
+def test_features_are_frozen_at_the_first_round():
+    grids = [
+        pd.DataFrame({
+            "driver_id": [1], "constructor_id": [10],
+            "driver_elo": [1500.0], "constructor_pace_index": [3.0],
+        }),
+        pd.DataFrame({
+            "driver_id": [1, 2], "constructor_id": [10, 11],
+            "driver_elo": [1600.0, 1400.0], "constructor_pace_index": [2.0, 6.0],
+        }),
+    ]
+
+    frozen = freeze_features(grids)
+
+    assert frozen[1]["driver_elo"].tolist() == [1500.0, 1400.0]
+    assert frozen[1]["constructor_pace_index"].tolist() == [3.0, 6.0]
+    # Inputs untouched
+    assert grids[1]["driver_elo"].tolist() == [1600.0, 1400.0]
+
+
+def test_mid_season_forecast_does_not_see_later_results():
+    try:
+        dataset = load_context_dataset("pre_quali", mmap=False)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+    season = dataset[dataset["season"] == 2023].reset_index(drop=True)
+
+    # Scramble the features of round 10's entrants in every later round
+    scrambled = season.copy()
+    entrants = season.loc[season["round"] == 10, "driver_id"]
+    later = (scrambled["round"] > 10) & scrambled["driver_id"].isin(entrants)
+
+    rng = np.random.default_rng(0)
+    for feature in ("driver_elo", "constructor_pace_index"):
+        scrambled.loc[later, feature] = rng.permutation(
+            scrambled.loc[later, feature].to_numpy()
+        )
+
+    runs = [
+        run_season_simulation(
+            df, 2023, SCENARIO, from_round=10, n_simulations=300, random_seed=1
+        ).drivers
+        for df in (season, scrambled)
+    ]
+
+    pd.testing.assert_frame_equal(runs[0], runs[1])
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from data.store import load_table
+from models.status_taxonomy import (
+    ACCIDENT,
+    DISQUALIFIED,
+    FINISHED,
+    LAPPED,
+    MECHANICAL,
+    OTHER,
+    attach_status_labels,
+    build_status_taxonomy,
+)
+
+# Ergast status ids → expected category
+KNOWN = {
+    1: FINISHED,        # Finished
+    11: LAPPED,         # +1 Lap
+    19: LAPPED,         # +9 Laps
+    2: DISQUALIFIED,
+    3: ACCIDENT,
+    4: ACCIDENT,        # Collision
+    20: ACCIDENT,       # Spun off
+    5: MECHANICAL,      # Engine
+    6: MECHANICAL,      # Gearbox
+    22: MECHANICAL,     # Suspension
+    27: MECHANICAL,     # Tyre
+    31: OTHER,          # Retired
+}
+
+
+def test_known_status_ids():
+    taxonomy = build_status_taxonomy(load_table("status"))
+
+    ids = list(KNOWN)
+    assert taxonomy.category(ids).tolist() == list(KNOWN.values())
+
+
+def test_unknown_ids_are_other():
+    taxonomy = build_status_taxonomy(load_table("status"))
+
+    assert taxonomy.category([-1, 0, 10_000]).tolist() == [OTHER] * 3
+
+
+def test_labels_follow_categories():
+    status = pd.DataFrame({
+        "statusId": [1, 4, 7],
+        "status": ["Finished", "+2 Laps", "Oil leak"],
+    })
+    taxonomy = build_status_taxonomy(status)
+
+    # Id 2 is a gap in the table
+    assert taxonomy.category([1, 2, 4, 7]).tolist() == [FINISHED, OTHER, LAPPED, MECHANICAL]
+
+    labelled = attach_status_labels(pd.DataFrame({"status_id": [1, 7, 4]}), taxonomy)
+    assert labelled["mechanical_failure"].tolist() == [0, 1, 0]
+    assert labelled["accident"].tolist() == [0, 0, 0]
+    assert np.array_equal(taxonomy.is_mechanical([7, 1]), [1, 0])
@@ -0,0 +1,18 @@
+import numpy as np
+
+from data.store import IdLookup, driver_names
+
+
+def test_take_known_and_unknown_ids():
+    lookup = IdLookup(values=np.array([None, "a", "b"], dtype=object), missing="?")
+
+    assert lookup.take([2, 1, 7, -1]).tolist() == ["b", "a", "?", "?"]
+    assert lookup.get(1) == "a"
+    assert lookup.get(7, "none") == "none"
+
+
+def test_take_empty():
+    lookup = IdLookup(values=np.array([None, "a"], dtype=object))
+
+    assert lookup.take([]).tolist() == []
+    assert driver_names().take(np.array([], dtype=np.int16)).size == 0
@@ -0,0 +1,51 @@
+import copy
+
+import numpy as np
+import pytest
+
+from simulation.circuit_registry import get_circuit_profile
+from simulation.monte_carlo import simulate_position_distribution
+from simulation.sweep import simulate_scenario_sweep
+
+
+def _with(scenario: dict, section: str, knob: str, value: float) -> dict:
+    s = copy.deepcopy(scenario)
+    s[section][knob] = value
+    return s
+
+
+@pytest.mark.parametrize(
+    "engine, section, knob",
+    [
+        ("monte_carlo", "mechanical", "reliability_multiplier"),
+        ("lap", "weather", "rain_prob"),
+        ("lap", "chaos", "accident_multiplier"),
+    ],
+)
+def test_each_scenario_matches_a_single_run(grid, scenario, engine, section, knob):
+    circuit = get_circuit_profile(1)
+    scenarios = [_with(scenario, section, knob, v) for v in (0.0, 1.0, 2.0)]
+
+    swept = simulate_scenario_sweep(
+        grid, circuit, scenarios,
+        n_simulations=600, chunk_size=250, random_seed=11,
+        engine=engine, n_laps=15,
+    )
+
+    for s, dist in zip(scenarios, swept):
+        single = simulate_position_distribution(
+            grid, circuit, s,
+            n_simulations=600, chunk_size=250, random_seed=11,
+            engine=engine, n_laps=15,
+        )
+        np.testing.assert_array_equal(dist.counts, single.counts)
+
+    # The knob actually moves the result
+    assert not np.array_equal(swept[0].counts, swept[2].counts)
+
+
+def test_monte_carlo_rejects_knobs_it_ignores(grid, scenario):
+    scenarios = [_with(scenario, "weather", "rain_prob", v) for v in (0.0, 0.8)]
+
+    with pytest.raises(ValueError, match="rain_prob"):
+        simulate_scenario_sweep(grid, get_circuit_profile(1), scenarios)
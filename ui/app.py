@@ -8,7 +8,6 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
 import streamlit as st
-import pandas as pd
 
 # -----------------------------
 # LOAD CSS
@@ -25,9 +24,17 @@ load_css()
 # IMPORTS
 # -----------------------------
 from scripts.view_simulation_with_names import simulate_with_names
-from simulation.grid import list_all_drivers, list_active_drivers
+from simulation.grid import grid_index, list_all_drivers, list_active_drivers
 from simulation.circuit_registry import CIRCUIT_PROFILES
-from data.metadata import load_driver_lookup
+from data.store import driver_names
+from simulation.cache import SimulationCache
+from data.columnar import load_context_dataset
+
+# Early stop: ±1% on every win / podium probability. A probability
+# near 0.5 needs ~9.6k runs for a 95% half-width below 0.01, so the
+# budget must reach past that or convergence can never trigger.
+EARLY_STOP_TOLERANCE = 0.01
+EARLY_STOP_MAX_SIMULATIONS = 12000
 
 # -----------------------------
 # TEAM GLOW MAPPING
@@ -55,12 +62,23 @@ def get_team_glow(constructor_name: str) -> str:
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-@st.cache_data
+@st.cache_resource
 def load_dataset():
-    return pd.read_csv("data/processed/dataset_pre_quali.csv")
+    # Memory-mapped, typed columns: no parsing on cold start
+    df = load_context_dataset("pre_quali")
+
+    # Index grids once per process; lookups are O(1) afterwards
+    grid_index(df)
+    return df
+
+@st.cache_resource
+def load_simulation_cache():
+    return SimulationCache(
+        maxsize=256, cache_dir="data/cache/simulations", max_disk_entries=2048
+    )
 
 df = load_dataset()
-drivers_lookup = load_driver_lookup()
+sim_cache = load_simulation_cache()
 
 # -----------------------------
 # SIDEBAR
@@ -74,7 +92,7 @@ season = st.sidebar.selectbox(
 
 round_ = st.sidebar.selectbox(
     "Round",
-    sorted(df[df["season"] == season]["round"].unique().astype(int)),
+    grid_index(df).rounds(season),
 )
 
 circuit_id = st.sidebar.selectbox(
@@ -92,12 +110,12 @@ if grid_mode == "Active grid only":
     selected_drivers = list_active_drivers(df, season)
 else:
     all_drivers = list_all_drivers(df)
-    driver_names = drivers_lookup.set_index("driver_id")["driver_name"].to_dict()
+    names = driver_names()
 
     selected_drivers = st.sidebar.multiselect(
         "Select drivers",
         options=all_drivers,
-        format_func=lambda d: driver_names.get(d, f"Driver {d}"),
+        format_func=lambda d: names.get(d, f"Driver {d}"),
         default=list_active_drivers(df, season),
     )
 
@@ -115,6 +133,29 @@ n_simulations = st.sidebar.slider(
     1000, 10000, 3000, step=500
 )
 
+engine = st.sidebar.radio(
+    "Engine",
+    ["monte_carlo", "lap"],
+    format_func=lambda e: "Monte Carlo" if e == "monte_carlo" else "Lap-by-lap",
+)
+
+early_stop = st.sidebar.checkbox(
+    "Stop early once converged (±1%)",
+    value=True,
+    help=(
+        f"Runs until every win / podium probability is within "
+        f"±{EARLY_STOP_TOLERANCE:.0%}, up to "
+        f"{EARLY_STOP_MAX_SIMULATIONS:,} runs."
+    ),
+)
+
+random_seed = st.sidebar.number_input(
+    "Random seed",
+    min_value=0,
+    value=2024,
+    step=1,
+)
+
 scenario = {
     "weather": {"rain_prob": rain_prob},
     "mechanical": {"reliability_multiplier": reliability_mult},
@@ -144,9 +185,28 @@ if st.button("🚦 Run Simulation"):
             scenario=scenario,
             selected_drivers=selected_drivers,
             n_simulations=n_simulations,
+            tolerance=EARLY_STOP_TOLERANCE if early_stop else None,
+            max_simulations=(
+                max(n_simulations, EARLY_STOP_MAX_SIMULATIONS)
+                if early_stop else None
+            ),
+            random_seed=int(random_seed),
+            cache=sim_cache,
+            engine=engine,
         )
 
-    st.success("Simulation complete")
+    if early_stop:
+        runs = int(result["n_simulations"].iloc[0])
+        converged = (
+            result[["win_prob_ci", "podium_prob_ci"]].max().max()
+            < EARLY_STOP_TOLERANCE
+        )
+        st.success(
+            f"Simulation complete — {runs:,} runs"
+            + ("" if converged else " (budget reached before converging)")
+        )
+    else:
+        st.success("Simulation complete")
 
     # -----------------------------
     # WINNER CARD
@@ -189,6 +249,8 @@ if st.button("🚦 Run Simulation"):
             "podium_prob": "{:.1%}",
             "avg_finish": "{:.2f}",
             "dnf_prob": "{:.1%}",
+            "win_prob_ci": "±{:.1%}",
+            "podium_prob_ci": "±{:.1%}",
         }),
         use_container_width=True,
     )
@@ -0,0 +1,383 @@
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.content_cache import dataset_fingerprint
+from data.feature_store import FeatureStore, load_feature_store
+from data.store import load_table
+from features.registry import context_features
+from models.status_taxonomy import FINISHED, LAPPED, build_status_taxonomy
+from simulation.config import RaceConfig, scenario_from_config
+from simulation.distribution import PositionDistribution
+from simulation.grid import grid_index
+from simulation.pace import (
+    DEFAULT_PACE_MODEL,
+    PaceModel,
+    as_pace_model,
+    pace_model_config,
+)
+from simulation.simulator import run_race_distribution
+
+# Features are read as they stood before qualifying
+PRE_RACE_CONTEXT = "pre_quali"
+
+RACE_COLUMNS = ["race_id", "season", "round", "circuit_id"]
+GRID_COLUMNS = ["driver_id", "constructor_id"]
+
+CONFIG_FILE = "backtest.json"
+
+
+@dataclass
+class BacktestResult:
+    """
+    Walk-forward backtest output.
+
+    predictions:   one row per (race, driver) — the race's predicted
+                   summary (win / podium / DNF probability, expected
+                   finish) next to the actual finishing position
+    distributions: race_id → full PositionDistribution
+    """
+
+    predictions: pd.DataFrame
+    distributions: dict
+
+    @property
+    def race_ids(self) -> list[int]:
+        return sorted(self.distributions)
+
+
+# -----------------------------
+# INPUTS
+# -----------------------------
+def pre_race_inputs(dataset: pd.DataFrame) -> pd.DataFrame:
+    """
+    What the simulator may see: race keys, grid ids and pre-race
+    features. Actual results are dropped and rows are put in driver
+    order, so nothing about the outcome reaches a simulation.
+    """
+
+    features = [
+        f for f in context_features(PRE_RACE_CONTEXT)
+        if f in dataset.columns
+    ]
+
+    return (
+        dataset[RACE_COLUMNS + GRID_COLUMNS + features]
+        .sort_values(["season", "round", "driver_id"], kind="mergesort")
+        .reset_index(drop=True)
+    )
+
+
+def actual_results(dataset: pd.DataFrame) -> pd.DataFrame:
+    """
+    race_id, driver_id, position_order, actual_dnf — one row per
+    driver and race (best result for a shared drive).
+    """
+
+    taxonomy = build_status_taxonomy(load_table("status"))
+    category = taxonomy.category(dataset["status_id"])
+
+    actuals = pd.DataFrame({
+        "race_id": dataset["race_id"].to_numpy(),
+        "driver_id": dataset["driver_id"].to_numpy(),
+        "position_order": dataset["position_order"].to_numpy(),
+        "actual_dnf": ~np.isin(category, (FINISHED, LAPPED)),
+    })
+
+    return (
+        actuals
+        .sort_values(["race_id", "position_order"], kind="mergesort")
+        .drop_duplicates(["race_id", "driver_id"])
+    )
+
+
+def race_seed(random_seed: int, race_id: int) -> int:
+    """
+    Per-race seed: independent of which races run, in what order,
+    or on which worker.
+    """
+
+    return int(np.random.SeedSequence((random_seed, race_id)).generate_state(1)[0])
+
+
+def default_scenario() -> dict:
+    # RaceConfig defaults: dry, neutral reliability and chaos
+    return scenario_from_config(RaceConfig(season=0, circuit_id=0))
+
+
+# -----------------------------
+# CHECKPOINTS
+# -----------------------------
+def _checkpoint_path(checkpoint_dir: Path, race_id: int) -> Path:
+    return checkpoint_dir / f"race_{race_id}.pkl"
+
+
+def _open_checkpoints(checkpoint_dir: Path, config: dict) -> dict:
+    """
+    Race results already in `checkpoint_dir`. Refuses to resume a
+    run made with different settings or a different dataset.
+    """
+
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    config_path = checkpoint_dir / CONFIG_FILE
+
+    if config_path.exists():
+        with open(config_path) as f:
+            saved = json.load(f)
+        if saved != config:
+            raise RuntimeError(
+                f"Checkpoints in {checkpoint_dir} were made with different "
+                "backtest settings; use a new directory"
+            )
+    else:
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+
+    done = {}
+    for path in checkpoint_dir.glob("race_*.pkl"):
+        try:
+            with open(path, "rb") as f:
+                distribution = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Interrupted mid-write — rerun that race
+            continue
+        done[int(path.stem.split("_")[1])] = distribution
+
+    return done
+
+
+def _write_checkpoint(checkpoint_dir: Path, race_id: int, distribution):
+    path = _checkpoint_path(checkpoint_dir, race_id)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+
+    with open(tmp, "wb") as f:
+        pickle.dump(distribution, f)
+    tmp.replace(path)
+
+
+# -----------------------------
+# EXECUTION
+# -----------------------------
+def _simulate_race(args) -> tuple[int, PositionDistribution]:
+    # Top-level so it pickles into pool workers; `grid` is this race's
+    # rows only, so workers never receive the full table
+    race_id, grid, scenario, n_simulations, seed, engine, pace_model = args
+
+    distribution = run_race_distribution(
+        dataset=grid,
+        season=int(grid["season"].iloc[0]),
+        round=int(grid["round"].iloc[0]),
+        circuit_id=int(grid["circuit_id"].iloc[0]),
+        scenario=scenario,
+        n_simulations=n_simulations,
+        random_seed=seed,
+        engine=engine,
+        pace_model=pace_model,
+    )
+
+    return race_id, distribution
+
+
+def run_backtest(
+    dataset: pd.DataFrame | None = None,
+    *,
+    store: FeatureStore | None = None,
+    first_season: int = 2009,
+    last_season: int | None = None,
+    scenario: dict | None = None,
+    n_simulations: int = 2000,
+    random_seed: int = 0,
+    engine: str = "monte_carlo",
+    pace_model: PaceModel = DEFAULT_PACE_MODEL,
+    n_workers: int = 1,
+    checkpoint_dir: str | Path | None = None,
+    progress: bool = False,
+) -> BacktestResult:
+    """
+    Walk-forward backtest: simulate every race in the season range
+    from its pre-race features only, and line the predictions up
+    with what actually happened.
+
+    Every producer runs in (season, round) order and a row's features
+    only reflect races before it, so simulating race r from its own
+    rows is a forecast made before r.
+
+    Grids come from `dataset` if given (e.g. a table built with
+    candidate parameters), otherwise from the point-in-time feature
+    store (default: the persisted one), which serves each race's grid
+    by index without loading the processed table.
+
+    Races are spread over `n_workers` processes. With a
+    `checkpoint_dir`, each finished race is saved as it completes
+    and a rerun with the same settings skips races already done.
+    Results do not depend on n_workers or on resuming.
+
+    A fitted pace_model must be trained on seasons before
+    first_season (see scripts/train_models.py pace --last-season).
+    """
+
+    scenario = default_scenario() if scenario is None else scenario
+    pace_model = as_pace_model(pace_model)
+
+    trained_to = getattr(pace_model, "last_season", None)
+    if trained_to is not None and trained_to >= first_season:
+        raise RuntimeError(
+            f"Pace model was trained through {trained_to}; backtest from "
+            f"{trained_to + 1} or retrain with scripts/train_models.py pace "
+            f"--last-season {first_season - 1}"
+        )
+
+    if dataset is None:
+        store = load_feature_store() if store is None else store
+        races, grids, fingerprint, outcomes = _store_inputs(
+            store, first_season, last_season
+        )
+    else:
+        races, grids, fingerprint, outcomes = _dataset_inputs(
+            dataset, first_season, last_season
+        )
+
+    done = {}
+    if checkpoint_dir is not None:
+        checkpoint_dir = Path(checkpoint_dir)
+        done = _open_checkpoints(
+            checkpoint_dir,
+            {
+                "dataset": fingerprint,
+                "scenario": scenario,
+                "n_simulations": n_simulations,
+                "random_seed": random_seed,
+                "engine": engine,
+                "pace_model": pace_model_config(pace_model),
+            },
+        )
+
+    jobs = [
+        (
+            int(race_id),
+            grids(int(race_id), season, round),
+            scenario,
+            n_simulations,
+            race_seed(random_seed, int(race_id)),
+            engine,
+            pace_model,
+        )
+        for race_id, season, round in zip(
+            races["race_id"], races["season"], races["round"]
+        )
+        if int(race_id) not in done
+    ]
+
+    distributions = {
+        race_id: done[race_id]
+        for race_id in races["race_id"].astype(int)
+        if race_id in done
+    }
+
+    def collect(race_id, distribution):
+        distributions[race_id] = distribution
+        if checkpoint_dir is not None:
+            _write_checkpoint(checkpoint_dir, race_id, distribution)
+        if progress:
+            print(f"  {len(distributions)}/{len(races)} races", end="\r")
+
+    if n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_simulate_race, job) for job in jobs]
+            for future in as_completed(futures):
+                collect(*future.result())
+    else:
+        for job in jobs:
+            collect(*_simulate_race(job))
+
+    if progress:
+        print()
+
+    return BacktestResult(
+        predictions=_predictions(races, distributions, actual_results(outcomes)),
+        distributions=distributions,
+    )
+
+
+def _dataset_inputs(dataset: pd.DataFrame, first_season, last_season) -> tuple:
+    """
+    (races, grid getter, fingerprint, result rows) from a processed table.
+    """
+
+    in_range = dataset["season"] >= first_season
+    if last_season is not None:
+        in_range &= dataset["season"] <= last_season
+
+    dataset = dataset[in_range]
+    if dataset.empty:
+        raise RuntimeError("No races in the requested season range")
+
+    inputs = pre_race_inputs(dataset)
+    index = grid_index(inputs)
+
+    races = (
+        inputs[RACE_COLUMNS]
+        .drop_duplicates("race_id")
+        .sort_values(["season", "round"])
+    )
+
+    def grids(race_id, season, round):
+        return index.rows(season, round)
+
+    return races, grids, dataset_fingerprint(inputs), dataset
+
+
+def _store_inputs(store: FeatureStore, first_season, last_season) -> tuple:
+    """
+    (races, grid getter, fingerprint, result rows) from the feature
+    store; actual results come from the raw results table.
+    """
+
+    races = store.races
+    in_range = (
+        (races["season"] >= first_season) &
+        races["race_id"].isin(store.entries["race_id"])
+    )
+    if last_season is not None:
+        in_range &= races["season"] <= last_season
+
+    races = races[in_range]
+    if races.empty:
+        raise RuntimeError("No races in the requested season range")
+
+    results = load_table("results")
+    outcomes = results[results["race_id"].isin(races["race_id"])]
+
+    def grids(race_id, season, round):
+        return store.grid(race_id, PRE_RACE_CONTEXT)
+
+    return races[RACE_COLUMNS], grids, store.fingerprint, outcomes
+
+
+def _predictions(
+    races: pd.DataFrame,
+    distributions: dict,
+    actuals: pd.DataFrame,
+) -> pd.DataFrame:
+    frames = []
+
+    for race in races.itertuples(index=False):
+        summary = distributions[int(race.race_id)].summary()
+        summary.insert(0, "race_id", int(race.race_id))
+        summary.insert(1, "season", int(race.season))
+        summary.insert(2, "round", int(race.round))
+        frames.append(summary)
+
+    predictions = pd.concat(frames, ignore_index=True)
+
+    return predictions.merge(
+        actuals,
+        how="left",
+        on=["race_id", "driver_id"],
+    )
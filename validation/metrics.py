@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+
+# Binary events scored from a simulate_race summary:
+# event → (probability column, last position that counts)
+EVENTS = {
+    "win": ("win_prob", 1),
+    "podium": ("podium_prob", 3),
+}
+
+LOG_LOSS_EPS = 1e-15
+
+
+# -----------------------------
+# BINARY EVENTS
+# -----------------------------
+def brier_terms(p, y) -> np.ndarray:
+    p = np.asarray(p, dtype=float)
+    return (p - np.asarray(y, dtype=float)) ** 2
+
+
+def log_loss_terms(p, y, eps: float = LOG_LOSS_EPS) -> np.ndarray:
+    """
+    Per-prediction log loss. Probabilities are clipped to
+    [eps, 1 - eps]: a simulated 0 that happens is costly, not infinite.
+    """
+
+    p = np.clip(np.asarray(p, dtype=float), eps, 1 - eps)
+    y = np.asarray(y, dtype=bool)
+    return -np.where(y, np.log(p), np.log1p(-p))
+
+
+def brier_score(p, y) -> float:
+    return float(brier_terms(p, y).mean())
+
+
+def log_loss(p, y, eps: float = LOG_LOSS_EPS) -> float:
+    return float(log_loss_terms(p, y, eps).mean())
+
+
+def event_outcomes(
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+) -> dict:
+    """
+    event → (predicted probabilities, 0/1 outcomes), one entry per row.
+    """
+
+    position = predictions[position_col].to_numpy()
+
+    return {
+        event: (predictions[prob_col].to_numpy(dtype=float), position <= last)
+        for event, (prob_col, last) in EVENTS.items()
+    }
+
+
+def score_predictions(
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+) -> pd.DataFrame:
+    """
+    Brier score and log loss of win_prob and podium_prob over every
+    (race, driver) row at once.
+
+    predictions: simulate_race output (stacked over any number of
+    races) joined to the actual `position_col`.
+    """
+
+    rows = []
+    for event, (p, y) in event_outcomes(predictions, position_col).items():
+        rows.append({
+            "event": event,
+            "brier": brier_score(p, y),
+            "log_loss": log_loss(p, y),
+            "base_rate": float(y.mean()),
+            "n": len(y),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def per_race_scores(
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+    race_col: str = "race_id",
+) -> pd.DataFrame:
+    """
+    Mean Brier score and log loss per race, for every race at once
+    (one bincount per metric, no per-race loop).
+    """
+
+    codes, races = pd.factorize(predictions[race_col], sort=True)
+    sizes = np.bincount(codes, minlength=len(races))
+
+    out = {race_col: races.to_numpy()}
+    for event, (p, y) in event_outcomes(predictions, position_col).items():
+        for name, terms in (
+            ("brier", brier_terms(p, y)),
+            ("log_loss", log_loss_terms(p, y)),
+        ):
+            out[f"{event}_{name}"] = (
+                np.bincount(codes, weights=terms, minlength=len(races)) / sizes
+            )
+
+    return pd.DataFrame(out)
+
+
+# -----------------------------
+# CALIBRATION
+# -----------------------------
+def calibration_curve(
+    p,
+    y,
+    n_bins: int = 10,
+    strategy: str = "uniform",
+) -> pd.DataFrame:
+    """
+    Reliability curve: mean predicted probability against observed
+    frequency per probability bin. Empty bins are dropped.
+
+    strategy: "uniform" (equal-width bins on [0, 1]) or "quantile"
+    (bins holding roughly equal numbers of predictions).
+    """
+
+    p = np.asarray(p, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if strategy == "uniform":
+        edges = np.linspace(0.0, 1.0, n_bins + 1)
+    elif strategy == "quantile":
+        edges = np.unique(np.quantile(p, np.linspace(0.0, 1.0, n_bins + 1)))
+    else:
+        raise ValueError(f"Unknown calibration strategy '{strategy}'")
+
+    # Right edge closed: p == 1 lands in the last bin
+    bins = np.clip(np.searchsorted(edges, p, side="right") - 1, 0, len(edges) - 2)
+
+    count = np.bincount(bins, minlength=len(edges) - 1)
+    pred_sum = np.bincount(bins, weights=p, minlength=len(edges) - 1)
+    obs_sum = np.bincount(bins, weights=y, minlength=len(edges) - 1)
+
+    used = count > 0
+
+    return pd.DataFrame({
+        "bin_lower": edges[:-1][used],
+        "bin_upper": edges[1:][used],
+        "mean_predicted": pred_sum[used] / count[used],
+        "observed_freq": obs_sum[used] / count[used],
+        "count": count[used],
+    })
+
+
+def calibration_table(
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+    n_bins: int = 10,
+    strategy: str = "uniform",
+) -> pd.DataFrame:
+    """
+    Reliability curves for win_prob and podium_prob, stacked
+    with an `event` column.
+    """
+
+    curves = []
+    for event, (p, y) in event_outcomes(predictions, position_col).items():
+        curve = calibration_curve(p, y, n_bins=n_bins, strategy=strategy)
+        curve.insert(0, "event", event)
+        curves.append(curve)
+
+    return pd.concat(curves, ignore_index=True)
+
+
+# -----------------------------
+# FINISHING POSITIONS (RPS)
+# -----------------------------
+def position_matrix(
+    distributions: dict,
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+    dnf_col: str | None = "actual_dnf",
+) -> tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Stack every race's finishing-position distribution.
+
+    Row i holds one (race, driver): columns 0..N-1 are P(P1..PN),
+    column N is P(DNF) — DNF ranks behind last — and columns past
+    N are 0, N being that race's grid size.
+
+    distributions: race_id → PositionDistribution
+    predictions:   actual `position_col` (and `dnf_col`, if given)
+                   per race_id / driver_id
+
+    Returns (probs M × K, outcome category per row, row keys).
+    """
+
+    race_ids = sorted(distributions)
+    sizes = np.array([distributions[r].n_drivers for r in race_ids])
+    K = int(sizes.max()) + 1
+
+    probs = np.zeros((sizes.sum(), K))
+    row = 0
+    for race_id, N in zip(race_ids, sizes):
+        d = distributions[race_id]
+        block = d.counts / d.n_simulations
+        probs[row:row + N, :N] = block[:, 1:]
+        probs[row:row + N, N] = block[:, 0]
+        row += N
+
+    keys = pd.DataFrame({
+        "race_id": np.repeat(race_ids, sizes),
+        "driver_id": np.concatenate([distributions[r].driver_ids for r in race_ids]),
+    })
+
+    actual = (
+        predictions
+        .drop_duplicates(["race_id", "driver_id"])
+        .set_index(["race_id", "driver_id"])
+        .reindex(pd.MultiIndex.from_frame(keys))
+    )
+
+    if actual[position_col].isna().any():
+        raise RuntimeError("Missing actual positions for some simulated drivers")
+
+    n_drivers = np.repeat(sizes, sizes)
+    outcome = np.minimum(actual[position_col].to_numpy(dtype=np.int64), n_drivers) - 1
+
+    if dnf_col is not None and dnf_col in actual.columns:
+        outcome = np.where(actual[dnf_col].to_numpy(dtype=bool), n_drivers, outcome)
+
+    keys["n_drivers"] = n_drivers
+    return probs, outcome, keys
+
+
+def ranked_probability_score(
+    probs: np.ndarray,
+    outcome: np.ndarray,
+    n_categories=None,
+) -> np.ndarray:
+    """
+    Ranked probability score per row of an (M × K) matrix of
+    ordered-category probabilities; 0 = perfect.
+
+    RPS = Σ_k (CDF_pred(k) − CDF_obs(k))² / (K_i − 1), where K_i is
+    the row's own category count (default K). Columns past a row's
+    categories must hold 0 — both CDFs are 1 there.
+    """
+
+    probs = np.asarray(probs, dtype=float)
+    M, K = probs.shape
+
+    if n_categories is None:
+        n_categories = np.full(M, K)
+
+    pred_cdf = np.cumsum(probs, axis=1)
+    obs_cdf = np.arange(K)[None, :] >= np.asarray(outcome)[:, None]
+
+    return ((pred_cdf - obs_cdf) ** 2).sum(axis=1) / (np.asarray(n_categories) - 1)
+
+
+def position_rps(
+    distributions: dict,
+    predictions: pd.DataFrame,
+    position_col: str = "position_order",
+    dnf_col: str | None = "actual_dnf",
+) -> pd.DataFrame:
+    """
+    Finishing-position RPS for every (race, driver), e.g. from a
+    BacktestResult: position_rps(r.distributions, r.predictions).
+    """
+
+    probs, outcome, keys = position_matrix(
+        distributions, predictions, position_col, dnf_col
+    )
+
+    # N positions + DNF
+    keys["rps"] = ranked_probability_score(probs, outcome, keys["n_drivers"] + 1)
+    return keys